@@ -0,0 +1,224 @@
+"""
+Benchmark de escalado de las funciones de cálculo de `src`.
+
+Ejecuta cada función sobre DataFrames sintéticos con el esquema de Kaggle a distintos tamaños
+y registra el tiempo, el pico de memoria (RSS) y las asignaciones de memoria de cada ejecución.
+Los resultados se guardan en JSON para comparar entre commits.
+
+Uso:
+    python benchmarks/benchmark_src.py --tamanos 1000 100000 --salida benchmarks/baseline.json
+    python benchmarks/benchmark_src.py --tamanos 1000 --comparar benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+import data_processing  # noqa: E402
+import data_visualization  # noqa: E402
+import regression_model  # noqa: E402
+
+# Dependencias que `src` importa de forma perezosa: se cargan aquí, antes de crear los procesos
+# hijos, para que el tiempo de importación no se mida como tiempo de cálculo
+import codificadores  # noqa: E402, F401
+import joblib  # noqa: E402, F401
+import scipy.stats  # noqa: E402, F401
+import sklearn.metrics  # noqa: E402, F401
+
+
+TAMANOS = [1_000, 100_000, 1_000_000, 10_000_000]
+
+CATEGORIAS_ORDINALES = ['Ex', 'Gd', 'TA', 'Fa', 'Po']
+
+
+def generar_datos_sinteticos(n_filas, semilla=42):
+    """
+    DataFrame combinado (train + test) con el esquema de `Inmobiliaria_Horizonte.pkl`,
+    remuestreando filas reales con reemplazo. Se añade 'TieneSotano' para las funciones de sótano.
+    """
+    base = pd.read_pickle(os.path.join(RAIZ, 'data', 'Inmobiliaria_Horizonte.pkl'))
+    rng = np.random.default_rng(semilla)
+    df = base.iloc[rng.integers(0, len(base), n_filas)].reset_index(drop=True)
+    df['Id'] = np.arange(1, n_filas + 1)
+    df['TieneSotano'] = (df['TotalBsmtSF'].fillna(0) > 0).astype(int)
+    return df
+
+
+def _columnas_numericas(df):
+    return [col for col in df.select_dtypes('number').columns if col not in ['Id', 'SalePrice']]
+
+
+def _predicciones(df):
+    test = df[df['Dataset'] == 'test']
+    rng = np.random.default_rng(0)
+    predicciones = rng.lognormal(12, 0.4, len(test))
+    df_predicciones = pd.DataFrame({'Id': test['Id'].to_numpy(), 'SalePrice': predicciones})
+    return predicciones, test, df_predicciones
+
+
+def _metricas(df):
+    y = df['SalePrice'].dropna().to_numpy()
+    yhat = y * np.random.default_rng(0).lognormal(0, 0.1, len(y))
+    return regression_model.calcular_metricas_rendimiento('modelo', None, y, yhat)
+
+
+# Casos del benchmark: {nombre: función que recibe el DataFrame sintético}
+CASOS = {
+    'resumen_columnas': lambda df: data_processing.resumen_columnas(df, list(df.columns)),
+    'analizar_precio_viviendas_por_variable': lambda df: data_processing.analizar_precio_viviendas_por_variable(df, 'Neighborhood'),
+    'calcular_correlaciones': lambda df: data_processing.calcular_correlaciones(df, _columnas_numericas(df)),
+    'calcular_todas_correlaciones': lambda df: data_visualization.calcular_todas_correlaciones(df[_columnas_numericas(df)]),
+    'calcular_correlaciones_saleprice': lambda df: data_visualization.calcular_correlaciones_saleprice(
+        df[_columnas_numericas(df) + ['SalePrice']]),
+    'label_encoding': lambda df: data_processing.label_encoding(df, 'Neighborhood'),
+    'codificacion_ponderada': lambda df: data_processing.codificacion_ponderada(df, 'Neighborhood', 'SalePrice'),
+    'codificacion_loo': lambda df: data_processing.codificacion_loo(df, 'Neighborhood'),
+    'aplicar_codificacion_ordinal_especifica': lambda df: data_processing.aplicar_codificacion_ordinal_especifica(
+        df.assign(ExterQual=df['ExterQual'].fillna('TA')), 'ExterQual', CATEGORIAS_ORDINALES),
+    'rellenar_atributos_sotano': lambda df: data_processing.rellenar_atributos_sotano(df, 'BsmtQual'),
+    'calcular_cuartiles': lambda df: data_visualization.calcular_cuartiles(df, 'GrLivArea', 1.5, 1.5),
+    'calcular_metricas_rendimiento': _metricas,
+    'revisar_predicciones': lambda df: regression_model.revisar_predicciones(
+        *_predicciones(df), train=df[df['Dataset'] == 'train']),
+}
+
+
+def _rss_actual_kb():
+    """
+    RSS actual del proceso en KB (Linux); 0 si no está disponible.
+    """
+    try:
+        with open('/proc/self/status') as archivo:
+            for linea in archivo:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _medir(nombre, df, conexion):
+    """
+    Ejecuta un caso en un proceso hijo: una pasada cronometrada y otra con tracemalloc.
+    """
+    funcion = CASOS[nombre]
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida):
+            rss_inicial = _rss_actual_kb()
+            inicio = time.perf_counter()
+            funcion(df.copy())
+            tiempo = time.perf_counter() - inicio
+            rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+            bloques_inicio = sys.getallocatedblocks()
+            tracemalloc.start()
+            funcion(df.copy())
+            _, pico_asignado = tracemalloc.get_traced_memory()
+            n_asignaciones = sum(estadistica.count for estadistica in tracemalloc.take_snapshot().statistics('filename'))
+            tracemalloc.stop()
+            bloques_fin = sys.getallocatedblocks()
+
+        conexion.send({
+            'tiempo_s': tiempo,
+            'rss_pico_mb': max(rss_pico - rss_inicial, 0) / 1024,
+            'memoria_asignada_pico_mb': pico_asignado / 1024 ** 2,
+            'bloques_vivos_al_terminar': n_asignaciones,
+            'bloques_python_delta': bloques_fin - bloques_inicio,
+        })
+    except Exception as error:
+        conexion.send({'error': f'{type(error).__name__}: {error}'})
+
+
+def ejecutar(tamanos, casos, semilla=42):
+    """
+    Ejecuta los casos indicados a cada tamaño y devuelve la lista de resultados.
+    Cada medición corre en un proceso hijo (fork) para aislar el pico de memoria.
+    """
+    contexto = multiprocessing.get_context('fork')
+    resultados = []
+    for n_filas in tamanos:
+        df = generar_datos_sinteticos(n_filas, semilla)
+        for nombre in casos:
+            receptor, emisor = contexto.Pipe(duplex=False)
+            proceso = contexto.Process(target=_medir, args=(nombre, df, emisor))
+            proceso.start()
+            # Sin el extremo de escritura en el padre, recv lanza EOFError si el hijo muere sin enviar
+            emisor.close()
+            try:
+                medicion = receptor.recv()
+            except EOFError:
+                medicion = None
+            proceso.join()
+            if medicion is None:
+                medicion = {'error': f'Proceso terminado sin resultado (código de salida {proceso.exitcode})'}
+            resultados.append({'funcion': nombre, 'filas': n_filas, **medicion})
+            print(f"{nombre:<42} {n_filas:>10,} filas  {medicion.get('tiempo_s', float('nan')):9.3f} s  "
+                  f"{medicion.get('error', '')}")
+    return resultados
+
+
+def _metadatos():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'nucleos': os.cpu_count(),
+    }
+
+
+def comparar(resultados, ruta_baseline):
+    """
+    Compara los resultados con un baseline guardado y devuelve la tabla de cocientes (actual / baseline).
+    """
+    with open(ruta_baseline, encoding='utf-8') as archivo:
+        baseline = pd.DataFrame(json.load(archivo)['resultados'])
+    actual = pd.DataFrame(resultados)
+    tabla = actual.merge(baseline, on=['funcion', 'filas'], suffixes=('', '_baseline'))
+    for metrica in ['tiempo_s', 'rss_pico_mb', 'memoria_asignada_pico_mb']:
+        if metrica in tabla and f'{metrica}_baseline' in tabla:
+            tabla[f'{metrica}_ratio'] = tabla[metrica] / tabla[f'{metrica}_baseline']
+    return tabla[['funcion', 'filas'] + [col for col in tabla.columns if col.endswith('_ratio')]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--funciones', nargs='+', default=list(CASOS), choices=list(CASOS))
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--salida', default=None, help='Ruta del JSON de resultados.')
+    parser.add_argument('--comparar', default=None, help='JSON de baseline con el que comparar.')
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.tamanos, argumentos.funciones, argumentos.semilla)
+
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'metadatos': _metadatos(), 'resultados': resultados}, archivo, indent=2)
+    if argumentos.comparar:
+        print(comparar(resultados, argumentos.comparar).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
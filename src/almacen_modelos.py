@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from functools import cached_property
+
+import joblib
+import pandas as pd
+
+
+ARCHIVOS_CONTENIDO = ('modelo.joblib', 'preprocesado.joblib', 'columnas.json')
+
+
+def _hash_archivos(rutas):
+    """
+    Hash SHA-256 del contenido de varios archivos (en el orden dado).
+    """
+    resumen = hashlib.sha256()
+    for ruta in rutas:
+        with open(ruta, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1 << 20), b''):
+                resumen.update(bloque)
+    return resumen.hexdigest()[:12]
+
+
+def _guardar_bosque(modelo, carpeta):
+    """
+    Guarda el `BosqueCompilado` del modelo si es un ensemble de árboles admitido (si no, nada).
+    """
+    from bosque_compilado import compilar_bosque
+
+    try:
+        bosque = compilar_bosque(modelo)
+    except ValueError:
+        return
+    bosque.guardar(carpeta)
+
+
+def guardar_artefacto(modelo, nombre, columnas, preprocesado=None, metricas=None, ruta_almacen='../models',
+                      seleccion=None):
+    """
+    Guarda un modelo entrenado como una versión identificada por el hash de su contenido.
+
+    Los objetos se guardan con joblib sin comprimir para que los arrays grandes (tablas de los
+    codificadores) se puedan abrir después con memoria mapeada. Los árboles de scikit-learn copian
+    sus nodos al deserializarse, así que los ensembles admitidos por `bosque_compilado` se guardan
+    además compilados (carpeta 'bosque', un .npy por array de nodos), que sí se abren mapeados.
+    Si ya existe una versión con el mismo contenido, no se vuelve a escribir.
+
+    Parámetros:
+    - modelo: Estimador entrenado (p. ej. `mejor_modelo`).
+    - nombre: Nombre del modelo dentro del almacén (p. ej. 'XGBRegressor').
+    - columnas: Lista de columnas de entrada del modelo.
+    - preprocesado: Diccionario con el estado del preprocesado (codificadores, columnas_logaritmo,
+      columnas_eliminar, log_objetivo...).
+    - metricas: DataFrame de métricas de validación cruzada.
+    - ruta_almacen: Carpeta raíz del almacén.
+    - seleccion: Resultado de `seleccion_columnas.seleccionar_columnas`. Se guarda en el preprocesado
+      (claves 'seleccion' y 'columnas_eliminar') para aplicar la misma selección al predecir.
+
+    Retorna:
+    - Versión (hash) del artefacto.
+    """
+    if seleccion is not None:
+        preprocesado = {**(preprocesado or {}), 'seleccion': seleccion,
+                        'columnas_eliminar': list(seleccion['columnas_eliminar'])}
+
+    carpeta_modelo = os.path.join(ruta_almacen, nombre)
+    os.makedirs(carpeta_modelo, exist_ok=True)
+    temporal = tempfile.mkdtemp(dir=carpeta_modelo)
+
+    try:
+        joblib.dump(modelo, os.path.join(temporal, 'modelo.joblib'))
+        joblib.dump(preprocesado or {}, os.path.join(temporal, 'preprocesado.joblib'))
+        with open(os.path.join(temporal, 'columnas.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(list(columnas), archivo, ensure_ascii=False)
+
+        version = _hash_archivos([os.path.join(temporal, nombre_archivo) for nombre_archivo in ARCHIVOS_CONTENIDO])
+        carpeta_version = os.path.join(carpeta_modelo, version)
+        if os.path.exists(carpeta_version):
+            shutil.rmtree(temporal)
+        else:
+            if metricas is not None:
+                metricas.to_csv(os.path.join(temporal, 'metricas.csv'), index=False)
+            _guardar_bosque(modelo, os.path.join(temporal, 'bosque'))
+            metadatos = {
+                'version': version,
+                'nombre': nombre,
+                'clase': modelo.__class__.__name__,
+                'parametros': {clave: repr(valor) for clave, valor in modelo.get_params().items()},
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'n_columnas': len(columnas),
+            }
+            with open(os.path.join(temporal, 'metadatos.json'), 'w', encoding='utf-8') as archivo:
+                json.dump(metadatos, archivo, ensure_ascii=False, indent=2)
+            # El renombrado es atómico: una versión nunca queda a medio escribir
+            os.rename(temporal, carpeta_version)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    with open(os.path.join(carpeta_modelo, 'ultima'), 'w') as archivo:
+        archivo.write(version)
+
+    return version
+
+
+class Artefacto:
+    """
+    Versión guardada de un modelo. Cada componente se carga solo al acceder a él. El preprocesado y
+    los nodos del bosque compilado se abren con memoria mapeada, de modo que varios procesos
+    comparten las páginas; `predictor(compilar=True)` usa el bosque guardado sin cargar el modelo.
+    """
+
+    def __init__(self, ruta, mmap_mode='r'):
+        self.ruta = ruta
+        self.mmap_mode = mmap_mode
+
+    @cached_property
+    def metadatos(self):
+        with open(os.path.join(self.ruta, 'metadatos.json'), encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    @cached_property
+    def modelo(self):
+        return joblib.load(os.path.join(self.ruta, 'modelo.joblib'), mmap_mode=self.mmap_mode)
+
+    @cached_property
+    def preprocesado(self):
+        return joblib.load(os.path.join(self.ruta, 'preprocesado.joblib'), mmap_mode=self.mmap_mode)
+
+    @cached_property
+    def columnas(self):
+        with open(os.path.join(self.ruta, 'columnas.json'), encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    @cached_property
+    def seleccion(self):
+        """
+        Selección de columnas guardada con el modelo (None si no se guardó ninguna).
+        """
+        return self.preprocesado.get('seleccion')
+
+    @cached_property
+    def bosque(self):
+        """
+        `BosqueCompilado` guardado con el modelo, con los nodos en memoria mapeada (None si el modelo
+        no es un ensemble de árboles admitido o la versión se guardó sin él).
+        """
+        carpeta = os.path.join(self.ruta, 'bosque')
+        if not os.path.isdir(carpeta):
+            return None
+        from bosque_compilado import BosqueCompilado
+
+        return BosqueCompilado.cargar(carpeta, mmap_mode=self.mmap_mode)
+
+    @cached_property
+    def metricas(self):
+        ruta = os.path.join(self.ruta, 'metricas.csv')
+        return pd.read_csv(ruta) if os.path.exists(ruta) else None
+
+    def predictor(self, compilar=False):
+        """
+        Crea un `PredictorViviendas` a partir del modelo y del preprocesado guardados
+        (con `compilar=True`, los ensembles de árboles se predicen con el `BosqueCompilado` guardado,
+        o compilado al cargar si la versión no lo tiene).
+        """
+        from servicio_prediccion import PredictorViviendas
+
+        bosque = self.bosque if compilar else None
+        return PredictorViviendas(
+            self.modelo if bosque is None else bosque,
+            columnas=self.columnas,
+            codificadores=self.preprocesado.get('codificadores', ()),
+            columnas_logaritmo=self.preprocesado.get('columnas_logaritmo', ()),
+            log_objetivo=self.preprocesado.get('log_objetivo', True),
+            compilar=compilar and bosque is None,
+        )
+
+
+def cargar_artefacto(nombre, version=None, ruta_almacen='../models', mmap_mode='r'):
+    """
+    Abre una versión del almacén (por defecto, la última guardada) sin leer todavía sus archivos.
+    """
+    carpeta_modelo = os.path.join(ruta_almacen, nombre)
+    if version is None:
+        with open(os.path.join(carpeta_modelo, 'ultima')) as archivo:
+            version = archivo.read().strip()
+    ruta = os.path.join(carpeta_modelo, version)
+    if not os.path.isdir(ruta):
+        raise ValueError(f"No existe la versión '{version}' del modelo '{nombre}'.")
+    return Artefacto(ruta, mmap_mode=mmap_mode)
+
+
+def listar_versiones(nombre, ruta_almacen='../models'):
+    """
+    Devuelve un DataFrame con las versiones guardadas de un modelo, de la más reciente a la más antigua.
+    """
+    carpeta_modelo = os.path.join(ruta_almacen, nombre)
+    metadatos = []
+    for version in os.listdir(carpeta_modelo):
+        ruta = os.path.join(carpeta_modelo, version, 'metadatos.json')
+        if os.path.exists(ruta):
+            with open(ruta, encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+            metadatos.append({clave: datos[clave] for clave in ['version', 'clase', 'fecha', 'n_columnas']})
+    columnas = ['version', 'clase', 'fecha', 'n_columnas']
+    return pd.DataFrame(metadatos, columns=columnas).sort_values('fecha', ascending=False).reset_index(drop=True)
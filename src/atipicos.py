@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class SketchCuantiles:
+    """
+    Resumen aproximado de cuantiles en streaming (esquema de compactadores tipo KLL).
+
+    Los valores se acumulan en niveles; el nivel h guarda elementos de peso 2**h. Cuando un nivel
+    supera `k` elementos se ordena y se promueve uno de cada dos al nivel siguiente, así la memoria
+    queda en O(k log(n / k)) y el error de rango es del orden de 1/k. Mientras no se compacta
+    nada, `cuantiles` coincide con `np.quantile` (interpolación lineal).
+    Dos sketches se pueden combinar con `combinar` (p. ej. uno por proceso o por archivo).
+    """
+
+    def __init__(self, k=2048, semilla=0):
+        self.k = k
+        self.niveles = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(semilla)
+
+    def actualizar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        valores = valores[~np.isnan(valores)]
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+        return self
+
+    def combinar(self, otro):
+        for nivel, valores in enumerate(otro.niveles):
+            if nivel == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], valores])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self.niveles):
+            valores = self.niveles[nivel]
+            if len(valores) > self.k:
+                valores = np.sort(valores)
+                # Con un número impar, el último elemento se queda en este nivel
+                resto = valores[len(valores) - len(valores) % 2:]
+                promovidos = valores[:len(valores) - len(resto)][self._rng.integers(2)::2]
+                self.niveles[nivel] = resto
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+            nivel += 1
+
+    def cuantiles(self, q):
+        """
+        Cuantiles aproximados para las probabilidades `q` (NaN si no hay datos).
+        """
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind='stable')
+        valores, pesos = valores[orden], pesos[orden]
+        # Rango (base 0) del centro de cada elemento; con pesos 1 es su posición, como en np.quantile
+        rangos = np.cumsum(pesos) - pesos + (pesos - 1) / 2
+        return np.interp(q * (pesos.sum() - 1), rangos, valores)
+
+
+class FiltroAtipicos(BaseEstimator, TransformerMixin):
+    """
+    Filtro de valores atípicos por rango intercuartil (IQR) para muchas columnas a la vez.
+
+    En el ajuste se calculan Q1 y Q3 de todas las columnas con una sola llamada a `np.nanquantile`
+    (o con un `SketchCuantiles` por columna si `aproximado=True`) y se guardan los límites
+    [Q1 - n_inferior * IQR, Q3 + n_superior * IQR]. Después se aplican a cualquier DataFrame o trozo:
+
+    - modo='mascara': se eliminan las filas con algún valor fuera de los límites.
+    - modo='recorte': los valores fuera de los límites se recortan al límite.
+
+    Parámetros:
+    - cols: Columnas a filtrar (por defecto, todas las numéricas del ajuste).
+    - n_inferior, n_superior: Multiplicadores del IQR para cada límite.
+    - modo: 'mascara' o 'recorte'.
+    - conservar_nan: Si False, en modo 'mascara' las filas con NaN en alguna columna también se eliminan.
+    - conjunto_ajuste: Si X tiene la columna 'Dataset', los límites se ajustan solo con las filas de
+      ese conjunto ('train' por defecto). None usa todas las filas.
+    - aproximado: Usa cuantiles aproximados en streaming, para entradas que no caben en memoria.
+    - k: Tamaño de los compactadores del sketch (más grande, más preciso).
+    - tam_trozo: Filas por trozo al ajustar con `aproximado=True`.
+    """
+
+    def __init__(self, cols=None, n_inferior=1.5, n_superior=1.5, modo='mascara', conservar_nan=True,
+                 conjunto_ajuste='train', aproximado=False, k=2048, tam_trozo=1_000_000):
+        self.cols = cols
+        self.n_inferior = n_inferior
+        self.n_superior = n_superior
+        self.modo = modo
+        self.conservar_nan = conservar_nan
+        self.conjunto_ajuste = conjunto_ajuste
+        self.aproximado = aproximado
+        self.k = k
+        self.tam_trozo = tam_trozo
+
+    def _filas_ajuste(self, X):
+        if self.conjunto_ajuste is not None and 'Dataset' in X.columns:
+            return X[X['Dataset'] == self.conjunto_ajuste]
+        return X
+
+    def _iniciar(self, X):
+        self.columnas_ = list(X.select_dtypes('number').columns) if self.cols is None else list(self.cols)
+
+    def _fijar_limites(self, q1, q3):
+        self.q1_, self.q3_ = q1, q3
+        iqr = q3 - q1
+        self.limite_inferior_ = q1 - self.n_inferior * iqr
+        self.limite_superior_ = q3 + self.n_superior * iqr
+
+    def fit(self, X, y=None):
+        X = self._filas_ajuste(X)
+        self._iniciar(X)
+        if self.aproximado:
+            self.sketches_ = None
+            for inicio in range(0, len(X), self.tam_trozo):
+                self.partial_fit(X.iloc[inicio:inicio + self.tam_trozo])
+        else:
+            q1, q3 = np.nanquantile(X[self.columnas_].to_numpy(dtype=float), [0.25, 0.75], axis=0)
+            self._fijar_limites(q1, q3)
+        return self
+
+    def partial_fit(self, X, y=None):
+        """
+        Actualiza los sketches con un trozo de datos y recalcula los límites (siempre aproximado).
+        """
+        X = self._filas_ajuste(X)
+        if getattr(self, 'sketches_', None) is None:
+            self._iniciar(X)
+            self.sketches_ = [SketchCuantiles(self.k, semilla=posicion) for posicion in range(len(self.columnas_))]
+        valores = X[self.columnas_].to_numpy(dtype=float)
+        for posicion, sketch in enumerate(self.sketches_):
+            sketch.actualizar(valores[:, posicion])
+        self._limites_desde_sketches()
+        return self
+
+    def combinar(self, otro):
+        """
+        Suma los sketches de otro filtro ajustado con `partial_fit` (p. ej. sobre otro archivo) y
+        recalcula los límites.
+        """
+        if getattr(otro, 'sketches_', None) is None:
+            return self
+        if getattr(self, 'sketches_', None) is None:
+            self.columnas_, self.sketches_ = otro.columnas_, otro.sketches_
+        else:
+            for sketch, sketch_otro in zip(self.sketches_, otro.sketches_):
+                sketch.combinar(sketch_otro)
+        self._limites_desde_sketches()
+        return self
+
+    def _limites_desde_sketches(self):
+        q1, q3 = np.array([sketch.cuantiles([0.25, 0.75]) for sketch in self.sketches_]).T
+        self._fijar_limites(q1, q3)
+
+    def limites(self):
+        """
+        DataFrame con Q1, Q3, IQR y los límites ajustados de cada columna.
+        """
+        return pd.DataFrame({
+            'Q1': self.q1_,
+            'Q3': self.q3_,
+            'IQR': self.q3_ - self.q1_,
+            'Límite inferior': self.limite_inferior_,
+            'Límite superior': self.limite_superior_,
+        }, index=self.columnas_)
+
+    def mascara(self, X):
+        """
+        Array booleano: True para las filas con todos los valores dentro de los límites.
+        """
+        valores = X[self.columnas_].to_numpy(dtype=float)
+        dentro = (valores >= self.limite_inferior_) & (valores <= self.limite_superior_)
+        if self.conservar_nan:
+            dentro |= np.isnan(valores)
+        return dentro.all(axis=1)
+
+    def transform(self, X):
+        """
+        Aplica los límites ajustados según `modo`. Devuelve un DataFrame nuevo.
+        """
+        if self.modo == 'mascara':
+            return X[self.mascara(X)]
+        if self.modo == 'recorte':
+            X = X.copy()
+            X[self.columnas_] = np.clip(X[self.columnas_].to_numpy(dtype=float),
+                                        self.limite_inferior_, self.limite_superior_)
+            return X
+        raise ValueError(f"Modo desconocido: '{self.modo}'. Usa 'mascara' o 'recorte'.")
+
+    def transformar_trozos(self, trozos):
+        """
+        Aplica el filtro a un iterador de DataFrames (p. ej. `pd.read_csv(..., chunksize=...)`).
+        """
+        for trozo in trozos:
+            yield self.transform(trozo)
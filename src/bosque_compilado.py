@@ -0,0 +1,299 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Objetivos de XGBoost y LightGBM cuya predicción es directamente la suma de las hojas (enlace identidad)
+OBJETIVOS_XGB = ('reg:squarederror', 'reg:squaredlogerror', 'reg:pseudohubererror', 'reg:absoluteerror')
+OBJETIVOS_LGBM = ('regression', 'regression_l1', 'huber', 'fair', 'quantile')
+
+# Arrays de nodos que `guardar` escribe como .npy (uno por archivo) y `cargar` abre con memoria mapeada
+ARRAYS_NODOS = ('raices', 'columna', 'umbral', 'hijos', 'valor', 'nan_izquierda')
+
+
+class BosqueCompilado:
+    """
+    Ensemble de árboles de regresión aplanado en arrays contiguos de nodos (columna, umbral, hijos,
+    valor y dirección de los NaN), con la predicción vectorizada en NumPy para todas las filas y
+    todos los árboles a la vez.
+
+    Se parte de un nodo actual por cada par (fila, árbol) y en cada paso se avanzan todos los pares
+    que aún no están en una hoja con cuatro lecturas indexadas (valor de la fila, umbral, hijo y
+    columna del hijo); los que llegan a una hoja salen de la lista de activos, así el trabajo es el
+    de los caminos reales y no el de la rama más profunda. Con muchas filas, los árboles se recorren
+    por grupos (`max_pares` pares a la vez) para que sus nodos quepan en la caché.
+
+    Está pensado para la predicción en línea: sin la sobrecarga por árbol de scikit-learn ni el
+    reparto de joblib, una fila con 300 árboles tarda menos de 1 ms (unos 35 ms con `predict`) y la
+    ventaja se mantiene hasta unos cientos de filas por lote. Para puntuar lotes grandes, el
+    `predict` compilado de scikit-learn sigue siendo más rápido.
+
+    La decisión es `x <= umbral` (izquierda); los umbrales de XGBoost (`x < umbral`) se convierten
+    al float32 anterior. Las filas se convierten al tipo con el que compara cada librería (float32
+    en scikit-learn y XGBoost), así que las predicciones coinciden con las del modelo original salvo
+    por el orden de la suma.
+
+    Se construye con `compilar_bosque(modelo)`. Con `guardar` y `cargar`, los arrays de nodos se
+    guardan como .npy y se abren con memoria mapeada: varios procesos que sirven el mismo modelo
+    comparten sus páginas en lugar de tener cada uno una copia.
+    """
+
+    def __init__(self, arboles, escala=1.0, base=0.0, columnas=None, tipo_entrada=np.float32, max_pares=65536):
+        """
+        Parámetros:
+        - arboles: Lista de diccionarios con los arrays de cada árbol ('columna', 'umbral', 'izquierdo',
+          'derecho', 'valor', 'nan_izquierda'), con índices locales y -1 como hijo de las hojas.
+        - escala: Factor de la suma de las hojas (1 / nº de árboles en los bosques, learning rate
+          en GradientBoosting).
+        - base: Valor inicial que se suma a la predicción.
+        - columnas: Nombres de las columnas de entrada, en orden (para reordenar DataFrames).
+        - tipo_entrada: Tipo al que se convierten las filas antes de comparar.
+        - max_pares: Pares (fila, árbol) que se recorren a la vez.
+        """
+        tamanos = np.array([len(arbol['valor']) for arbol in arboles])
+        self.raices = np.concatenate([[0], np.cumsum(tamanos)[:-1]]).astype(np.intp)
+
+        columna, umbral, hijos, valor, nan_izquierda = [], [], [], [], []
+        for desplazamiento, arbol in zip(self.raices, arboles):
+            hoja = arbol['izquierdo'] < 0
+            propio = np.arange(len(hoja))
+            # Las hojas se marcan con columna -1 y apuntan a sí mismas con umbral infinito: un par que
+            # ya está en una hoja no se mueve aunque se siga avanzando
+            columna.append(np.where(hoja, -1, arbol['columna']))
+            umbral.append(np.where(hoja, np.inf, arbol['umbral']))
+            hijos.append(np.column_stack([np.where(hoja, propio, arbol['izquierdo']),
+                                          np.where(hoja, propio, arbol['derecho'])]) + desplazamiento)
+            valor.append(arbol['valor'])
+            nan_izquierda.append(np.where(hoja, True, arbol['nan_izquierda']))
+        self.columna = np.concatenate(columna).astype(np.intp)
+        self.umbral = np.concatenate(umbral).astype(np.float64)
+        # Hijos intercalados [izquierdo, derecho]: el siguiente nodo es hijos[2 * nodo + va_a_la_derecha]
+        self.hijos = np.concatenate(hijos).ravel().astype(np.intp)
+        self.valor = np.concatenate(valor).astype(np.float64)
+        self.nan_izquierda = np.concatenate(nan_izquierda).astype(bool)
+
+        self.escala = escala
+        self.base = base
+        self.columnas = None if columnas is None else list(columnas)
+        self.tipo_entrada = tipo_entrada
+        self.max_pares = max_pares
+
+    def guardar(self, carpeta):
+        """
+        Escribe los arrays de nodos (`ARRAYS_NODOS`, un .npy cada uno) y los parámetros en `carpeta`.
+        """
+        os.makedirs(carpeta, exist_ok=True)
+        for nombre in ARRAYS_NODOS:
+            np.save(os.path.join(carpeta, f'{nombre}.npy'), getattr(self, nombre))
+        parametros = {'escala': float(self.escala), 'base': float(self.base), 'columnas': self.columnas,
+                      'tipo_entrada': np.dtype(self.tipo_entrada).name, 'max_pares': self.max_pares}
+        with open(os.path.join(carpeta, 'bosque.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(parametros, archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, carpeta, mmap_mode='r'):
+        """
+        Abre un bosque escrito con `guardar`; con `mmap_mode`, los arrays de nodos no se leen a memoria.
+        """
+        with open(os.path.join(carpeta, 'bosque.json'), encoding='utf-8') as archivo:
+            parametros = json.load(archivo)
+        bosque = cls.__new__(cls)
+        for nombre in ARRAYS_NODOS:
+            setattr(bosque, nombre, np.load(os.path.join(carpeta, f'{nombre}.npy'), mmap_mode=mmap_mode))
+        bosque.escala = parametros['escala']
+        bosque.base = parametros['base']
+        bosque.columnas = parametros['columnas']
+        bosque.tipo_entrada = np.dtype(parametros['tipo_entrada']).type
+        bosque.max_pares = parametros['max_pares']
+        return bosque
+
+    @property
+    def n_arboles(self):
+        return len(self.raices)
+
+    def _recorrer(self, valores, n_columnas, raices, con_nan):
+        """
+        Hojas de las filas de `valores` (matriz aplanada por filas) en los árboles de `raices`.
+        """
+        n_filas = len(valores) // n_columnas
+        # Pares (fila, árbol) aplanados. De los activos se arrastran su posición en `nodos`, el nodo
+        # actual, su columna y el desplazamiento de su fila en `valores`
+        nodos = np.tile(raices, n_filas)
+        activos = np.arange(len(nodos))
+        nodo = nodos.copy()
+        columna = self.columna[nodo]
+        desplazamiento = np.repeat(np.arange(n_filas) * n_columnas, len(raices))
+        while True:
+            sigue = columna >= 0
+            n_siguen = int(sigue.sum())
+            if n_siguen == 0:
+                nodos[activos] = nodo
+                return nodos.reshape(n_filas, len(raices))
+            # Compactar cuesta más que un paso: solo cuando ha terminado una parte apreciable
+            if n_siguen < 0.8 * len(sigue):
+                nodos[activos[~sigue]] = nodo[~sigue]
+                activos, nodo, columna, desplazamiento = (activos[sigue], nodo[sigue], columna[sigue],
+                                                          desplazamiento[sigue])
+            dato = valores[desplazamiento + columna]
+            derecha = ~(dato <= self.umbral[nodo])
+            if con_nan:
+                derecha = np.where(np.isnan(dato), ~self.nan_izquierda[nodo], derecha)
+            nodo = self.hijos[2 * nodo + derecha]
+            columna = self.columna[nodo]
+
+    def hojas(self, X):
+        """
+        Índice global de la hoja a la que llega cada fila en cada árbol (filas x árboles).
+        """
+        if isinstance(X, pd.DataFrame) and self.columnas is not None:
+            X = X[self.columnas]
+        X = np.ascontiguousarray(X, dtype=self.tipo_entrada)
+        hojas = np.empty((len(X), self.n_arboles), dtype=np.intp)
+        # Con muchas filas, los árboles se recorren por grupos para que sus nodos quepan en la caché
+        filas_bloque = max(1, min(len(X), self.max_pares))
+        arboles_grupo = max(1, self.max_pares // filas_bloque)
+        for inicio in range(0, len(X), filas_bloque):
+            bloque = X[inicio:inicio + filas_bloque]
+            valores = bloque.ravel()
+            con_nan = bool(np.isnan(valores).any())
+            for primero in range(0, self.n_arboles, arboles_grupo):
+                hojas[inicio:inicio + len(bloque), primero:primero + arboles_grupo] = self._recorrer(
+                    valores, X.shape[1], self.raices[primero:primero + arboles_grupo], con_nan)
+        return hojas
+
+    def predict(self, X):
+        """
+        Predicción del ensemble: base + escala * suma de las hojas de todos los árboles.
+        """
+        return self.base + self.escala * self.valor[self.hojas(X)].sum(axis=1)
+
+
+def _arbol_sklearn(arbol):
+    estructura = arbol.tree_
+    if estructura.n_outputs != 1:
+        raise ValueError('Solo se admiten árboles de regresión con una salida.')
+    # Sin NaN en el ajuste, scikit-learn los envía al hijo con más muestras (ya reflejado en missing_go_to_left)
+    nan_izquierda = getattr(estructura, 'missing_go_to_left', np.zeros(estructura.node_count, dtype=np.uint8))
+    return {
+        'columna': estructura.feature,
+        'umbral': estructura.threshold,
+        'izquierdo': estructura.children_left,
+        'derecho': estructura.children_right,
+        'valor': estructura.value[:, 0, 0],
+        'nan_izquierda': np.asarray(nan_izquierda, dtype=bool),
+    }
+
+
+def _arboles_xgb(volcado, columnas):
+    """
+    Árboles a partir de `Booster.get_dump(dump_format='json')`. Los Ids de nodo no tienen por qué
+    ser consecutivos (nodos podados), así que se renumeran.
+    """
+    posiciones_columna = {nombre: posicion for posicion, nombre in enumerate(columnas or [])}
+    arboles = []
+    for texto in volcado:
+        nodos, pendientes = [], [json.loads(texto)]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos.append(nodo)
+            pendientes.extend(nodo.get('children', []))
+        indice = {nodo['nodeid']: posicion for posicion, nodo in enumerate(nodos)}
+        arbol = {'columna': [], 'umbral': [], 'izquierdo': [], 'derecho': [], 'valor': [], 'nan_izquierda': []}
+        for nodo in nodos:
+            if 'leaf' in nodo:
+                fila = (0, np.inf, -1, -1, nodo['leaf'], True)
+            else:
+                nombre = nodo['split']
+                columna = posiciones_columna[nombre] if nombre in posiciones_columna else int(nombre.lstrip('f'))
+                # x < c en float32 equivale a x <= (el float32 anterior a c)
+                umbral = np.nextafter(np.float32(nodo['split_condition']), np.float32(-np.inf))
+                fila = (columna, float(umbral), indice[nodo['yes']], indice[nodo['no']], 0.0,
+                        nodo['missing'] == nodo['yes'])
+            for clave, dato in zip(arbol, fila):
+                arbol[clave].append(dato)
+        arboles.append({clave: np.array(datos) for clave, datos in arbol.items()})
+    return arboles
+
+
+def _arboles_lgbm(volcado):
+    """
+    Árboles a partir de `Booster.dump_model()` (el valor inicial ya está incluido en las hojas del primero).
+    """
+    arboles = []
+    for info in volcado['tree_info']:
+        nodos, pendientes = [], [info['tree_structure']]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos.append(nodo)
+            if 'leaf_value' not in nodo:
+                pendientes.extend([nodo['left_child'], nodo['right_child']])
+        posicion = {id(nodo): indice for indice, nodo in enumerate(nodos)}
+        arbol = {'columna': [], 'umbral': [], 'izquierdo': [], 'derecho': [], 'valor': [], 'nan_izquierda': []}
+        for nodo in nodos:
+            if 'leaf_value' in nodo:
+                fila = (0, np.inf, -1, -1, nodo['leaf_value'], True)
+            else:
+                if nodo['decision_type'] != '<=' or nodo['missing_type'] == 'Zero':
+                    raise ValueError('Solo se admiten divisiones numéricas sin `zero_as_missing`.')
+                # Con missing_type 'None', LightGBM trata los NaN como 0
+                nan_izquierda = nodo['default_left'] if nodo['missing_type'] == 'NaN' else 0.0 <= nodo['threshold']
+                fila = (nodo['split_feature'], nodo['threshold'], posicion[id(nodo['left_child'])],
+                        posicion[id(nodo['right_child'])], 0.0, nan_izquierda)
+            for clave, dato in zip(arbol, fila):
+                arbol[clave].append(dato)
+        arboles.append({clave: np.array(datos) for clave, datos in arbol.items()})
+    return arboles
+
+
+def compilar_bosque(modelo, max_pares=65536):
+    """
+    Aplana un ensemble de árboles entrenado en un `BosqueCompilado`.
+
+    Modelos admitidos:
+    - scikit-learn: ExtraTreesRegressor, RandomForestRegressor (media de los árboles) y
+      GradientBoostingRegressor (valor inicial + learning_rate * suma).
+    - XGBRegressor con booster 'gbtree' y objetivo de enlace identidad (hasta `best_iteration`
+      si se entrenó con parada temprana, como su `predict`).
+    - LGBMRegressor con divisiones numéricas y objetivo de enlace identidad.
+    """
+    nombre = modelo.__class__.__name__
+    columnas = getattr(modelo, 'feature_names_in_', None)
+
+    if nombre.startswith('XGB'):
+        booster = modelo.get_booster()
+        configuracion = json.loads(booster.save_config())['learner']
+        objetivo = configuracion['objective']['name']
+        if objetivo not in OBJETIVOS_XGB or configuracion['gradient_booster']['name'] != 'gbtree':
+            raise ValueError(f"Solo se admiten boosters 'gbtree' con objetivos {OBJETIVOS_XGB}.")
+        volcado = booster.get_dump(dump_format='json')
+        try:
+            arboles_ronda = len(volcado) // booster.num_boosted_rounds()
+            volcado = volcado[:(modelo.best_iteration + 1) * arboles_ronda]
+        except AttributeError:
+            pass
+        base = float(configuracion['learner_model_param']['base_score'].strip('[]'))
+        columnas = booster.feature_names
+        return BosqueCompilado(_arboles_xgb(volcado, columnas), base=base, columnas=columnas,
+                               tipo_entrada=np.float32, max_pares=max_pares)
+
+    if nombre.startswith('LGBM'):
+        volcado = modelo.booster_.dump_model()
+        if volcado['objective'].split()[0] not in OBJETIVOS_LGBM:
+            raise ValueError(f'Solo se admiten objetivos {OBJETIVOS_LGBM}.')
+        return BosqueCompilado(_arboles_lgbm(volcado), columnas=volcado['feature_names'],
+                               tipo_entrada=np.float64, max_pares=max_pares)
+
+    if nombre == 'GradientBoostingRegressor':
+        arboles = [_arbol_sklearn(arbol) for arbol in modelo.estimators_[:, 0]]
+        base = 0.0 if modelo.init_ == 'zero' else float(
+            np.ravel(modelo.init_.predict(np.zeros((1, modelo.n_features_in_))))[0])
+        return BosqueCompilado(arboles, escala=modelo.learning_rate, base=base, columnas=columnas,
+                               max_pares=max_pares)
+
+    if hasattr(modelo, 'estimators_') and all(hasattr(arbol, 'tree_') for arbol in modelo.estimators_):
+        arboles = [_arbol_sklearn(arbol) for arbol in modelo.estimators_]
+        return BosqueCompilado(arboles, escala=1.0 / len(arboles), columnas=columnas, max_pares=max_pares)
+
+    raise ValueError(f"Modelo no admitido: '{nombre}'.")
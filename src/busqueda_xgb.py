@@ -0,0 +1,347 @@
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+
+# Espacio de la búsqueda aleatoria del notebook 03 (n_estimators lo fija la parada temprana)
+def espacio_xgb():
+    from scipy.stats import randint, uniform
+
+    return {
+        'learning_rate': uniform(0.01, 0.3),
+        'max_depth': randint(3, 16),
+        'gamma': uniform(0.0, 0.5),
+        'subsample': uniform(0.5, 0.5),
+        'colsample_bytree': uniform(0.5, 0.5),
+        'base_score': uniform(0.3, 0.5),
+        'max_leaves': randint(40, 100),
+    }
+
+
+PARAMETROS_FIJOS = {'booster': 'gbtree', 'objective': 'reg:squarederror', 'tree_method': 'auto', 'random_state': 42}
+
+# Rangos válidos de los parámetros numéricos de XGBoost: (mínimo, máximo, si el mínimo está excluido)
+RANGOS_PARAMETROS = {
+    'learning_rate': (0.0, None, True),
+    'subsample': (0.0, 1.0, True),
+    'colsample_bytree': (0.0, 1.0, True),
+    'colsample_bylevel': (0.0, 1.0, True),
+    'colsample_bynode': (0.0, 1.0, True),
+    'gamma': (0.0, None, False),
+    'min_child_weight': (0.0, None, False),
+    'reg_alpha': (0.0, None, False),
+    'reg_lambda': (0.0, None, False),
+}
+
+
+def _a_python(valor):
+    """
+    Convierte escalares de NumPy a tipos de Python (para JSON y para comparar configuraciones).
+    """
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+def _limpiar(parametros):
+    return {clave: _a_python(valor) for clave, valor in sorted(parametros.items()) if clave != 'n_estimators'}
+
+
+def _recortar(clave, valor):
+    """
+    Lleva un valor numérico al rango válido del parámetro (los mínimos excluidos se sustituyen por 1e-6).
+    """
+    if clave not in RANGOS_PARAMETROS:
+        return valor
+    minimo, maximo, excluido = RANGOS_PARAMETROS[clave]
+    valor = max(valor, minimo + 1e-6 if excluido else minimo)
+    return valor if maximo is None else min(valor, maximo)
+
+
+def _huella(X, y, particiones, especificacion):
+    """
+    Hash de los datos, las particiones y la configuración común de la búsqueda, como
+    `cache_folds.clave_cache`. Forma parte de la clave de cada prueba del checkpoint, así que
+    un checkpoint de otra búsqueda (otros datos, folds o parámetros fijos) no se reutiliza.
+    """
+    resumen = hashlib.sha256()
+    resumen.update(np.ascontiguousarray(X).tobytes())
+    resumen.update(np.ascontiguousarray(y).tobytes())
+    for train_index, val_index in particiones:
+        resumen.update(np.asarray(train_index, dtype=np.int64).tobytes())
+        resumen.update(np.asarray(val_index, dtype=np.int64).tobytes())
+    resumen.update(json.dumps(especificacion, sort_keys=True, default=str).encode())
+    return resumen.hexdigest()[:16]
+
+
+def _clave(huella, parametros, presupuesto, fold):
+    texto = json.dumps([huella, parametros, round(presupuesto, 10), fold], sort_keys=True)
+    return hashlib.sha1(texto.encode()).hexdigest()
+
+
+def _evaluar_prueba(parametros, X, y, train_index, val_index, presupuesto, n_estimators_max, paradas,
+                    fraccion_parada, hilos, semilla):
+    """
+    Entrena un XGBRegressor en una fracción `presupuesto` de las filas de train del fold, con hasta
+    `presupuesto * n_estimators_max` árboles y parada temprana nativa.
+
+    La parada temprana usa una fracción `fraccion_parada` de las filas de train del fold, apartada
+    antes de submuestrear (la misma en todos los presupuestos); el fold de validación solo se usa
+    para puntuar, así que el RMSLE no está sesgado por la elección del número de árboles.
+
+    Con el objetivo en log1p, el RMSE sobre validación es el RMSLE en la escala de SalePrice.
+    """
+    from xgboost import XGBRegressor
+
+    rng = np.random.default_rng(semilla)
+    mezcla = rng.permutation(train_index)
+    n_parada = max(int(round(len(train_index) * fraccion_parada)), 1)
+    parada_index, train_index = np.sort(mezcla[:n_parada]), np.sort(mezcla[n_parada:])
+    if presupuesto < 1:
+        n_filas = max(int(round(len(train_index) * presupuesto)), 2)
+        train_index = np.sort(rng.choice(train_index, size=n_filas, replace=False))
+    n_arboles = max(int(round(n_estimators_max * presupuesto)), paradas)
+
+    modelo = XGBRegressor(**parametros, n_estimators=n_arboles, early_stopping_rounds=paradas,
+                          eval_metric='rmse', n_jobs=hilos)
+    modelo.fit(X[train_index], y[train_index], eval_set=[(X[parada_index], y[parada_index])], verbose=False)
+    mejor_iteracion = int(modelo.best_iteration) + 1
+    yhat = modelo.predict(X[val_index], iteration_range=(0, mejor_iteracion))
+    return float(np.sqrt(np.mean((yhat - y[val_index]) ** 2))), mejor_iteracion
+
+
+class _Evaluador:
+    """
+    Evalúa lotes de (configuración, fold) en paralelo y guarda cada resultado en un checkpoint JSONL.
+    Al reanudar, las evaluaciones ya presentes en el checkpoint no se repiten; la clave de cada prueba
+    incluye la huella de los datos y la configuración común, así que solo se reutilizan las de la
+    misma búsqueda.
+    """
+
+    def __init__(self, X, y, cv, parametros_fijos, n_estimators_max, paradas, fraccion_parada, n_jobs,
+                 hilos_por_prueba, ruta_checkpoint, semilla):
+        self.X = X.to_numpy(dtype=float) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=float)
+        self.y = np.log1p(np.asarray(y, dtype=float))
+        self.particiones = list(cv.split(self.X))
+        self.parametros_fijos = parametros_fijos
+        self.n_estimators_max = n_estimators_max
+        self.paradas = paradas
+        self.fraccion_parada = fraccion_parada
+        self.n_jobs = n_jobs
+        self.hilos_por_prueba = hilos_por_prueba
+        self.ruta_checkpoint = ruta_checkpoint
+        self.semilla = semilla
+        self.huella = _huella(self.X, self.y, self.particiones, {
+            'parametros_fijos': parametros_fijos, 'n_estimators_max': n_estimators_max, 'paradas': paradas,
+            'fraccion_parada': fraccion_parada, 'semilla': semilla})
+        self.hechas = {}
+        if ruta_checkpoint and os.path.exists(ruta_checkpoint):
+            with open(ruta_checkpoint, encoding='utf-8') as archivo:
+                for linea in archivo:
+                    if linea.strip():
+                        registro = json.loads(linea)
+                        self.hechas[registro['clave']] = registro
+
+    def evaluar(self, configuraciones, presupuesto):
+        """
+        Devuelve, para cada configuración, el RMSLE medio, su desviación y el número medio de árboles.
+        """
+        pendientes = []
+        for parametros in configuraciones:
+            for fold in range(len(self.particiones)):
+                clave = _clave(self.huella, parametros, presupuesto, fold)
+                if clave not in self.hechas:
+                    pendientes.append((clave, parametros, fold))
+
+        if pendientes:
+            tareas = (delayed(_evaluar_prueba)(
+                {**self.parametros_fijos, **parametros}, self.X, self.y, *self.particiones[fold], presupuesto,
+                self.n_estimators_max, self.paradas, self.fraccion_parada, self.hilos_por_prueba, self.semilla + fold)
+                for _, parametros, fold in pendientes)
+            # Los resultados se guardan según llegan: si la búsqueda se interrumpe, se conservan
+            salidas = Parallel(n_jobs=self.n_jobs, return_as='generator')(tareas)
+            archivo = open(self.ruta_checkpoint, 'a', encoding='utf-8') if self.ruta_checkpoint else None
+            try:
+                for (clave, parametros, fold), (rmsle, n_arboles) in zip(pendientes, salidas):
+                    registro = {'clave': clave, 'huella': self.huella, 'parametros': parametros, 'presupuesto': presupuesto, 'fold': fold,
+                                'rmsle': rmsle, 'n_arboles': n_arboles}
+                    self.hechas[clave] = registro
+                    if archivo:
+                        archivo.write(json.dumps(registro) + '\n')
+                        archivo.flush()
+            finally:
+                if archivo:
+                    archivo.close()
+
+        resumen = []
+        for parametros in configuraciones:
+            registros = [self.hechas[_clave(self.huella, parametros, presupuesto, fold)] for fold in range(len(self.particiones))]
+            rmsle = np.array([registro['rmsle'] for registro in registros])
+            resumen.append((rmsle.mean(), rmsle.std(), int(round(np.mean([r['n_arboles'] for r in registros])))))
+        return resumen
+
+
+def _halving(evaluador, configuraciones, presupuestos, eta, bracket, filas):
+    """
+    Una ronda de successive halving: evalúa todas las configuraciones con el presupuesto más bajo
+    y pasa a la siguiente solo el mejor 1/eta, hasta llegar al presupuesto completo.
+    """
+    for ronda, presupuesto in enumerate(presupuestos):
+        resumen = evaluador.evaluar(configuraciones, presupuesto)
+        for parametros, (media, desviacion, n_arboles) in zip(configuraciones, resumen):
+            filas.append({'params': parametros, 'bracket': bracket, 'ronda': ronda, 'presupuesto': presupuesto,
+                          'n_configuraciones': len(configuraciones), 'rmsle_medio': media, 'rmsle_std': desviacion,
+                          'n_estimators': n_arboles})
+        if ronda < len(presupuestos) - 1:
+            orden = np.argsort([media for media, _, _ in resumen], kind='stable')
+            configuraciones = [configuraciones[i] for i in orden[:max(len(configuraciones) // eta, 1)]]
+
+
+def _resultados(filas, parametros_fijos):
+    """
+    DataFrame de resultados (estilo `cv_results_`) y mejores parámetros con presupuesto completo.
+    """
+    resultados = pd.DataFrame(filas)
+    parametros = pd.json_normalize(resultados['params'].tolist()).add_prefix('param_')
+    resultados = pd.concat([resultados, parametros], axis=1)
+    resultados['mean_test_score'] = -resultados['rmsle_medio']
+    resultados['std_test_score'] = resultados['rmsle_std']
+
+    completos = resultados['presupuesto'] >= 1
+    resultados['rank_test_score'] = resultados['rmsle_medio'].where(completos).rank(method='min')
+    mejor = resultados.loc[resultados['rmsle_medio'].where(completos).idxmin()]
+    mejores_parametros = {**parametros_fijos, **mejor['params'], 'n_estimators': int(mejor['n_estimators'])}
+    return mejores_parametros, resultados.sort_values(['presupuesto', 'rmsle_medio'], ascending=[False, True],
+                                                      ignore_index=True)
+
+
+def _evaluador(X, y, cv, parametros_fijos, n_estimators_max, paradas, fraccion_parada, n_jobs, hilos_por_prueba,
+               ruta_checkpoint, semilla):
+    from sklearn.model_selection import KFold
+
+    cv = KFold(n_splits=5, shuffle=True, random_state=42) if cv is None else cv
+    parametros_fijos = PARAMETROS_FIJOS if parametros_fijos is None else parametros_fijos
+    return _Evaluador(X, y, cv, parametros_fijos, n_estimators_max, paradas, fraccion_parada, n_jobs,
+                      hilos_por_prueba, ruta_checkpoint, semilla)
+
+
+def busqueda_halving(X, y, configuraciones=None, espacio=None, n_configuraciones=81, eta=3, presupuesto_min=1 / 9,
+                     cv=None, parametros_fijos=None, n_estimators_max=1500, paradas=50, fraccion_parada=0.1,
+                     n_jobs=-1, hilos_por_prueba=1, ruta_checkpoint=None, semilla=42):
+    """
+    Búsqueda de hiperparámetros de XGBRegressor por successive halving con parada temprana.
+
+    El presupuesto de cada ronda es la fracción de filas de train de cada fold y, en la misma proporción,
+    el máximo de árboles (`n_estimators_max`). Dentro de cada fold, XGBoost para cuando el RMSE sobre
+    una parte apartada de las filas de train (`fraccion_parada`) no mejora en `paradas` rondas, así que
+    `n_estimators` no se busca: se toma la media de la mejor iteración en los folds con el presupuesto
+    completo. El fold de validación solo se usa para puntuar.
+
+    Parámetros:
+    - X, y: Datos de entrenamiento; y en escala de SalePrice (se entrena con log1p, como en el notebook 03).
+    - configuraciones: Lista de diccionarios de parámetros a evaluar (p. ej. de
+      `configuraciones_desde_busqueda`). Si es None, se muestrean `n_configuraciones` de `espacio`.
+    - espacio: Distribuciones/listas de parámetros (por defecto, `espacio_xgb()`).
+    - eta: Factor de reducción entre rondas.
+    - presupuesto_min: Fracción de filas de la primera ronda.
+    - cv: Validación cruzada (por defecto, KFold(5, shuffle=True, random_state=42)).
+    - parametros_fijos: Parámetros comunes a todas las pruebas (por defecto, `PARAMETROS_FIJOS`).
+    - fraccion_parada: Fracción de las filas de train de cada fold reservada para la parada temprana.
+    - n_jobs: Pruebas (configuración x fold) en paralelo; `hilos_por_prueba` hilos de XGBoost cada una.
+    - ruta_checkpoint: Archivo JSONL donde se guarda cada prueba. Si existe, la búsqueda se reanuda
+      (solo con las pruebas hechas con los mismos datos, folds y configuración común).
+
+    Retorna:
+    - Diccionario con los mejores parámetros (incluido `n_estimators`).
+    - DataFrame con una fila por configuración y ronda: 'params', 'presupuesto', 'rmsle_medio',
+      'mean_test_score' (RMSLE negativo, como el scorer del notebook), 'rank_test_score', 'param_*'...
+    """
+    from sklearn.model_selection import ParameterSampler
+
+    if configuraciones is None:
+        espacio = espacio_xgb() if espacio is None else espacio
+        configuraciones = list(ParameterSampler(espacio, n_configuraciones, random_state=semilla))
+    configuraciones = [_limpiar(parametros) for parametros in configuraciones]
+
+    evaluador = _evaluador(X, y, cv, parametros_fijos, n_estimators_max, paradas, fraccion_parada, n_jobs,
+                           hilos_por_prueba, ruta_checkpoint, semilla)
+    n_rondas = int(math.floor(math.log(1 / presupuesto_min, eta) + 1e-9)) + 1
+    presupuestos = [float(eta ** (ronda - n_rondas + 1)) for ronda in range(n_rondas)]
+
+    filas = []
+    _halving(evaluador, configuraciones, presupuestos, eta, 0, filas)
+    return _resultados(filas, evaluador.parametros_fijos)
+
+
+def busqueda_hyperband(X, y, espacio=None, eta=3, presupuesto_min=1 / 27, cv=None, parametros_fijos=None,
+                       n_estimators_max=1500, paradas=50, fraccion_parada=0.1, n_jobs=-1, hilos_por_prueba=1,
+                       ruta_checkpoint=None, semilla=42):
+    """
+    Hyperband: varias rondas de successive halving (brackets) que reparten el mismo presupuesto entre
+    muchas configuraciones con poco presupuesto o pocas con presupuesto completo.
+    Mismos parámetros y salida que `busqueda_halving`; el DataFrame incluye la columna 'bracket'.
+    """
+    from sklearn.model_selection import ParameterSampler
+
+    espacio = espacio_xgb() if espacio is None else espacio
+    evaluador = _evaluador(X, y, cv, parametros_fijos, n_estimators_max, paradas, fraccion_parada, n_jobs,
+                           hilos_por_prueba, ruta_checkpoint, semilla)
+    s_max = int(math.floor(math.log(1 / presupuesto_min, eta) + 1e-9))
+
+    filas = []
+    for bracket, s in enumerate(range(s_max, -1, -1)):
+        n_configuraciones = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        configuraciones = [_limpiar(parametros) for parametros in
+                           ParameterSampler(espacio, n_configuraciones, random_state=semilla + bracket)]
+        presupuestos = [float(eta ** (ronda - s)) for ronda in range(s + 1)]
+        _halving(evaluador, configuraciones, presupuestos, eta, bracket, filas)
+    return _resultados(filas, evaluador.parametros_fijos)
+
+
+def configuraciones_desde_busqueda(busqueda, top_k=5, n_vecinos=8, escala=0.05, parametros_grid=None, semilla=42):
+    """
+    Configuraciones para refinar a partir de una búsqueda previa, en lugar de un grid completo.
+
+    Toma las `top_k` mejores configuraciones y, para cada una, `n_vecinos` variaciones: cada parámetro
+    numérico se multiplica por un factor en [1 - escala, 1 + escala] (los enteros se redondean) y se
+    recorta a su rango válido (`RANGOS_PARAMETROS`: subsample y colsample_* en (0, 1], learning_rate > 0,
+    gamma, min_child_weight y reg_* >= 0). Si se indica `parametros_grid`, los vecinos se muestrean
+    del grid en su lugar.
+
+    Parámetros:
+    - busqueda: `RandomizedSearchCV`/`GridSearchCV` ajustado, su `cv_results_`, o el DataFrame de
+      `busqueda_halving`/`busqueda_hyperband`.
+    """
+    from sklearn.model_selection import ParameterSampler
+
+    resultados = pd.DataFrame(getattr(busqueda, 'cv_results_', busqueda))
+    if 'presupuesto' in resultados:
+        resultados = resultados[resultados['presupuesto'] >= 1]
+    mejores = resultados.sort_values('mean_test_score', ascending=False)['params'].head(top_k)
+    mejores = [_limpiar(parametros) for parametros in mejores]
+
+    rng = np.random.default_rng(semilla)
+    configuraciones = list(mejores)
+    for indice, parametros in enumerate(mejores):
+        if parametros_grid is not None:
+            vecinos = ParameterSampler(parametros_grid, n_vecinos, random_state=semilla + indice)
+            configuraciones.extend({**parametros, **_limpiar(vecino)} for vecino in vecinos)
+            continue
+        for _ in range(n_vecinos):
+            vecino = {}
+            for clave, valor in parametros.items():
+                if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                    vecino[clave] = valor
+                elif isinstance(valor, int):
+                    entero = int(round(valor * (1 + rng.uniform(-escala, escala))))
+                    vecino[clave] = _recortar(clave, entero) if clave in RANGOS_PARAMETROS else max(entero, 1)
+                else:
+                    vecino[clave] = _recortar(clave, valor * (1 + rng.uniform(-escala, escala)))
+            configuraciones.append(vecino)
+
+    # Sin duplicados, conservando el orden
+    unicas = {json.dumps(parametros, sort_keys=True): parametros for parametros in configuraciones}
+    return list(unicas.values())
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from torneo import METRICAS
+
+
+ARRAYS_FOLD = ('X_train', 'X_val', 'y_train', 'y_val')
+
+
+def clave_cache(X, y, particiones, especificacion):
+    """
+    Hash que identifica un conjunto de folds preparados: datos, particiones y transformaciones.
+    """
+    resumen = hashlib.sha256()
+    resumen.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    resumen.update(pd.util.hash_pandas_object(y, index=True).to_numpy().tobytes())
+    resumen.update(json.dumps(list(X.columns)).encode())
+    for train_index, val_index in particiones:
+        resumen.update(np.asarray(train_index, dtype=np.int64).tobytes())
+        resumen.update(np.asarray(val_index, dtype=np.int64).tobytes())
+    resumen.update(json.dumps(especificacion, sort_keys=True).encode())
+    return resumen.hexdigest()[:16]
+
+
+def _minmax(train, val):
+    """
+    Escalado MinMax ajustado en `train` (mismo criterio que MinMaxScaler: NaN ignorados, rango nulo -> escala 1).
+    Devuelve las matrices escaladas y los parámetros (escala, minimo) para revertirlo.
+    """
+    minimo_datos = np.nanmin(train, axis=0)
+    rango = np.nanmax(train, axis=0) - minimo_datos
+    rango[rango == 0.0] = 1.0
+    escala = 1.0 / rango
+    minimo = -minimo_datos * escala
+    return train * escala + minimo, val * escala + minimo, escala, minimo
+
+
+def preparar_folds(X, y, cv, columnas_logaritmo=(), escalar=True, log_objetivo=True,
+                   ruta_cache='../data/cache/folds'):
+    """
+    Prepara una sola vez las matrices transformadas de cada fold y las guarda como .npy para
+    leerlas con memoria mapeada: todos los modelos (y procesos) comparten las mismas páginas.
+
+    Transformaciones, en el orden del notebook 03:
+    1. log1p a `columnas_logaritmo` y al objetivo (se aplica una vez a todo el conjunto,
+       ya que no depende del fold).
+    2. MinMaxScaler ajustado en el train de cada fold, para X y para el objetivo.
+
+    Si ya existe una caché con la misma clave (datos + particiones + transformaciones), no se recalcula.
+
+    Retorna:
+    - Lista de diccionarios por fold con 'X_train', 'X_val', 'y_train', 'y_val' (memmap de solo lectura),
+      'val_index' y los parámetros 'escala_y'/'minimo_y' para revertir el escalado del objetivo.
+    """
+    particiones = [(np.asarray(train_index), np.asarray(val_index)) for train_index, val_index in cv.split(X)]
+    especificacion = {'columnas_logaritmo': list(columnas_logaritmo), 'escalar': escalar,
+                      'log_objetivo': log_objetivo}
+    ruta = os.path.join(ruta_cache, clave_cache(X, y, particiones, especificacion))
+
+    if not os.path.exists(os.path.join(ruta, 'completo')):
+        os.makedirs(ruta, exist_ok=True)
+
+        matriz = X.to_numpy(dtype=float, copy=True)
+        posiciones = [X.columns.get_loc(col) for col in columnas_logaritmo]
+        matriz[:, posiciones] = np.log1p(matriz[:, posiciones])
+        objetivo = y.to_numpy(dtype=float).reshape(-1, 1)
+        objetivo_transformado = np.log1p(objetivo) if log_objetivo else objetivo
+
+        parametros = []
+        for fold, (train_index, val_index) in enumerate(particiones):
+            X_train, X_val = matriz[train_index], matriz[val_index]
+            y_train, y_val = objetivo_transformado[train_index], objetivo_transformado[val_index]
+            escala_y, minimo_y = np.ones(1), np.zeros(1)
+            if escalar:
+                X_train, X_val, _, _ = _minmax(X_train, X_val)
+                y_train, y_val, escala_y, minimo_y = _minmax(y_train, y_val)
+
+            for nombre, array in zip(ARRAYS_FOLD, (X_train, X_val, y_train.ravel(), y_val.ravel())):
+                np.save(os.path.join(ruta, f'fold_{fold}_{nombre}.npy'), np.ascontiguousarray(array))
+            np.save(os.path.join(ruta, f'fold_{fold}_val_index.npy'), val_index)
+            parametros.append({'escala_y': float(escala_y[0]), 'minimo_y': float(minimo_y[0])})
+
+        with open(os.path.join(ruta, 'parametros.json'), 'w') as archivo:
+            json.dump({'especificacion': especificacion, 'folds': parametros}, archivo)
+        # El marcador se escribe al final: una caché interrumpida se vuelve a generar
+        open(os.path.join(ruta, 'completo'), 'w').close()
+
+    return cargar_folds(ruta)
+
+
+def cargar_folds(ruta):
+    """
+    Carga los folds de una caché ya generada con memoria mapeada (sin copiar los datos).
+    """
+    with open(os.path.join(ruta, 'parametros.json')) as archivo:
+        parametros = json.load(archivo)
+
+    folds = []
+    for fold, parametros_fold in enumerate(parametros['folds']):
+        datos = {nombre: np.load(os.path.join(ruta, f'fold_{fold}_{nombre}.npy'), mmap_mode='r')
+                 for nombre in ARRAYS_FOLD}
+        datos['val_index'] = np.load(os.path.join(ruta, f'fold_{fold}_val_index.npy'))
+        datos.update(parametros_fold)
+        datos['log_objetivo'] = parametros['especificacion']['log_objetivo']
+        datos['ruta'] = ruta
+        folds.append(datos)
+    return folds
+
+
+def invertir_objetivo(fold, valores):
+    """
+    Revierte el escalado y el logaritmo del objetivo para volver a la escala de SalePrice.
+    """
+    valores = (np.asarray(valores, dtype=float) - fold['minimo_y']) / fold['escala_y']
+    return np.expm1(valores) if fold['log_objetivo'] else valores
+
+
+def evaluar_modelos_folds(modelos, folds, metricas=None):
+    """
+    Entrena y evalúa cada modelo en los folds preparados, reutilizando las mismas matrices.
+
+    Retorna:
+    - DataFrame con las columnas 'Modelo', 'R2', 'MAE', 'RMSE', 'MSE', 'RMSLE' (una fila por modelo y fold).
+    """
+    metricas = METRICAS if metricas is None else metricas
+    resultados = []
+    for modelo in modelos:
+        for fold in folds:
+            modelo.fit(fold['X_train'], fold['y_train'])
+            yhat = invertir_objetivo(fold, modelo.predict(fold['X_val']))
+            y_val = invertir_objetivo(fold, fold['y_val'])
+            resultados.append([modelo.__class__.__name__] + [metrica(y_val, yhat) for metrica in metricas.values()])
+
+    return pd.DataFrame(resultados, columns=['Modelo'] + list(metricas))
@@ -0,0 +1,380 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+def _codigos_columna(valores, categorias):
+    """
+    Devuelve la posición de cada valor dentro de `categorias` (-1 si no se vio en el ajuste).
+    Los NaN solo coinciden si NaN forma parte de las categorías.
+    """
+    return pd.Index(categorias).get_indexer(valores)
+
+
+def _categorias_a_arrays(categorias):
+    """
+    Categorías sin NaN (para guardarlas sin pickle) y posición del NaN (-1 si no hay).
+    """
+    es_nan = pd.isna(categorias)
+    return (np.asarray(categorias[~es_nan].tolist()),
+            np.asarray(np.flatnonzero(es_nan)[0] if es_nan.any() else -1))
+
+
+def _categorias_desde_arrays(categorias, posicion_nan):
+    categorias = categorias.astype(object)
+    if int(posicion_nan) >= 0:
+        categorias = np.insert(categorias, int(posicion_nan), np.nan)
+    return categorias
+
+
+class EstadisticasCategorias:
+    """
+    Estadísticos combinables por categoría de una columna: filas, observaciones con objetivo válido
+    y suma del objetivo, además de los totales globales.
+
+    Las categorías se guardan en orden de primera aparición (NaN incluido, como una categoría más),
+    de modo que actualizar trozo a trozo, o combinar las estadísticas de varios archivos en orden,
+    da el mismo resultado que calcularlas con todas las filas a la vez. A partir de ellas se
+    construyen los codificadores con `desde_estadisticas`.
+    """
+
+    def __init__(self):
+        self.categorias = pd.Index([], dtype=object)
+        self.filas = np.zeros(0)
+        self.conteos = np.zeros(0)
+        self.sumas = np.zeros(0)
+        self.n_filas = 0
+        self.n_objetivo = 0
+        self.suma_objetivo = 0.0
+
+    def _codigos(self, valores):
+        """
+        Posición de cada valor en `categorias`, añadiendo al final las que no estaban.
+        """
+        codigos_lote, unicos = pd.factorize(np.asarray(valores, dtype=object), use_na_sentinel=False)
+        unicos = pd.Index(unicos, dtype=object)
+        posiciones = self.categorias.get_indexer(unicos) if len(self.categorias) else np.full(len(unicos), -1)
+        nuevos = posiciones == -1
+        if nuevos.any():
+            posiciones[nuevos] = len(self.categorias) + np.arange(nuevos.sum())
+            self.categorias = self.categorias.append(unicos[nuevos])
+            extra = len(self.categorias) - len(self.filas)
+            self.filas, self.conteos, self.sumas = (np.pad(array, (0, extra))
+                                                    for array in (self.filas, self.conteos, self.sumas))
+        return posiciones[codigos_lote]
+
+    def actualizar(self, valores, y=None):
+        """
+        Añade un trozo de valores (y su objetivo, si lo hay). Devuelve las propias estadísticas.
+        """
+        codigos = self._codigos(valores)
+        tamano = len(self.categorias)
+        self.filas += np.bincount(codigos, minlength=tamano)
+        self.n_filas += len(codigos)
+        if y is not None:
+            y = np.asarray(y, dtype=float)
+            validos = ~np.isnan(y)
+            self.conteos += np.bincount(codigos[validos], minlength=tamano)
+            self.sumas += np.bincount(codigos[validos], weights=y[validos], minlength=tamano)
+            self.n_objetivo += int(validos.sum())
+            # Misma suma que `np.nanmean` (NaN sustituidos por 0), para coincidir con el ajuste completo
+            self.suma_objetivo += float(np.where(validos, y, 0.0).sum())
+        return self
+
+    def combinar(self, otra):
+        """
+        Suma las estadísticas de otro trozo o archivo (sus categorías nuevas van al final).
+        """
+        codigos = self._codigos(otra.categorias.to_numpy())
+        np.add.at(self.filas, codigos, otra.filas)
+        np.add.at(self.conteos, codigos, otra.conteos)
+        np.add.at(self.sumas, codigos, otra.sumas)
+        self.n_filas += otra.n_filas
+        self.n_objetivo += otra.n_objetivo
+        self.suma_objetivo += otra.suma_objetivo
+        return self
+
+    @property
+    def media_objetivo(self):
+        return self.suma_objetivo / self.n_objetivo if self.n_objetivo else np.nan
+
+
+class _CodificadorBase(BaseEstimator, TransformerMixin):
+    """
+    Base común de los codificadores: guarda, para cada columna, las categorías vistas en el ajuste
+    (`categorias_`) y un array de valores codificados (`valores_`) con una posición extra al final
+    para las categorías desconocidas. `transform` se reduce a un `np.take` por columna.
+    """
+
+    # Atributos escalares que se guardan junto a los arrays
+    _atributos_guardar = ()
+
+    def __init__(self, cols=None):
+        self.cols = cols
+
+    def _columnas(self, X):
+        return list(X.columns) if self.cols is None else list(self.cols)
+
+    def transform(self, X):
+        """
+        Sustituye cada columna ajustada por su valor codificado. Devuelve una copia de X.
+        """
+        X = X.copy()
+        for col, categorias, valores in zip(self.columnas_, self.categorias_, self.valores_):
+            codigos = _codigos_columna(X[col], categorias)
+            # El código -1 (desconocido) toma la última posición de `valores`
+            X[col] = np.take(valores, codigos)
+        return X
+
+    def guardar(self, ruta):
+        """
+        Guarda el mapeo ajustado en un archivo .npz (sin pickle).
+        """
+        arrays = {'columnas': np.asarray(self.columnas_, dtype=str)}
+        for idx, (categorias, valores) in enumerate(zip(self.categorias_, self.valores_)):
+            arrays[f'categorias_{idx}'], arrays[f'posicion_nan_{idx}'] = _categorias_a_arrays(categorias)
+            arrays[f'valores_{idx}'] = valores
+        for atributo in self._atributos_guardar:
+            arrays[atributo] = np.asarray(getattr(self, atributo))
+        arrays.update(self._arrays_estado())
+        np.savez(ruta, **arrays)
+
+    def _arrays_estado(self):
+        return {}
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un codificador guardado con `guardar`, listo para `transform`.
+        """
+        with np.load(ruta, allow_pickle=False) as datos:
+            codificador = cls()
+            codificador.columnas_ = datos['columnas'].tolist()
+            codificador.categorias_ = []
+            codificador.valores_ = []
+            for idx in range(len(codificador.columnas_)):
+                codificador.categorias_.append(_categorias_desde_arrays(datos[f'categorias_{idx}'],
+                                                                        datos[f'posicion_nan_{idx}']))
+                codificador.valores_.append(datos[f'valores_{idx}'])
+            for atributo in cls._atributos_guardar:
+                # Los archivos anteriores pueden no tener todos los atributos
+                if atributo in datos.files:
+                    setattr(codificador, atributo, datos[atributo].item())
+            codificador._cargar_estado(datos)
+        return codificador
+
+    def _cargar_estado(self, datos):
+        pass
+
+
+class _CodificadorIncremental(_CodificadorBase):
+    """
+    Codificadores ajustados con datos cuyo estado son `EstadisticasCategorias` por columna
+    (`estadisticas_`): sumas y conteos por categoría y totales, todos aditivos.
+
+    - `partial_fit(X, y)` añade un lote de filas nuevas y refresca el mapeo: el coste es el del lote
+      más el número de categorías, sin volver a recorrer el histórico.
+    - `combinar(otro)` suma el estado de otro codificador ajustado sobre otra partición.
+    - `fit` equivale a empezar de cero y llamar a `partial_fit` con todos los datos.
+
+    `guardar` incluye el estado, así que un codificador cargado se puede seguir actualizando.
+    """
+
+    def _reiniciar(self, X):
+        self.columnas_ = self._columnas(X)
+        self.estadisticas_ = {col: EstadisticasCategorias() for col in self.columnas_}
+
+    def _usa_objetivo(self):
+        return True
+
+    def fit(self, X, y=None):
+        self._reiniciar(X)
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y=None):
+        """
+        Añade las filas de `X` (y su objetivo) al estado y refresca la codificación.
+        """
+        if getattr(self, 'estadisticas_', None) is None:
+            self._reiniciar(X)
+        y = np.asarray(y, dtype=float) if self._usa_objetivo() else None
+        for col in self.columnas_:
+            self.estadisticas_[col].actualizar(X[col], y)
+        self._refrescar()
+        return self
+
+    def combinar(self, otro):
+        """
+        Suma el estado de otro codificador de la misma clase y columnas (p. ej. ajustado en otra partición).
+        """
+        for col in self.columnas_:
+            self.estadisticas_[col].combinar(otro.estadisticas_[col])
+        self._refrescar()
+        return self
+
+    def _refrescar(self):
+        self.categorias_, self.valores_ = [], []
+        for col in self.columnas_:
+            categorias, valores = self._valores_desde(self.estadisticas_[col])
+            self.categorias_.append(categorias)
+            self.valores_.append(valores)
+
+    @classmethod
+    def desde_estadisticas(cls, estadisticas, **parametros):
+        """
+        Construye el codificador ya ajustado a partir de {columna: EstadisticasCategorias}
+        (p. ej. acumuladas por trozos con solo las filas de train), sin volver a leer los datos.
+        """
+        codificador = cls(cols=list(estadisticas), **parametros)
+        codificador.columnas_ = list(estadisticas)
+        codificador.estadisticas_ = dict(estadisticas)
+        codificador._refrescar()
+        return codificador
+
+    def _arrays_estado(self):
+        arrays = {}
+        for idx, col in enumerate(getattr(self, 'columnas_', [])):
+            estadisticas = self.estadisticas_.get(col) if getattr(self, 'estadisticas_', None) else None
+            if estadisticas is None:
+                continue
+            arrays[f'estado_categorias_{idx}'], arrays[f'estado_posicion_nan_{idx}'] = \
+                _categorias_a_arrays(estadisticas.categorias.to_numpy(dtype=object))
+            arrays[f'estado_{idx}'] = np.stack([estadisticas.filas, estadisticas.conteos, estadisticas.sumas])
+            arrays[f'estado_totales_{idx}'] = np.array([estadisticas.n_filas, estadisticas.n_objetivo,
+                                                        estadisticas.suma_objetivo], dtype=float)
+        return arrays
+
+    def _cargar_estado(self, datos):
+        if 'estado_0' not in datos.files:
+            self.estadisticas_ = None
+            return
+        self.estadisticas_ = {}
+        for idx, col in enumerate(self.columnas_):
+            estadisticas = EstadisticasCategorias()
+            estadisticas.categorias = pd.Index(_categorias_desde_arrays(datos[f'estado_categorias_{idx}'],
+                                                                        datos[f'estado_posicion_nan_{idx}']),
+                                               dtype=object)
+            estadisticas.filas, estadisticas.conteos, estadisticas.sumas = datos[f'estado_{idx}']
+            n_filas, n_objetivo, estadisticas.suma_objetivo = datos[f'estado_totales_{idx}'].tolist()
+            estadisticas.n_filas, estadisticas.n_objetivo = int(n_filas), int(n_objetivo)
+            self.estadisticas_[col] = estadisticas
+        self._refrescar()
+
+
+class CodificadorEtiquetas(_CodificadorIncremental):
+    """
+    Versión ajustable de `label_encoding`: asigna a cada categoría de train su orden de aparición
+    (NaN incluido, igual que `Series.unique`). Con `partial_fit`, las categorías nuevas reciben los
+    códigos siguientes y las ya vistas conservan el suyo.
+    Las categorías desconocidas se codifican como NaN.
+    """
+
+    def _usa_objetivo(self):
+        return False
+
+    def _valores_desde(self, estadisticas):
+        categorias = estadisticas.categorias.to_numpy(dtype=object)
+        return categorias, np.append(np.arange(len(categorias), dtype=float), np.nan)
+
+
+class CodificadorOrdinal(_CodificadorBase):
+    """
+    Versión ajustable de `aplicar_codificacion_ordinal_especifica`.
+
+    Parámetros:
+    - categorias: Diccionario {columna: lista de categorías en orden}.
+    - handle_unknown: 'error' (como OrdinalEncoder) o 'nan' para codificar las desconocidas como NaN.
+    """
+
+    def __init__(self, categorias=None, handle_unknown='error'):
+        self.categorias = categorias
+        self.handle_unknown = handle_unknown
+
+    def fit(self, X=None, y=None):
+        self.columnas_ = list(self.categorias)
+        self.categorias_ = [np.asarray(self.categorias[col], dtype=object) for col in self.columnas_]
+        self.valores_ = [np.append(np.arange(len(categorias), dtype=float), np.nan)
+                         for categorias in self.categorias_]
+        return self
+
+    def transform(self, X):
+        if getattr(self, 'handle_unknown', 'error') == 'error':
+            for col, categorias in zip(self.columnas_, self.categorias_):
+                desconocidos = _codigos_columna(X[col], categorias) == -1
+                if desconocidos.any():
+                    raise ValueError(f"Se encontraron categorías desconocidas {list(pd.unique(X[col][desconocidos]))} "
+                                     f"en la columna '{col}'.")
+        return super().transform(X)
+
+
+class CodificadorPonderado(_CodificadorIncremental):
+    """
+    Versión ajustable de `codificacion_ponderada`: media del objetivo suavizada con la media global
+    (peso `min_muestras`) y multiplicada por el porcentaje de observaciones de la categoría en train.
+    Las categorías desconocidas (y los NaN) se codifican como NaN.
+    Admite `partial_fit` con ventas nuevas y `combinar` (ver `_CodificadorIncremental`).
+    """
+
+    _atributos_guardar = ('min_muestras',)
+
+    def __init__(self, cols=None, min_muestras=10):
+        self.cols = cols
+        self.min_muestras = min_muestras
+
+    def _suavizar(self, suma, conteo, media_global, total_muestras):
+        suavizado = ((suma + media_global * self.min_muestras) / (conteo + self.min_muestras)) \
+            * (conteo / total_muestras)
+        # Categorías sin ningún objetivo válido: groupby no las habría incluido
+        suavizado[conteo == 0] = np.nan
+        return np.append(suavizado, np.nan)
+
+    def _valores_desde(self, estadisticas):
+        # Los NaN no forman categoría (se codifican como desconocidos), como en `codificacion_ponderada`
+        conocidas = ~pd.isna(estadisticas.categorias)
+        valores = self._suavizar(estadisticas.sumas[conocidas], estadisticas.conteos[conocidas],
+                                 estadisticas.media_objetivo, estadisticas.n_filas)
+        return estadisticas.categorias[conocidas].to_numpy(dtype=object), valores
+
+
+class CodificadorLOO(_CodificadorIncremental):
+    """
+    Versión ajustable de `codificacion_loo` (Leave-One-Out, mismo criterio que category_encoders).
+
+    - `fit_transform(X, y)` codifica train excluyendo el objetivo de cada fila: (suma - y) / (conteo - 1).
+    - `transform(X)` usa la media de la categoría; las categorías con una sola observación,
+      las desconocidas y los NaN no vistos en train toman la media global.
+    - Admite `partial_fit` con ventas nuevas y `combinar` (ver `_CodificadorIncremental`).
+    """
+
+    _atributos_guardar = ('media_',)
+
+    def _medias(self, suma, conteo):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias = np.where(conteo > 1, suma / conteo, self.media_)
+        return np.append(medias, self.media_)
+
+    def _refrescar(self):
+        super()._refrescar()
+        self.sumas_ = [self.estadisticas_[col].sumas for col in self.columnas_]
+        self.conteos_ = [self.estadisticas_[col].conteos for col in self.columnas_]
+
+    def _valores_desde(self, estadisticas):
+        # Todas las columnas se acumulan con las mismas filas, así que la media global coincide
+        self.media_ = estadisticas.media_objetivo
+        return estadisticas.categorias.to_numpy(dtype=object), self._medias(estadisticas.sumas, estadisticas.conteos)
+
+    def fit_transform(self, X, y=None, **fit_params):
+        return self.fit(X, y).transform_entrenamiento(X, y)
+
+    def transform_entrenamiento(self, X, y):
+        """
+        Codifica filas de train (las del ajuste) excluyendo el objetivo de cada fila.
+        """
+        y = np.asarray(y, dtype=float)
+        X = X.copy()
+        for col, categorias, suma, conteo in zip(self.columnas_, self.categorias_, self.sumas_, self.conteos_):
+            codigos = _codigos_columna(X[col], categorias)
+            conteo_fila = np.take(conteo, codigos)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                X[col] = np.where(conteo_fila > 1, (np.take(suma, codigos) - y) / (conteo_fila - 1), self.media_)
+        return X
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+
+def _matriz_pearson(X):
+    """
+    Calcula la matriz de correlación de Pearson entre las columnas de un array 2D
+    con una única operación matricial. Los NaN se tratan por pares (pairwise complete),
+    igual que `Series.corr`.
+    """
+    mascara = ~np.isnan(X)
+
+    # Centrar cada columna mejora la estabilidad numérica y no cambia la correlación
+    X = X - np.nanmean(X, axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Camino rápido: sin NaN basta con el producto de la matriz centrada
+        if mascara.all():
+            suma_cuadrados = np.einsum('ij,ij->j', X, X)
+            matriz = (X.T @ X) / np.sqrt(np.outer(suma_cuadrados, suma_cuadrados))
+        else:
+            M = mascara.astype(float)
+            X0 = np.where(mascara, X, 0.0)
+
+            n = M.T @ M                 # Nº de filas válidas en ambas columnas
+            sx = X0.T @ M               # Suma de x_i sobre las filas válidas de (i, j)
+            sxx = (X0 ** 2).T @ M       # Suma de x_i² sobre las filas válidas de (i, j)
+            sxy = X0.T @ X0             # Suma de x_i * x_j
+
+            cov = sxy - sx * sx.T / n
+            var_x = sxx - sx ** 2 / n
+            var_y = var_x.T
+            matriz = cov / np.sqrt(var_x * var_y)
+
+    return np.clip(matriz, -1.0, 1.0)
+
+
+def _matriz_spearman(X):
+    """
+    Calcula la matriz de Spearman como la matriz de Pearson de los rangos promedio.
+    Solo es exacta para columnas sin NaN; los pares con NaN se resuelven aparte.
+    """
+    from scipy.stats import rankdata
+
+    rangos = rankdata(X, axis=0, method='average')
+    return _matriz_pearson(rangos)
+
+
+def kendall_tau_b(x, y):
+    """
+    Calcula la correlación tau-b de Kendall entre dos arrays, descartando las filas con NaN.
+    Usa el algoritmo de Knight (ordenación + conteo de inversiones), O(n log n).
+    """
+    from scipy.stats import kendalltau
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    if validos.sum() < 2:
+        return np.nan
+    return kendalltau(x[validos], y[validos], variant='b')[0]
+
+
+def _spearman_par(x, y):
+    """
+    Spearman de un par de columnas con NaN, sobre las filas válidas en ambas.
+    """
+    from scipy.stats import rankdata
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    if validos.sum() < 2:
+        return np.nan
+    rangos = rankdata(np.column_stack([x[validos], y[validos]]), axis=0, method='average')
+    return _matriz_pearson(rangos)[0, 1]
+
+
+def _procesar_bloque(X, pares, pares_spearman, kendall):
+    """
+    Calcula, para un bloque de pares, el Spearman de los pares con NaN y el tau-b de Kendall.
+    """
+    spearman = [_spearman_par(X[:, i], X[:, j]) for i, j in pares_spearman]
+    tau = [kendall_tau_b(X[:, i], X[:, j]) for i, j in pares] if kendall else []
+    return spearman, tau
+
+
+def tabla_correlaciones(df, columnas, pares=None, kendall=True, n_jobs=-1, tam_bloque=64):
+    """
+    Calcula las correlaciones de Pearson, Spearman y Kendall para pares de columnas numéricas
+    y las devuelve en formato largo.
+
+    Pearson y Spearman se obtienen como matrices completas con una sola operación matricial
+    cada una. Kendall (tau-b, O(n log n)) se reparte por bloques de pares entre los núcleos.
+
+    Parámetros:
+    - df: DataFrame con los datos.
+    - columnas: Lista de columnas numéricas a evaluar.
+    - pares: Lista de tuplas (columna_1, columna_2). Por defecto, todas las combinaciones
+      de `columnas` en el mismo orden que `itertools.combinations`.
+    - kendall: Si es False no se calcula Kendall (se devuelve NaN).
+    - n_jobs: Número de procesos para los bloques de pares (-1 usa todos los núcleos).
+    - tam_bloque: Número de pares por tarea.
+
+    Retorna:
+    - DataFrame con las columnas 'Columna_1', 'Columna_2', 'Pearson', 'Spearman' y 'Kendall'.
+    """
+    from joblib import Parallel, delayed
+
+    columnas = list(columnas)
+    posicion = {col: idx for idx, col in enumerate(columnas)}
+    X = df[columnas].to_numpy(dtype=float)
+
+    if pares is None:
+        indices_i, indices_j = np.triu_indices(len(columnas), k=1)
+    else:
+        indices_i = np.array([posicion[a] for a, _ in pares], dtype=int)
+        indices_j = np.array([posicion[b] for _, b in pares], dtype=int)
+
+    pearson = _matriz_pearson(X)[indices_i, indices_j]
+
+    # Spearman matricial para las columnas completas; los pares con NaN se calculan por separado
+    con_nan = np.isnan(X).any(axis=0)
+    completas = np.flatnonzero(~con_nan)
+    matriz_spearman = np.full((len(columnas), len(columnas)), np.nan)
+    if len(completas):
+        matriz_spearman[np.ix_(completas, completas)] = _matriz_spearman(X[:, completas])
+    spearman = matriz_spearman[indices_i, indices_j]
+
+    pares_indices = list(zip(indices_i.tolist(), indices_j.tolist()))
+    requiere_spearman = con_nan[indices_i] | con_nan[indices_j]
+
+    # Reparto de los pares en bloques para procesarlos en paralelo
+    bloques = [range(inicio, min(inicio + tam_bloque, len(pares_indices)))
+               for inicio in range(0, len(pares_indices), tam_bloque)]
+    resultados = Parallel(n_jobs=1 if len(bloques) <= 1 else n_jobs)(
+        delayed(_procesar_bloque)(
+            X,
+            [pares_indices[k] for k in bloque],
+            [pares_indices[k] for k in bloque if requiere_spearman[k]],
+            kendall,
+        )
+        for bloque in bloques
+    )
+
+    tau = np.full(len(pares_indices), np.nan)
+    for bloque, (spearman_bloque, tau_bloque) in zip(bloques, resultados):
+        posiciones = [k for k in bloque if requiere_spearman[k]]
+        spearman[posiciones] = spearman_bloque
+        if kendall:
+            tau[list(bloque)] = tau_bloque
+
+    nombres = np.array(columnas, dtype=object)
+    return pd.DataFrame({
+        'Columna_1': nombres[indices_i],
+        'Columna_2': nombres[indices_j],
+        'Pearson': pearson,
+        'Spearman': spearman,
+        'Kendall': tau,
+    })
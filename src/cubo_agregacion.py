@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+COLUMNAS_CUBO = ['Variable', 'Categoria', 'Precio_Promedio', 'Num_Viviendas', 'Porcentaje_Viviendas',
+                 'Num_V_Train', 'Num_V_Test']
+
+# Estadísticos acumulados por categoría
+_ESTADISTICOS = ('n_total', 'n_train', 'n_test', 'n_objetivo', 'suma_objetivo')
+
+
+class CuboPrecios:
+    """
+    Agregados de SalePrice por categoría para muchas columnas a la vez, actualizables con filas nuevas.
+
+    Cada columna se codifica con enteros (las categorías nuevas se añaden al final de su tabla) y los
+    códigos de todas las columnas se desplazan para no solaparse, así cada estadístico se resuelve con
+    un único `np.bincount` por actualización. Solo se guardan sumas y conteos, de modo que
+    `actualizar` con un lote nuevo equivale a recalcular con todas las filas.
+
+    Como `groupby`, los NaN de la columna de agrupación no forman categoría (sí cuentan en el total
+    de filas para el porcentaje). El precio promedio usa solo los SalePrice no nulos (train).
+    """
+
+    def __init__(self, columnas, objetivo='SalePrice', columna_dataset='Dataset'):
+        self.columnas = list(columnas)
+        self.objetivo = objetivo
+        self.columna_dataset = columna_dataset
+        self.categorias = {col: pd.Index([]) for col in self.columnas}
+        self.acumulados = {col: {nombre: np.zeros(0) for nombre in _ESTADISTICOS} for col in self.columnas}
+        self.n_filas = 0
+
+    def _codigos(self, col, valores):
+        """
+        Códigos de `valores` en la tabla de categorías de `col` (-1 para NaN), ampliándola si hace falta.
+        """
+        # Se factoriza el lote (una pasada con hash) y solo sus valores únicos se buscan en la tabla
+        codigos_lote, unicos = pd.factorize(valores)
+        categorias = self.categorias[col]
+        posiciones = categorias.get_indexer(unicos) if len(categorias) else np.full(len(unicos), -1)
+        nuevos = posiciones == -1
+        if nuevos.any():
+            posiciones[nuevos] = len(categorias) + np.arange(nuevos.sum())
+            categorias = categorias.append(pd.Index(unicos[nuevos])) if len(categorias) else pd.Index(unicos[nuevos])
+            self.categorias[col] = categorias
+        # El código -1 (NaN) toma la última posición, que vale -1
+        return np.append(posiciones, -1)[codigos_lote]
+
+    def actualizar(self, df):
+        """
+        Añade las filas de `df` a los agregados. Devuelve el propio cubo.
+        """
+        if not self.columnas:
+            self.n_filas += len(df)
+            return self
+        objetivo = df[self.objetivo].to_numpy(dtype=float) if self.objetivo in df.columns else np.full(len(df), np.nan)
+        con_objetivo = ~np.isnan(objetivo)
+        conjunto = df[self.columna_dataset].to_numpy() if self.columna_dataset in df.columns else np.full(len(df), None)
+        pesos = {
+            'n_total': None,
+            'n_train': (conjunto == 'train').astype(float),
+            'n_test': (conjunto == 'test').astype(float),
+            'n_objetivo': con_objetivo.astype(float),
+            'suma_objetivo': np.where(con_objetivo, objetivo, 0.0),
+        }
+
+        lista_codigos = [self._codigos(col, df[col].to_numpy()) for col in self.columnas]
+        tamanos = [len(self.categorias[col]) for col in self.columnas]
+        desplazamientos = np.concatenate([[0], np.cumsum(tamanos)[:-1]]).astype(int)
+        codigos = np.concatenate([np.where(c >= 0, c + d, -1) for c, d in zip(lista_codigos, desplazamientos)])
+        validos = codigos >= 0
+        total = int(np.sum(tamanos))
+        limites = np.cumsum(tamanos)[:-1]
+
+        for nombre, peso in pesos.items():
+            peso = None if peso is None else np.tile(peso, len(self.columnas))[validos]
+            conteo = np.bincount(codigos[validos], weights=peso, minlength=total)
+            for col, parte in zip(self.columnas, np.split(conteo, limites)):
+                previo = self.acumulados[col][nombre]
+                self.acumulados[col][nombre] = np.pad(previo, (0, len(parte) - len(previo))) + parte
+
+        self.n_filas += len(df)
+        return self
+
+    def combinar(self, otro):
+        """
+        Suma los agregados de otro cubo con las mismas columnas (p. ej. calculado sobre otro archivo).
+        """
+        for col in self.columnas:
+            codigos = self._codigos(col, otro.categorias[col].to_numpy())
+            for nombre in _ESTADISTICOS:
+                acumulado = np.pad(self.acumulados[col][nombre], (0, len(self.categorias[col]) - len(self.acumulados[col][nombre])))
+                np.add.at(acumulado, codigos, otro.acumulados[col][nombre])
+                self.acumulados[col][nombre] = acumulado
+        self.n_filas += otro.n_filas
+        return self
+
+    def _tabla_columna(self, col):
+        acumulado = self.acumulados[col]
+        precio = np.divide(acumulado['suma_objetivo'], acumulado['n_objetivo'],
+                           out=np.full(len(acumulado['n_objetivo']), np.nan), where=acumulado['n_objetivo'] > 0)
+        tabla = pd.DataFrame({
+            col: self.categorias[col],
+            'Precio_Promedio': precio,
+            'Num_Viviendas': acumulado['n_total'].astype('int64'),
+            'Porcentaje_Viviendas': acumulado['n_total'] / self.n_filas * 100,
+            'Num_V_Train': acumulado['n_train'].astype('int64'),
+            'Num_V_Test': acumulado['n_test'].astype('int64'),
+        })
+        # Mismo orden que `groupby`: categorías ordenadas
+        return tabla.sort_values(col, kind='stable', ignore_index=True)
+
+    def resultado_variable(self, col):
+        """
+        Tabla de una columna con el formato de `analizar_precio_viviendas_por_variable`.
+        """
+        return self._tabla_columna(col).sort_values(by='Precio_Promedio', ascending=False)
+
+    def tabla(self):
+        """
+        Tabla larga (tidy) con una fila por columna y categoría.
+        """
+        partes = [self._tabla_columna(col).rename(columns={col: 'Categoria'}).assign(Variable=col)
+                  for col in self.columnas]
+        if not partes:
+            return pd.DataFrame(columns=COLUMNAS_CUBO)
+        partes = [parte.astype({'Categoria': object}) for parte in partes]
+        return pd.concat(partes, ignore_index=True)[COLUMNAS_CUBO]
+
+
+def cubo_precios(df, columnas=None, **kwargs):
+    """
+    Tabla larga de precio promedio, número de viviendas, porcentaje y viviendas en train/test para
+    todas las `columnas` (por defecto, las categóricas de `df`) en una sola pasada.
+    """
+    if columnas is None:
+        columnas = [col for col in df.columns
+                    if not pd.api.types.is_numeric_dtype(df[col]) and col != kwargs.get('columna_dataset', 'Dataset')]
+    return CuboPrecios(columnas, **kwargs).actualizar(df).tabla()
@@ -0,0 +1,177 @@
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from cache_folds import clave_cache
+
+
+def _tamanos_absolutos(tamanos, n_max):
+    """
+    Convierte fracciones (o números de filas) en tamaños absolutos, como `learning_curve`.
+    """
+    tamanos = np.asarray(tamanos)
+    if np.issubdtype(tamanos.dtype, np.floating) and tamanos.max() <= 1:
+        tamanos = (tamanos * n_max).astype(int)
+    return np.unique(np.clip(tamanos, 1, n_max))
+
+
+def _ajustar_evaluar(modelo, X, y, train_index, val_index, metrica):
+    from sklearn.base import clone
+
+    inicio = time.perf_counter()
+    modelo = clone(modelo).fit(X.iloc[train_index], y.iloc[train_index])
+    tiempo = time.perf_counter() - inicio
+    return (metrica(y.iloc[train_index], modelo.predict(X.iloc[train_index])),
+            metrica(y.iloc[val_index], modelo.predict(X.iloc[val_index])), tiempo)
+
+
+def _crecer(modelo, ajustado, X, y, X_nuevas, y_nuevas, n_arboles):
+    """
+    Amplía un modelo ya entrenado con más filas sin empezar de cero:
+
+    - Con `partial_fit`: se entrena solo con las filas nuevas.
+    - Con `warm_start` (bosques, GradientBoosting): se añaden árboles hasta `n_arboles`, ajustados con todas las filas.
+    - XGBoost / LightGBM: se añaden rondas de boosting sobre el booster anterior.
+    - En otro caso, se reentrena desde cero.
+    """
+    from sklearn.base import clone
+
+    nombre = modelo.__class__.__name__
+    parametros = modelo.get_params()
+    if hasattr(modelo, 'partial_fit'):
+        return modelo.partial_fit(X_nuevas, y_nuevas)
+    if 'warm_start' in parametros and 'n_estimators' in parametros:
+        return modelo.set_params(warm_start=True, n_estimators=n_arboles).fit(X, y)
+    if nombre.startswith('XGB'):
+        previas = modelo.get_booster().num_boosted_rounds() if ajustado else 0
+        modelo.set_params(n_estimators=max(n_arboles - previas, 1))
+        return modelo.fit(X, y, xgb_model=modelo.get_booster() if ajustado else None, verbose=False)
+    if nombre.startswith('LGBM'):
+        previas = modelo.booster_.current_iteration() if ajustado else 0
+        booster = modelo.booster_ if ajustado else None
+        return modelo.set_params(n_estimators=max(n_arboles - previas, 1)).fit(X, y, init_model=booster)
+    return clone(modelo).fit(X, y)
+
+
+def _curva_incremental(modelo, X, y, train_index, val_index, tamanos, n_max, metrica, estado):
+    """
+    Recorre los tamaños de menor a mayor en un fold, ampliando el mismo modelo en cada paso.
+    `estado` (modelo y filas ya vistas) permite continuar una curva guardada con tamaños mayores.
+    """
+    from sklearn.base import clone
+
+    n_base = modelo.get_params().get('n_estimators', 100)
+    modelo, previas = (clone(modelo), 0) if estado is None else (estado['modelo'], estado['n'])
+    resultados = []
+    for n in tamanos:
+        inicio = time.perf_counter()
+        n_arboles = max(int(math.ceil(n_base * n / n_max)), 1)
+        modelo = _crecer(modelo, previas > 0, X.iloc[train_index[:n]], y.iloc[train_index[:n]],
+                         X.iloc[train_index[previas:n]], y.iloc[train_index[previas:n]], n_arboles)
+        tiempo = time.perf_counter() - inicio
+        resultados.append((metrica(y.iloc[train_index[:n]], modelo.predict(X.iloc[train_index[:n]])),
+                           metrica(y.iloc[val_index], modelo.predict(X.iloc[val_index])), tiempo))
+        previas = n
+    return resultados, {'modelo': modelo, 'n': previas}
+
+
+def calcular_curva_aprendizaje(modelo, X, y, tamanos=np.linspace(0.1, 1.0, 10), cv=None,
+                               metrica=None, incremental=False, n_jobs=-1,
+                               ruta_cache='../data/cache/curvas'):
+    """
+    Calcula la curva de aprendizaje (error de train y de validación por tamaño y fold) y la guarda en caché.
+
+    La caché se identifica por el modelo (clase y parámetros), los datos, las particiones, la métrica y
+    el modo. Si se piden tamaños nuevos, solo se calculan esos y se añaden a los ya guardados, de modo
+    que una curva se puede ampliar sin repetir los tamaños anteriores.
+
+    Con `incremental=False` el resultado es el mismo que `learning_curve` (un ajuste desde cero por tamaño
+    y fold). Con `incremental=True` cada fold entrena un único modelo que crece con el tamaño (ver `_crecer`):
+    los bosques y el boosting reparten sus `n_estimators` entre los tamaños, así el coste total es el de
+    un ajuste completo por fold. Es una aproximación: en cada tamaño el modelo contiene árboles
+    entrenados con menos filas. En este modo, los tamaños nuevos mayores que el último guardado
+    continúan desde el modelo guardado; si hay alguno menor, la curva se recalcula entera.
+
+    Parámetros:
+    - modelo: Estimador de scikit-learn (sin entrenar).
+    - X, y: DataFrame y Serie con los datos.
+    - tamanos: Fracciones (<= 1) o números de filas de train de cada punto de la curva.
+    - cv: Validación cruzada (por defecto, KFold(5), igual que `learning_curve(cv=5)` con un regresor).
+    - metrica: Función de error (y_real, y_pred); por defecto RMSLE (`root_mean_squared_log_error`).
+    - ruta_cache: Carpeta de la caché (None para no guardar nada).
+
+    Retorna:
+    - Diccionario con 'tamanos' (n_tamanos) y 'error_train', 'error_validacion', 'tiempo_ajuste'
+      (n_tamanos x n_folds).
+    """
+    from sklearn.metrics import root_mean_squared_log_error
+    from sklearn.model_selection import KFold
+
+    cv = KFold(n_splits=5) if cv is None else cv
+    metrica = root_mean_squared_log_error if metrica is None else metrica
+    if not isinstance(X, pd.DataFrame):
+        X = pd.DataFrame(X)
+    if not isinstance(y, pd.Series):
+        y = pd.Series(np.asarray(y), index=X.index)
+
+    particiones = [(np.asarray(train_index), np.asarray(val_index)) for train_index, val_index in cv.split(X, y)]
+    n_max = len(particiones[0][0])
+    tamanos = _tamanos_absolutos(tamanos, n_max)
+
+    especificacion = {
+        'modelo': modelo.__class__.__name__,
+        'parametros': {clave: repr(valor) for clave, valor in sorted(modelo.get_params().items())},
+        'metrica': getattr(metrica, '__name__', repr(metrica)),
+        'incremental': incremental,
+    }
+    clave = clave_cache(X, y, particiones, especificacion)
+    ruta = os.path.join(ruta_cache, f'{clave}.npz') if ruta_cache else None
+    ruta_estado = os.path.join(ruta_cache, f'{clave}_estado.joblib') if ruta_cache else None
+
+    guardada = None
+    if ruta and os.path.exists(ruta):
+        with np.load(ruta) as archivo:
+            guardada = {nombre: archivo[nombre] for nombre in archivo.files}
+
+    nuevos = tamanos if guardada is None else np.setdiff1d(tamanos, guardada['tamanos'])
+    estados = None
+    if incremental and guardada is not None and len(nuevos):
+        if nuevos.min() > guardada['tamanos'].max() and os.path.exists(ruta_estado):
+            estados = joblib.load(ruta_estado)
+        else:
+            nuevos, guardada = np.union1d(tamanos, guardada['tamanos']), None
+
+    if len(nuevos):
+        if incremental:
+            salidas = Parallel(n_jobs=n_jobs)(
+                delayed(_curva_incremental)(modelo, X, y, train_index, val_index, nuevos, n_max, metrica,
+                                            None if estados is None else estados[fold])
+                for fold, (train_index, val_index) in enumerate(particiones))
+            puntos = np.array([resultados for resultados, _ in salidas]).transpose(1, 0, 2)
+            estados = [estado for _, estado in salidas]
+        else:
+            salidas = Parallel(n_jobs=n_jobs)(
+                delayed(_ajustar_evaluar)(modelo, X, y, train_index[:n], val_index, metrica)
+                for n in nuevos for train_index, val_index in particiones)
+            puntos = np.array(salidas).reshape(len(nuevos), len(particiones), 3)
+
+        calculada = {'tamanos': nuevos, 'error_train': puntos[:, :, 0], 'error_validacion': puntos[:, :, 1],
+                     'tiempo_ajuste': puntos[:, :, 2]}
+        if guardada is not None:
+            orden = np.argsort(np.concatenate([guardada['tamanos'], nuevos]), kind='stable')
+            calculada = {nombre: np.concatenate([guardada[nombre], calculada[nombre]])[orden] for nombre in calculada}
+        guardada = calculada
+
+        if ruta:
+            os.makedirs(ruta_cache, exist_ok=True)
+            np.savez(ruta, **guardada)
+            if incremental:
+                joblib.dump(estados, ruta_estado)
+
+    seleccion = np.isin(guardada['tamanos'], tamanos)
+    return {nombre: valores[seleccion] for nombre, valores in guardada.items()}
@@ -1,72 +1,202 @@
 import pandas as pd
-import itertools
-import plotly.express as px
-import matplotlib.pyplot as plt 
-import seaborn as sns
-from sklearn.preprocessing import OrdinalEncoder
-import category_encoders as ce
 import numpy as np
 
+from correlaciones import tabla_correlaciones
+from cubo_agregacion import CuboPrecios
+from imputacion import ImputadorCondicional
+from perfilado import instrumentar_modulo
+# Los gráficos viven en `graficos` (importan plotly/matplotlib/seaborn solo al llamarlos) y se
+# reexportan aquí para mantener los imports de los notebooks. Los codificadores (scikit-learn)
+# se importan dentro de las funciones de codificación.
+from graficos import (visualizar_correlaciones, visualizar_correlaciones_grandes, graficar_conteo_clases,  # noqa: F401
+                      crear_histograma, boxplot_train_test, distribucion_target_con_variable,
+                      distribucion_target_con_variable_vertical)
+
+def _es_categorica(tipo):
+    """
+    Indica si un tipo de dato se trata como categórico en los resúmenes (object, category o string).
+    """
+    return (pd.api.types.is_object_dtype(tipo)
+            or isinstance(tipo, pd.CategoricalDtype)
+            or pd.api.types.is_string_dtype(tipo))
+
+
+def _perfil_parcial(df, lista_columnas):
+    """
+    Calcula en una sola pasada las estadísticas combinables que necesita `resumen_columnas`:
+    filas y NaN por conjunto ('Dataset'), tipos de dato, valores distintos de las columnas numéricas
+    y, para las categóricas, en qué conjuntos aparece cada valor.
+    """
+    conjunto = df['Dataset']
+    tipos = df[lista_columnas].dtypes
+    categoricas = [col for col in lista_columnas if _es_categorica(tipos[col])]
+    numericas = [col for col in lista_columnas if col not in categoricas]
+
+    # NaN y número de filas por conjunto con un único groupby
+    filas = conjunto.value_counts(dropna=False)
+    nan = df[lista_columnas].isna().groupby(conjunto, dropna=False).sum()
+    nan_total = nan.sum()
+
+    # Presencia de cada valor categórico en cada conjunto: el conjunto se codifica una sola vez
+    # y cada columna se resuelve con factorize + bincount sobre (código de valor, código de conjunto)
+    codigos_conjunto, nombres_conjunto = pd.factorize(conjunto, use_na_sentinel=False)
+    n_conjuntos = len(nombres_conjunto)
+    bloques = []
+    for col in categoricas:
+        codigos, valores = pd.factorize(df[col])
+        validos = codigos >= 0
+        conteo = np.bincount(codigos[validos] * n_conjuntos + codigos_conjunto[validos],
+                             minlength=len(valores) * n_conjuntos).reshape(len(valores), n_conjuntos)
+        indice = pd.MultiIndex.from_arrays([[col] * len(valores), np.asarray(valores, dtype=object)],
+                                           names=['Columna', 'Valor'])
+        bloques.append(pd.DataFrame(conteo > 0, index=indice, columns=nombres_conjunto))
+    if bloques:
+        presencia = pd.concat(bloques)
+    else:
+        presencia = pd.DataFrame(columns=nombres_conjunto, dtype=bool,
+                                 index=pd.MultiIndex.from_arrays([[], []], names=['Columna', 'Valor']))
+
+    # Una columna vacía en un trozo no aporta valores (y su tipo float no debe prevalecer al combinar)
+    valores_numericos = {col: pd.unique(df[col].dropna().to_numpy()) for col in numericas
+                         if nan_total[col] < len(df)}
+
+    return {
+        'filas': filas,
+        'nan': nan,
+        'nan_total': nan_total,
+        'tipos': tipos,
+        'presencia': presencia,
+        'valores_numericos': valores_numericos,
+    }
+
+
+def _tipo_comun(tipos):
+    """
+    Tipo de dato resultante al unir los trozos de una columna (p. ej. int64 y float64 -> float64).
+    """
+    # Los trozos donde la columna está vacía (tipo None) no cuentan
+    tipos = [tipo for tipo in tipos if tipo is not None] or [np.dtype('float64')]
+    if all(tipo == tipos[0] for tipo in tipos):
+        return tipos[0]
+    if any(_es_categorica(tipo) for tipo in tipos):
+        return np.dtype('O')
+    try:
+        return np.result_type(*tipos)
+    except TypeError:
+        return tipos[0]
+
+
+def _combinar_perfiles(perfiles):
+    """
+    Combina los perfiles parciales de varios trozos de datos en uno solo.
+    """
+    perfiles = list(perfiles)
+    if len(perfiles) == 1:
+        return perfiles[0]
+
+    tipos = pd.concat([perfil['tipos'].astype(object).where(perfil['nan_total'] < perfil['filas'].sum(), None)
+                       for perfil in perfiles], axis=1)
+    presencia = pd.concat([perfil['presencia'] for perfil in perfiles]).fillna(False).astype(bool)
+
+    valores_numericos = {}
+    for perfil in perfiles:
+        for col, valores in perfil['valores_numericos'].items():
+            if col in valores_numericos:
+                valores = pd.unique(np.concatenate([valores_numericos[col], valores]))
+            valores_numericos[col] = valores
+
+    # Columnas numéricas en unos trozos y categóricas en otros: sus valores numéricos se añaden
+    # como categorías sin conjunto asignado (indicar `dtype` en la lectura evita este caso)
+    tipos = tipos.apply(_tipo_comun, axis=1)
+    for col in [col for col in valores_numericos if _es_categorica(tipos[col])]:
+        valores = valores_numericos.pop(col)
+        indice = pd.MultiIndex.from_arrays([[col] * len(valores), valores.astype(object)], names=presencia.index.names)
+        presencia = pd.concat([presencia, pd.DataFrame(False, index=indice, columns=presencia.columns)])
+
+    return {
+        'filas': pd.concat([perfil['filas'] for perfil in perfiles], axis=1).sum(axis=1),
+        'nan': pd.concat([perfil['nan'] for perfil in perfiles]).groupby(level=0, dropna=False).sum(),
+        'nan_total': pd.concat([perfil['nan_total'] for perfil in perfiles], axis=1).sum(axis=1),
+        'tipos': tipos,
+        'presencia': presencia.groupby(level=[0, 1], sort=False).any(),
+        'valores_numericos': valores_numericos,
+    }
+
+
+def _resumen_desde_perfil(perfil, lista_columnas):
+    """
+    Construye el DataFrame de `resumen_columnas` a partir de un perfil (parcial o combinado).
+    """
+    presencia = perfil['presencia']
+    for conjunto in ['train', 'test']:
+        if conjunto not in presencia.columns:
+            presencia[conjunto] = False
+
+    # Valores únicos por columna categórica (en cualquier conjunto) y valores exclusivos de train/test
+    cantidad_unicos = pd.Series({col: len(valores) for col, valores in perfil['valores_numericos'].items()}, dtype='int64')
+    if len(presencia):
+        cantidad_unicos = pd.concat([cantidad_unicos, presencia.groupby(level=0, sort=False).size()])
+    solo_train = presencia[presencia['train'] & ~presencia['test']]
+    solo_test = presencia[presencia['test'] & ~presencia['train']]
+    valores_unicos_train = solo_train.index.to_frame(index=False).groupby('Columna', sort=False)['Valor'].agg(list)
+    valores_unicos_test = solo_test.index.to_frame(index=False).groupby('Columna', sort=False)['Valor'].agg(list)
+
+    porcentaje_nan_train = (perfil['nan'].loc['train'] / perfil['filas']['train']) * 100
+    porcentaje_nan_test = (perfil['nan'].loc['test'] / perfil['filas']['test']) * 100
+
+    # Creamos el DataFrame resultado
+    resultado = pd.DataFrame({
+        'Tipo de Dato': perfil['tipos'],
+        'Nº Valores Únicos': cantidad_unicos.reindex(lista_columnas, fill_value=0),
+        'Nº de NaN': perfil['nan_total'],
+        'Porcentaje NaN Train': porcentaje_nan_train,
+        'Porcentaje NaN Test': porcentaje_nan_test,
+        'Valores Únicos Train': [valores_unicos_train.get(col, []) for col in lista_columnas],
+        'Valores Únicos Test': [valores_unicos_test.get(col, []) for col in lista_columnas]
+    }, index=lista_columnas)
+
+    return resultado
+
+
 def resumen_columnas(df, lista_columnas):
     """
     Esta función toma un DataFrame y una lista de columnas y devuelve un DataFrame
     con un resumen que incluye la cantidad de valores únicos, la cantidad de NaN,
     el porcentaje de NaN en 'train' y 'test', los valores únicos que están en 
     'train' y no en 'test' y viceversa, y el tipo de dato de cada columna.
+
+    Todas las columnas se resumen en una única pasada agrupando una sola vez por 'Dataset'.
     """
+    lista_columnas = list(lista_columnas)
+    return _resumen_desde_perfil(_perfil_parcial(df, lista_columnas), lista_columnas)
 
-    # Se separa en train y test
-    df_train = df[df['Dataset'] == 'train']
-    df_test = df[df['Dataset'] == 'test']
 
-    # Calcula la cantidad de valores NaN y valores únicos para cada columna 
-    cantidad_nan = df[lista_columnas].isna().sum()
-    cantidad_unicos = df[lista_columnas].nunique()
-
-    # Calcula el porcentaje de NaN en 'train' y 'test'
-    cantidad_total = df['Dataset'].value_counts()
-    nan_train = df[df['Dataset'] == 'train'][lista_columnas].isna().sum()
-    nan_test = df[df['Dataset'] == 'test'][lista_columnas].isna().sum()
-
-    porcentaje_nan_train = (nan_train / cantidad_total['train']) * 100
-    porcentaje_nan_test = (nan_test / cantidad_total['test']) * 100
-
-    # Encontrar columnas comunes de tipo objeto en train y test
-    columnas_objeto_train = df_train.select_dtypes(include=['object']).columns
-    columnas_objeto_test = df_test.select_dtypes(include=['object']).columns
-    columnas_comunes = set(columnas_objeto_train) & set(columnas_objeto_test)
-
-    # Obtener valores únicos en train y no en test y viceversa
-    valores_unicos_train = {}
-    valores_unicos_test = {}
-
-    for columna in columnas_comunes:
-        valores_train = set(df_train[columna].dropna().unique())
-        valores_test = set(df_test[columna].dropna().unique())
-        
-        # Valores únicos 
-        solo_en_train = valores_train - valores_test
-        solo_en_test = valores_test - valores_train
-        
-        valores_unicos_train[columna] = list(solo_en_train)
-        valores_unicos_test[columna] = list(solo_en_test)
-
-    # Obtener el tipo de dato de cada columna
-    tipos_datos = df[lista_columnas].dtypes
+def resumen_columnas_csv(rutas, lista_columnas, chunksize=100_000, **kwargs):
+    """
+    Versión por trozos de `resumen_columnas` para CSV que no caben en memoria.
 
-    # Creamos el DataFrame resultado
-    resultado = pd.DataFrame({
-        'Tipo de Dato': tipos_datos,
-        'Nº Valores Únicos': cantidad_unicos,
-        'Nº de NaN': cantidad_nan,
-        'Porcentaje NaN Train': porcentaje_nan_train,
-        'Porcentaje NaN Test': porcentaje_nan_test,
-        'Valores Únicos Train': [valores_unicos_train.get(col, []) for col in lista_columnas],
-        'Valores Únicos Test': [valores_unicos_test.get(col, []) for col in lista_columnas]
-    })
+    Cada trozo se resume por separado y los perfiles parciales se combinan al final,
+    por lo que la memoria necesaria depende del tamaño del trozo y del número de valores distintos.
 
-    return resultado
+    Parámetros:
+    - rutas: Ruta o lista de rutas de CSV. Deben incluir la columna 'Dataset'.
+    - lista_columnas: Columnas a resumir.
+    - chunksize: Número de filas por trozo.
+    - kwargs: Argumentos adicionales para `pd.read_csv`.
+    """
+    if isinstance(rutas, str):
+        rutas = [rutas]
+    lista_columnas = list(lista_columnas)
+    columnas_leer = lista_columnas + (['Dataset'] if 'Dataset' not in lista_columnas else [])
+
+    perfiles = []
+    for ruta in rutas:
+        for trozo in pd.read_csv(ruta, usecols=columnas_leer, chunksize=chunksize, **kwargs):
+            perfiles.append(_perfil_parcial(trozo, lista_columnas))
+            # Se combina en cada paso para no acumular un perfil por trozo
+            perfiles = [_combinar_perfiles(perfiles)]
 
+    return _resumen_desde_perfil(perfiles[0], lista_columnas)
 
 
 def calcular_porcentaje_coincidencias(df, col1, col2):
@@ -91,42 +221,13 @@ def obtener_valores_unicos(df, columnas):
     return {col: sorted(df[col].dropna().unique().tolist()) for col in columnas}
 
 
-
-
 def analizar_precio_viviendas_por_variable(df, columna_agrupacion):
     """
     Analiza el precio promedio, el número de viviendas y el porcentaje de viviendas agrupados por una variable específica.
     El precio promedio es el de train, puesto que en test todos son NaN.
+    Para analizar varias columnas en una pasada (o ir añadiendo filas), usar `cubo_agregacion.CuboPrecios`.
     """
-    total_viviendas = len(df)
-    
-    # Agrupar los datos por la columna especificada y calcular el precio promedio y el número de viviendas
-    resultado = df.groupby([columna_agrupacion]).agg(
-        Precio_Promedio=('SalePrice', 'mean'),  
-        Num_Viviendas=('SalePrice', 'size')     
-    ).reset_index()
-    
-    # Calcular el número de viviendas en train y test para cada grupo
-    num_train = df[df['Dataset'] == 'train'].groupby(columna_agrupacion).size().reindex(resultado[columna_agrupacion], fill_value=0)
-    num_test = df[df['Dataset'] == 'test'].groupby(columna_agrupacion).size().reindex(resultado[columna_agrupacion], fill_value=0)
-    
-    # Calcular el porcentaje de viviendas en cada grupo
-    resultado['Porcentaje_Viviendas'] = (resultado['Num_Viviendas'] / total_viviendas) * 100
-
-      # Contar el número de viviendas por cada categoría de la columna de agrupación
-    conteo = df[columna_agrupacion].value_counts().reindex(resultado[columna_agrupacion], fill_value=0)
-    resultado['Num_Viviendas'] = conteo.values  
-
-    # Agregar las columnas de números de viviendas en train y test
-    resultado['Num_V_Train'] = num_train.values
-    resultado['Num_V_Test'] = num_test.values
-
-    # Ordenar el DataFrame por Precio_Promedio de forma descendente
-    resultado = resultado.sort_values(by='Precio_Promedio', ascending=False)
-    
-    return resultado
-
-
+    return CuboPrecios([columna_agrupacion]).actualizar(df).resultado_variable(columna_agrupacion)
 
 
 def calcular_correlaciones(df, columnas_numericas):
@@ -134,18 +235,13 @@ def calcular_correlaciones(df, columnas_numericas):
     Esta función evalúa la correlación de Pearson, Spearman y Kendall para cada par de columnas
     en la lista `columnas_numericas`. Si la correlación absoluta de cualquiera de los métodos es
     mayor o igual a 0.5, se almacena el par de columnas junto con sus correlaciones en un DataFrame.
+    Las correlaciones se calculan con `tabla_correlaciones` (módulo `correlaciones`).
     """
-    correlaciones = []
-
-    for i, j in itertools.combinations(columnas_numericas, 2):
-        corr_pearson = df[i].corr(df[j], method='pearson')
-        corr_spearman = df[i].corr(df[j], method='spearman')
-        corr_kendall = df[i].corr(df[j], method='kendall')
-
-        if abs(corr_pearson) >= 0.5 or abs(corr_spearman) >= 0.5 or abs(corr_kendall) >= 0.5:
-            correlaciones.append((i, j, corr_pearson, corr_spearman, corr_kendall))
+    correlaciones = tabla_correlaciones(df, columnas_numericas)
 
-    correlaciones_df = pd.DataFrame(correlaciones, columns=['Columna_1', 'Columna_2', 'Correlación_Pearson', 'Correlación_Spearman', 'Correlación_Kendall'])
+    filtro = (correlaciones[['Pearson', 'Spearman', 'Kendall']].abs() >= 0.5).any(axis=1)
+    correlaciones_df = correlaciones[filtro].reset_index(drop=True)
+    correlaciones_df.columns = ['Columna_1', 'Columna_2', 'Correlación_Pearson', 'Correlación_Spearman', 'Correlación_Kendall']
     correlaciones_df = correlaciones_df.sort_values(by='Columna_1')
     
     return correlaciones_df
@@ -155,16 +251,16 @@ def label_encoding(df, columna):
     """
     Realiza una codificación tipo Label Encoding para la variable categórica, aplicando el encoding únicamente
     en el conjunto de entrenamiento (train) para evitar data leakage.
+    Para reutilizar el mapeo en datos nuevos, usar directamente `CodificadorEtiquetas`.
     """
-    # Filtrar el conjunto de entrenamiento
-    df_train = df[df['Dataset'] == 'train']
-    
-    # Generar un mapa de codificación (Label Encoding) en base al conjunto de entrenamiento
-    categorias_unicas = df_train[columna].unique()
-    mapa_codificacion = {categoria: idx for idx, categoria in enumerate(categorias_unicas)}
+    from codificadores import CodificadorEtiquetas
+
+    # Ajustar el codificador en el conjunto de entrenamiento
+    codificador = CodificadorEtiquetas(cols=[columna]).fit(df[df['Dataset'] == 'train'])
     
     # Aplicar el mapeo de codificación a todo el DataFrame (train y test)
-    df[columna] = df[columna].map(mapa_codificacion)
+    codificado = codificador.transform(df[[columna]])[columna]
+    df[columna] = codificado if codificado.isna().any() else codificado.astype('int64')
     
     return df
 
@@ -177,81 +273,22 @@ def codificacion_ponderada(df, columna, objetivo, min_muestras=10):
     La variable objetivo siempre es SalePrice
 
     min_muestras: Umbral mínimo para aplicar el suavizado.
-    
+
+    Para actualizar la codificación con ventas nuevas sin recalcularla desde cero, usar
+    `CodificadorPonderado.partial_fit` (o `combinar` con otro codificador ajustado en otra partición).
 
     """
+    from codificadores import CodificadorPonderado
+
     # Filtrar el conjunto de entrenamiento
     df_train = df[df['Dataset'] == 'train']
     
-    # Calcular la media global del objetivo en el conjunto de entrenamiento
-    media_global = df_train[objetivo].mean()
-    
-    # Agrupar por la columna categórica en el conjunto de entrenamiento
-    agrupacion = df_train.groupby(columna)[objetivo].agg(['mean', 'count'])
-    total_muestras_train = len(df_train)
-    agrupacion['porcentaje'] = agrupacion['count'] / total_muestras_train  # Porcentaje de datos por categoría en train
-    
-    # Suavizar la media según el conteo y aplicar un ajuste basado en el porcentaje de datos
-    agrupacion['suavizado'] = ((agrupacion['mean'] * agrupacion['count'] + media_global * min_muestras) / 
-                               (agrupacion['count'] + min_muestras)) * agrupacion['porcentaje']
-    
-    # Crear un mapeo de la columna categórica a la media suavizada ponderada
-    mapa_codificacion = agrupacion['suavizado'].to_dict()
+    # Media suavizada y ponderada por categoría, ajustada solo con train (ver `CodificadorPonderado`)
+    codificador = CodificadorPonderado(cols=[columna], min_muestras=min_muestras)
+    codificador.fit(df_train[[columna]], df_train[objetivo])
     
     # Aplicar el mapeo a la columna en el DataFrame completo (df)
-    df[columna] = df[columna].map(mapa_codificacion)
-
-
-
-
-
-
-def visualizar_correlaciones(df, variables):
-    """
-    Función simplificada para visualizar las correlaciones entre un número inespecífico de variables.
-
-    Parámetros:
-    df (pd.DataFrame): El DataFrame que contiene los datos.
-    variables (list): Lista de nombres de las columnas que se desean incluir en la matriz de correlación.
-    """
-    fig = px.imshow(
-        img=round(df[variables].corr(), 1),
-        text_auto=True,
-        title="Correlaciones Lineales"
-    )
-    fig.update_layout(title_x=0.5)
-    fig.show()
-
-
-
-def visualizar_correlaciones_grandes(df, variables):
-    """
-    Función simplificada para visualizar las correlaciones entre un número inespecífico de variables.
-
-    Parámetros:
-    df (pd.DataFrame): El DataFrame que contiene los datos.
-    variables (list): Lista de nombres de las columnas que se desean incluir en la matriz de correlación.
-    """
-    # Calcular la matriz de correlación
-    correlacion = round(df[variables].corr(), 2)
-    
-    # Crear la figura con tamaño personalizado
-    fig = px.imshow(
-        correlacion,
-        text_auto=True,
-        title="Correlaciones Lineales")
-    
-    # Actualizar la disposición de la figura
-    fig.update_layout(
-        title_x=0.5,
-        width=1000,  # Ancho de la figura
-        height=800,  # Alto de la figura
-        font=dict(size=14),  # Tamaño de fuente
-        margin=dict(l=40, r=40, t=40, b=40)  # Márgenes
-    )
-    
-    fig.show()
-
+    df[columna] = codificador.transform(df[[columna]])[columna]
 
 
 def aplicar_codificacion_ordinal_especifica(df, columna, categorias):
@@ -259,14 +296,14 @@ def aplicar_codificacion_ordinal_especifica(df, columna, categorias):
     Aplica Codificación Ordinal a una columna específica del DataFrame y sobrescribe la columna .
 
     """
+    from codificadores import CodificadorOrdinal
 
-    codificador_ordinal = OrdinalEncoder(categories=[categorias])
-    df[columna] = codificador_ordinal.fit_transform(df[[columna]])
+    codificador_ordinal = CodificadorOrdinal(categorias={columna: categorias})
+    df[columna] = codificador_ordinal.fit_transform(df[[columna]])[columna]
 
     return df
 
 
-
 # def rellenar_atributos_sotano(df, columna_atributo):
 #     """
 #     Rellena los valores nulos de una columna de atributos relacionados con el sótano 
@@ -322,7 +359,6 @@ def aplicar_codificacion_ordinal_especifica(df, columna, categorias):
 #     df.loc[df["TieneSotano"] == 0, columna_atributo] = 0
 
 
-
 def rellenar_atributos_sotano(df, columna_atributo):
     """
     Rellena los valores nulos de una columna de atributos relacionados con el sótano 
@@ -332,33 +368,20 @@ def rellenar_atributos_sotano(df, columna_atributo):
     - Si la columna es categórica, imputa valores faltantes con 'NoAplica'.
 
     Además, corrige inconsistencias: valores no nulos en filas donde 'TieneSotano' es 0.
+    Para imputar todas las columnas (y las de garaje, piscina...) en una pasada, usar
+    `imputacion.ImputadorCondicional`.
 
     Parámetros:
         df: DataFrame
         columna_atributo: str, nombre de la columna a imputar.
     """
-    # Determinar si la columna es numérica o categórica
-    es_numerico = df[columna_atributo].dtype in ['int64', 'float64']
+    imputador = ImputadorCondicional([{'nombre': 'sotano', 'indicador': 'TieneSotano', 'columnas': [columna_atributo]}])
+    imputador.aplicar(df)
 
-    # Definir el valor de imputación según el tipo de columna
-    valor_imputacion = 0 if es_numerico else 'NoAplica'
-
-    # Verificar inconsistencias
     # Se consideran inconsistencias solo si 'TieneSotano' es 0 y el valor no es ni NaN ni 0
-    inconsistencias = df[(df["TieneSotano"] == 0) & (~df[columna_atributo].isin([0, np.nan]))]
-    if not inconsistencias.empty:
-        print(f"Se encontraron {len(inconsistencias)} inconsistencias en la columna '{columna_atributo}'.")
-
-    # Rellenar valores nulos e inconsistentes
-    df[columna_atributo] = df[columna_atributo].where(
-        ~((df["TieneSotano"] == 0) & (df[columna_atributo].isna())),
-        other=valor_imputacion
-    )
-
-    # Corregir inconsistencias (valores no nulos con TieneSotano == 0)
-    df.loc[df["TieneSotano"] == 0, columna_atributo] = valor_imputacion
-
-
+    inconsistencias = imputador.informe()['Inconsistencias'].iloc[0]
+    if inconsistencias:
+        print(f"Se encontraron {inconsistencias} inconsistencias en la columna '{columna_atributo}'.")
 
 
 def codificacion_loo(df, columna, objetivo="SalePrice"):
@@ -369,117 +392,26 @@ def codificacion_loo(df, columna, objetivo="SalePrice"):
     (ajustar y transformar) y luego codificar el conjunto de prueba (solo transformar).
 
     """
+    from codificadores import CodificadorLOO
 
     df_train = df[df['Dataset'] == 'train']
     df_test = df[df['Dataset'] == 'test']
     
-    loo_encoder = ce.LeaveOneOutEncoder(cols=[columna])
+    loo_encoder = CodificadorLOO(cols=[columna])
 
-    df.loc[df['Dataset'] == 'train', columna] = loo_encoder.fit_transform(df_train[[columna]], df_train[objetivo])
-    df.loc[df['Dataset'] == 'test', columna] = loo_encoder.transform(df_test[[columna]])
+    df.loc[df['Dataset'] == 'train', columna] = loo_encoder.fit_transform(df_train[[columna]], df_train[objetivo])[columna]
+    df.loc[df['Dataset'] == 'test', columna] = loo_encoder.transform(df_test[[columna]])[columna]
 
     return df
 
 
-
-def graficar_conteo_clases(df, columna, columna_dataset='Dataset', titulo=None, colores=['turquoise', 'coral']):
-    """
-    Genera un gráfico de barras para contar las ocurrencias de cada clase en una columna específica.
-    """
-    # Contar las ocurrencias de cada clase en la columna especificada para train y test
-    conteo_datos = df.groupby([columna, columna_dataset]).size().reset_index(name='count')
-
-    if titulo is None:
-        titulo = f"Conteo de {columna} en Train y Test"
-
-    fig = px.bar(conteo_datos, x=columna, y="count", color=columna_dataset, barmode="group",
-                 title=titulo, color_discrete_sequence=colores)
-    fig.update_layout(xaxis_title=columna, yaxis_title='Conteo', 
-                      title_x=0.5, xaxis={'categoryorder': 'total descending'})
-    fig.show()
-
-
-def crear_histograma(df, columna, title="Histograma", color="green", nbins=20):
-    """
-    Crea un histograma.
-    """
-    fig = px.histogram(df, x=columna, nbins=nbins, 
-                       title=title, 
-                       labels={columna: columna},
-                       color_discrete_sequence=[color])
-
-    fig.update_layout(
-        title_x=0.5,  
-        xaxis_title=columna,
-        yaxis_title="Frecuencia")
-
-    fig.show()
-
-
-def boxplot_train_test(df, columna, color_columna, title="Box Plot", nbins=20):
-    """
-    Crea un Box Plot de train y test.
-    """
-    fig = px.box(df, 
-                 x=columna, 
-                 color=color_columna, 
-                 title=title)
-
-    fig.update_layout(
-        title_x=0.5,  
-        xaxis_title=columna,
-        yaxis_title="Distribución"
-    )
-
-    fig.show()
-
-def distribucion_target_con_variable(df, target, feature, title=None):
-    """
-    Función para generar un gráfico de caja mostrando la distribución de un target por una característica (feature) en Train.
-    
-    """
-    if title is None:
-        title = f'Distribución de {target} por {feature}'
-    
-    # Crear el gráfico de caja
-    fig = px.box(df, x=target, y=feature, 
-                 title=title, 
-                 labels={feature: feature, target: target})
-
-    fig.update_layout(
-        xaxis_title=feature, 
-        yaxis_title=target, 
-        title_x=0.5, 
-         xaxis = {'categoryorder': 'total descending'}
-        )
-    
-    fig.show()
-
-
-def distribucion_target_con_variable_vertical(df, target, feature, title=None):
-    """
-    Función para generar un gráfico de caja mostrando la distribución de un target por una característica (feature) en Train en vertical.
-    
-    """
-    if title is None:
-        title = f'Distribución de {target} por {feature}'
-
-    fig = px.box(df, x=feature, y=target, 
-                                  title=title, 
-                 labels={target: target, feature: feature})
-
-    fig.update_layout(
-    yaxis_title= target, 
-    xaxis_title=feature, 
-    title_x=0.5, height=600,
-    xaxis={'categoryorder': 'total descending'})
-
-    fig.show()
-
-
 def describe_train_test(df, variable):
     train_describe = df[df['Dataset'] == 'train'][variable].describe()
     test_describe = df[df['Dataset'] == 'test'][variable].describe()
     describe_train_test = pd.concat([train_describe, test_describe], axis=1)
     describe_train_test.columns = ['Train', 'Test']
-    return describe_train_test
\ No newline at end of file
+    return describe_train_test
+
+
+# Todas las funciones públicas quedan perfiladas (sin coste mientras `perfilado` esté desactivado)
+instrumentar_modulo(globals())
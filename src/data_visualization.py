@@ -1,8 +1,22 @@
 import pandas as pd
-import itertools
-import plotly.express as px
-import matplotlib.pyplot as plt 
-import seaborn as sns
+
+from correlaciones import tabla_correlaciones
+# Los gráficos viven en `graficos`; se reexportan aquí para mantener los imports de los notebooks
+from graficos import (correlaciones_pearson, comparar_variable_discreta_con_target,  # noqa: F401
+                      comparar_variable_continua_con_target)
+
+
+def _renombrar_correlaciones(resultados):
+    """
+    Adapta la salida de `tabla_correlaciones` a los nombres de columna de este módulo.
+    """
+    return resultados.rename(columns={
+        'Columna_1': 'Variable 1',
+        'Columna_2': 'Variable 2',
+        'Pearson': 'Correlación Pearson',
+        'Spearman': 'Correlación Spearman',
+        'Kendall': 'Correlación Kendall'
+    })
 
 
 def calcular_todas_correlaciones(df, threshold=0.5):
@@ -18,35 +32,11 @@ def calcular_todas_correlaciones(df, threshold=0.5):
     Retorna:
     - DataFrame con las correlaciones filtradas.
     """
-    # Inicializar una lista para almacenar los resultados
-    resultados_lista = []
-
-    # Iterar sobre todas las combinaciones de columnas
-    for i in range(len(df.columns)):
-        for j in range(i + 1, len(df.columns)):
-            var1 = df.columns[i]
-            var2 = df.columns[j]
-
-            # Excluir correlaciones con las variables 'SalePrice', 'Id' y 'Dataset'
-            if var1 in ['SalePrice', 'Id', 'Dataset'] or var2 in ['SalePrice', 'Id', 'Dataset']:
-                continue
-
-            # Calcular las correlaciones de Pearson, Spearman y Kendall
-            corr_pearson = df[var1].corr(df[var2], method='pearson')
-            corr_spearman = df[var1].corr(df[var2], method='spearman')
-            corr_kendall = df[var1].corr(df[var2], method='kendall')
-
-            # Agregar los resultados a la lista
-            resultados_lista.append({
-                'Variable 1': var1,
-                'Variable 2': var2,
-                'Correlación Pearson': corr_pearson,
-                'Correlación Spearman': corr_spearman,
-                'Correlación Kendall': corr_kendall
-            })
-
-    # Crear un DataFrame a partir de la lista de resultados
-    resultados = pd.DataFrame(resultados_lista)
+    # Excluir correlaciones con las variables 'SalePrice', 'Id' y 'Dataset'
+    columnas = [col for col in df.columns if col not in ['SalePrice', 'Id', 'Dataset']]
+
+    # Calcular las correlaciones de Pearson, Spearman y Kendall de todos los pares
+    resultados = _renombrar_correlaciones(tabla_correlaciones(df, columnas))
 
     # Filtrar los resultados para mostrar solo correlaciones que superen el umbral
     resultados_filtrados = resultados[
@@ -69,88 +59,21 @@ def calcular_correlaciones_saleprice(df, threshold=0.2):
     Retorna:
     - DataFrame con las correlaciones filtradas.
     """
-    # Inicializar una lista para almacenar los resultados
-    resultados_lista = []
-
-    # Iterar sobre todas las combinaciones de columnas
-    for i in range(len(df.columns)):
-        for j in range(i + 1, len(df.columns)):
-            var1 = df.columns[i]
-            var2 = df.columns[j]
-
-            # Ignorar correlaciones con la misma variable
-            if var1 == 'SalePrice' or var2 == 'SalePrice':
-                corr_pearson = df[var1].corr(df[var2], method='pearson')
-                corr_spearman = df[var1].corr(df[var2], method='spearman')
-                corr_kendall = df[var1].corr(df[var2], method='kendall')
-
-                # Agregar los resultados a la lista
-                resultados_lista.append({
-                    'Variable 1': var1,
-                    'Variable 2': var2,
-                    'Correlación Pearson': corr_pearson,
-                    'Correlación Spearman': corr_spearman,
-                    'Correlación Kendall': corr_kendall
-                })
-
-    # Crear un DataFrame a partir de la lista de resultados
-    resultados = pd.DataFrame(resultados_lista)
-
-    # Filtrar los resultados para mostrar solo correlaciones positivas con 'SalePrice' mayores al umbral
-    resultados_filtrados = resultados[
-        ((resultados['Correlación Pearson'] > threshold) & (resultados['Variable 1'] == 'SalePrice')) |
-        ((resultados['Correlación Pearson'] > threshold) & (resultados['Variable 2'] == 'SalePrice'))
-    ]
-
-    return resultados_filtrados
-
-
-def correlaciones_pearson(train):
-    correlaciones = train.corr()['SalePrice'].sort_values(ascending=False)
-    correlaciones_significativas = correlaciones[correlaciones.abs() > 0.2]
+    # Pares con 'SalePrice' en el mismo orden en que aparecen las columnas
+    columnas = list(df.columns)
+    posicion = columnas.index('SalePrice')
+    pares = [(col, 'SalePrice') for col in columnas[:posicion]] + \
+            [('SalePrice', col) for col in columnas[posicion + 1:]]
 
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(correlaciones_significativas.to_frame(), annot=True, fmt=".2f", cmap="coolwarm", square=True)
-    plt.title('Correlaciones Lineales con SalePrice')
-    plt.show()
+    # El filtro solo depende de Pearson: Kendall se calcula únicamente para los pares que lo superan
+    resultados = tabla_correlaciones(df, columnas, pares=pares, kendall=False)
+    filtro = (resultados['Pearson'] > threshold).to_numpy()
+    pares_filtrados = [par for par, pasa in zip(pares, filtro) if pasa]
 
+    resultados_filtrados = tabla_correlaciones(df, columnas, pares=pares_filtrados)
+    resultados_filtrados.index = resultados.index[filtro]
 
-
-def comparar_variable_discreta_con_target(dataframe, variable_target, variable_comparada):
-    """
-    Genera gráficos de barras para comparar una variable discreta 
-    (tanto numéricas como categóricas, toman un conjunto finito o numerable de valores) 
-    con la target.
-
-    """
-    fig, axes = plt.subplots(1, 2, figsize=(18, 7))
-    sns.countplot(x=dataframe[variable_comparada], ax=axes[0])
-    sns.countplot(x=dataframe[variable_comparada], hue=dataframe[variable_target], ax=axes[1])
-    plt.show()
-
-# comparar_variable_discreta_con_target(df, "SalePrice", "aerolinea")
-
-
-def comparar_variable_continua_con_target(dataframe, variable_target, variable_comparada):
-    """
-    Genera gráficos para comparar una variable continua con una variable objetivo.
-    Para variables continuas (numéricas que pueden contener valores atípicos, 
-    que pueden variar dentro de un rango específico)
-
-    """
-    fig, axes = plt.subplots(2, 2, figsize=(18, 11))
-    sns.boxplot(x=dataframe[variable_comparada], ax=axes[0, 0])
-    axes[0, 0].set_title(f'{variable_comparada} Boxplot')
-    sns.histplot(x=dataframe[variable_comparada], ax=axes[0, 1])
-    axes[0, 1].set_title(f'{variable_comparada} Histogram')
-    sns.boxplot(x=dataframe[variable_target], y=dataframe[variable_comparada], ax=axes[1, 0])
-    axes[1, 0].set_title(f'{variable_comparada} vs {variable_target}')
-    sns.histplot(x=dataframe[variable_comparada], hue=dataframe[variable_target], ax=axes[1, 1])
-    axes[1, 1].set_title(f'{variable_comparada} Histogram by {variable_target}')
-    plt.tight_layout()
-    plt.show()
-
-# comparar_variable_continua_con_target(df, "SalePrice", "distancia_millas")
+    return _renombrar_correlaciones(resultados_filtrados)
 
 
 def calcular_cuartiles(df, variable_aplicar_cuartiles, n_inferior, n_superior):
@@ -161,21 +84,21 @@ def calcular_cuartiles(df, variable_aplicar_cuartiles, n_inferior, n_superior):
     para determinar los límites inferior y superior. Luego, filtra el DataFrame para eliminar los valores atípicos
     y retorna el DataFrame limpio. También imprime la cantidad de filas eliminadas.
 
+    Los límites se calculan con todas las filas de `df`. Para ajustarlos solo con train, filtrar
+    varias columnas a la vez o aplicarlos a datos nuevos, usar directamente `atipicos.FiltroAtipicos`.
     """
+    from atipicos import FiltroAtipicos
 
     longitud_variable_antes = len(df[variable_aplicar_cuartiles])
-    q1 = df[variable_aplicar_cuartiles].quantile(q=0.25)  # Q1
-    q3 = df[variable_aplicar_cuartiles].quantile(q=0.75)  # Q3
-    # Rango intercuartil (IQR)
-    iqr = q3 - q1
-    # Calcular los limites inferior y superior
-    limite_inferior = q1 - n_inferior * iqr
-    limite_superior = q3 + n_superior * iqr
-    df = df[df[variable_aplicar_cuartiles].between(limite_inferior, limite_superior)]
+    filtro = FiltroAtipicos(cols=[variable_aplicar_cuartiles], n_inferior=n_inferior, n_superior=n_superior,
+                            conservar_nan=False, conjunto_ajuste=None)
+    df = filtro.fit(df).transform(df)
     longitud_variable_despues = len(df[variable_aplicar_cuartiles])
     diferencia_filas = longitud_variable_antes - longitud_variable_despues
     print(f"La longitud de la variable antes era de {longitud_variable_antes}, y ahora es de {longitud_variable_despues}. Se han eliminado {diferencia_filas} filas del DF.")
     return df
 
 # df = calcular_cuartiles(df, 'Variable_Quitar_Cuartiles', 1.5, 1.5) # n_inferior, n_superior):
-# TENGO QUE TENER CUIDADO DE ELIMINAR LOS OUTLIERS SOLO DE TRAIN Y NO TEST. SI HAY OUTLIER EN TEST QUÉ HAGO???
\ No newline at end of file
+# Para ajustar los límites solo con train y aplicarlos a test:
+# filtro = FiltroAtipicos(cols=['GrLivArea', 'LotArea'], modo='recorte').fit(df)  # usa df['Dataset'] == 'train'
+# df = filtro.transform(df)
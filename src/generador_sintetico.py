@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Columnas que deben venir siempre del mismo donante para mantener su coherencia
+# (p. ej. los campos de sótano son NA cuando TotalBsmtSF == 0)
+GRUPOS_VINCULADOS = {
+    'sotano': ['BsmtQual', 'BsmtCond', 'BsmtExposure', 'BsmtFinType1', 'BsmtFinType2',
+               'BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF', 'TotalBsmtSF', 'BsmtFullBath', 'BsmtHalfBath'],
+    'garaje': ['GarageType', 'GarageYrBlt', 'GarageFinish', 'GarageCars', 'GarageArea', 'GarageQual', 'GarageCond'],
+    'piscina': ['PoolArea', 'PoolQC'],
+    'chimenea': ['Fireplaces', 'FireplaceQu'],
+    'revestimiento': ['MasVnrType', 'MasVnrArea'],
+    'vivienda': ['1stFlrSF', '2ndFlrSF', 'LowQualFinSF', 'GrLivArea', 'YearBuilt', 'YearRemodAdd',
+                 'MSSubClass', 'HouseStyle', 'BldgType'],
+    'parcela': ['LotArea', 'LotFrontage', 'LotShape', 'LotConfig'],
+    'venta': ['MoSold', 'YrSold', 'SaleType', 'SaleCondition'],
+}
+
+# Superficies de la vivienda: se escalan con un mismo factor por fila para conservar las sumas
+COLUMNAS_SUPERFICIE = ['MasVnrArea', 'BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF', '1stFlrSF', '2ndFlrSF',
+                       'LowQualFinSF', 'GarageArea', 'WoodDeckSF', 'OpenPorchSF', 'EnclosedPorch',
+                       '3SsnPorch', 'ScreenPorch', 'PoolArea']
+COLUMNAS_PARCELA = ['LotArea', 'LotFrontage']
+
+
+class GeneradorViviendas:
+    """
+    Generador de ventas sintéticas con el esquema de `train.csv`, ajustado sobre los datos reales.
+
+    - Cada fila parte de un donante real del mismo estrato de `OverallQual` (frecuencias de train).
+    - Los grupos de columnas vinculadas (sótano, garaje, piscina...) se copian juntos de un donante,
+      así se conservan los patrones de NaN y las dependencias estructurales.
+    - El resto de columnas se toma, con probabilidad `prob_mezcla`, de otro donante del mismo estrato,
+      lo que crea combinaciones nuevas manteniendo las frecuencias de categorías y de NaN por estrato.
+    - Las superficies se escalan con un factor log-normal por fila (las de la parcela con otro) y los
+      totales (TotalBsmtSF, GrLivArea) se recalculan a partir de sus componentes.
+    - SalePrice sigue el ajuste log(SalePrice) ~ log(GrLivArea) + OverallQual más el residuo del donante.
+
+    La salida es determinista para una semilla y un tamaño de trozo dados.
+    """
+
+    def __init__(self, prob_mezcla=0.3, dispersion=0.1):
+        self.prob_mezcla = prob_mezcla
+        self.dispersion = dispersion
+
+    def ajustar(self, df):
+        """
+        Aprende estratos, donantes y la relación de SalePrice a partir de un DataFrame con el esquema de train.
+        """
+        self.datos_ = df.reset_index(drop=True)
+        self.columnas_ = list(df.columns)
+        self.enteras_ = [col for col in df.columns if pd.api.types.is_integer_dtype(df[col])]
+
+        calidad = self.datos_['OverallQual'].to_numpy()
+        self.estratos_, conteos = np.unique(calidad, return_counts=True)
+        self.probabilidades_ = conteos / conteos.sum()
+        self.donantes_ = [np.flatnonzero(calidad == estrato) for estrato in self.estratos_]
+
+        # Regresión log(SalePrice) ~ log(GrLivArea) + indicadores de OverallQual
+        diseno = self._diseno(self.datos_['GrLivArea'].to_numpy(dtype=float), calidad)
+        log_precio = np.log(self.datos_['SalePrice'].to_numpy(dtype=float))
+        self.coeficientes_, *_ = np.linalg.lstsq(diseno, log_precio, rcond=None)
+        self.residuos_ = log_precio - diseno @ self.coeficientes_
+
+        self.independientes_ = [col for col in self.columnas_
+                                if col not in {'Id', 'SalePrice', 'OverallQual'}
+                                and not any(col in grupo for grupo in GRUPOS_VINCULADOS.values())]
+        return self
+
+    def _diseno(self, superficie, calidad):
+        indicadores = (calidad[:, None] == self.estratos_[None, 1:]).astype(float)
+        return np.column_stack([np.ones(len(superficie)), np.log(superficie), indicadores])
+
+    def _donantes(self, rng, estratos):
+        """
+        Un donante aleatorio del estrato indicado para cada fila.
+        """
+        donantes = np.empty(len(estratos), dtype=int)
+        for posicion, indices in enumerate(self.donantes_):
+            filas = np.flatnonzero(estratos == posicion)
+            donantes[filas] = indices[rng.integers(0, len(indices), len(filas))]
+        return donantes
+
+    def _generar_trozo(self, n_filas, rng, primer_id):
+        estratos = rng.choice(len(self.estratos_), size=n_filas, p=self.probabilidades_)
+        donante = self._donantes(rng, estratos)
+        trozo = self.datos_.iloc[donante].reset_index(drop=True)
+
+        # Grupos vinculados: cada grupo completo procede de un donante (el principal u otro del estrato)
+        for columnas in GRUPOS_VINCULADOS.values():
+            columnas = [col for col in columnas if col in trozo.columns]
+            mezclar = rng.random(n_filas) < self.prob_mezcla
+            if mezclar.any():
+                otros = self._donantes(rng, estratos[mezclar])
+                trozo.loc[mezclar, columnas] = self.datos_.iloc[otros][columnas].to_numpy()
+
+        # Columnas independientes: mezcla columna a columna dentro del estrato
+        for col in self.independientes_:
+            mezclar = rng.random(n_filas) < self.prob_mezcla
+            if mezclar.any():
+                otros = self._donantes(rng, estratos[mezclar])
+                trozo.loc[mezclar, col] = self.datos_[col].to_numpy()[otros]
+
+        # Factores de escala compartidos por fila
+        factor_vivienda = rng.lognormal(0.0, self.dispersion, n_filas)
+        factor_parcela = rng.lognormal(0.0, self.dispersion, n_filas)
+        for columnas, factor in [(COLUMNAS_SUPERFICIE, factor_vivienda), (COLUMNAS_PARCELA, factor_parcela)]:
+            for col in columnas:
+                trozo[col] = np.round(trozo[col].to_numpy(dtype=float) * factor)
+        trozo['TotalBsmtSF'] = trozo[['BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF']].sum(axis=1, min_count=1)
+        trozo['GrLivArea'] = trozo[['1stFlrSF', '2ndFlrSF', 'LowQualFinSF']].sum(axis=1)
+
+        # Precio: relación ajustada con la nueva superficie + residuo del donante principal
+        diseno = self._diseno(trozo['GrLivArea'].to_numpy(dtype=float), self.estratos_[estratos])
+        trozo['SalePrice'] = np.round(np.exp(diseno @ self.coeficientes_ + self.residuos_[donante]))
+
+        trozo['Id'] = np.arange(primer_id, primer_id + n_filas)
+        for col in self.enteras_:
+            if not trozo[col].isna().any():
+                trozo[col] = trozo[col].astype('int64')
+        return trozo[self.columnas_]
+
+    def generar(self, n_filas, semilla=42, tam_trozo=100_000):
+        """
+        Genera `n_filas` filas en trozos de `tam_trozo`. Devuelve un iterador de DataFrames.
+        """
+        semillas = np.random.SeedSequence(semilla).spawn(int(np.ceil(n_filas / tam_trozo)))
+        for numero, semilla_trozo in enumerate(semillas):
+            inicio = numero * tam_trozo
+            yield self._generar_trozo(min(tam_trozo, n_filas - inicio), np.random.default_rng(semilla_trozo), inicio + 1)
+
+    def escribir(self, n_filas, ruta, semilla=42, tam_trozo=100_000):
+        """
+        Escribe las filas generadas en CSV (mismo formato que Kaggle, NaN como 'NA') o Parquet,
+        según la extensión de `ruta`, trozo a trozo.
+        """
+        if ruta.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            escritor = None
+            for trozo in self.generar(n_filas, semilla, tam_trozo):
+                tabla = pa.Table.from_pandas(trozo, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(ruta, tabla.schema)
+                escritor.write_table(tabla.cast(escritor.schema))
+            if escritor is not None:
+                escritor.close()
+        else:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            for numero, trozo in enumerate(self.generar(n_filas, semilla, tam_trozo)):
+                trozo.to_csv(ruta, mode='a', header=numero == 0, index=False, na_rep='NA')
+
+
+def generador_desde_train(ruta_train='../data/train.csv', **kwargs):
+    """
+    Crea un `GeneradorViviendas` ajustado sobre `train.csv`.
+    """
+    return GeneradorViviendas(**kwargs).ajustar(pd.read_csv(ruta_train))
@@ -0,0 +1,292 @@
+"""
+Funciones de gráficos. Las librerías de visualización (plotly, matplotlib, seaborn) y scikit-learn
+se importan dentro de cada función, de modo que importar este módulo (o los módulos de cálculo que
+lo reexportan) no las carga.
+"""
+import pandas as pd
+
+
+def visualizar_correlaciones(df, variables):
+    """
+    Función simplificada para visualizar las correlaciones entre un número inespecífico de variables.
+
+    Parámetros:
+    df (pd.DataFrame): El DataFrame que contiene los datos.
+    variables (list): Lista de nombres de las columnas que se desean incluir en la matriz de correlación.
+    """
+    import plotly.express as px
+
+    fig = px.imshow(
+        img=round(df[variables].corr(), 1),
+        text_auto=True,
+        title="Correlaciones Lineales"
+    )
+    fig.update_layout(title_x=0.5)
+    fig.show()
+
+
+def visualizar_correlaciones_grandes(df, variables):
+    """
+    Función simplificada para visualizar las correlaciones entre un número inespecífico de variables.
+
+    Parámetros:
+    df (pd.DataFrame): El DataFrame que contiene los datos.
+    variables (list): Lista de nombres de las columnas que se desean incluir en la matriz de correlación.
+    """
+    import plotly.express as px
+
+    # Calcular la matriz de correlación
+    correlacion = round(df[variables].corr(), 2)
+    
+    # Crear la figura con tamaño personalizado
+    fig = px.imshow(
+        correlacion,
+        text_auto=True,
+        title="Correlaciones Lineales")
+    
+    # Actualizar la disposición de la figura
+    fig.update_layout(
+        title_x=0.5,
+        width=1000,  # Ancho de la figura
+        height=800,  # Alto de la figura
+        font=dict(size=14),  # Tamaño de fuente
+        margin=dict(l=40, r=40, t=40, b=40)  # Márgenes
+    )
+    
+    fig.show()
+
+
+def graficar_conteo_clases(df, columna, columna_dataset='Dataset', titulo=None, colores=['turquoise', 'coral']):
+    """
+    Genera un gráfico de barras para contar las ocurrencias de cada clase en una columna específica.
+    """
+    import plotly.express as px
+
+    # Contar las ocurrencias de cada clase en la columna especificada para train y test
+    conteo_datos = df.groupby([columna, columna_dataset]).size().reset_index(name='count')
+
+    if titulo is None:
+        titulo = f"Conteo de {columna} en Train y Test"
+
+    fig = px.bar(conteo_datos, x=columna, y="count", color=columna_dataset, barmode="group",
+                 title=titulo, color_discrete_sequence=colores)
+    fig.update_layout(xaxis_title=columna, yaxis_title='Conteo', 
+                      title_x=0.5, xaxis={'categoryorder': 'total descending'})
+    fig.show()
+
+
+def crear_histograma(df, columna, title="Histograma", color="green", nbins=20):
+    """
+    Crea un histograma.
+    """
+    import plotly.express as px
+
+    fig = px.histogram(df, x=columna, nbins=nbins, 
+                       title=title, 
+                       labels={columna: columna},
+                       color_discrete_sequence=[color])
+
+    fig.update_layout(
+        title_x=0.5,  
+        xaxis_title=columna,
+        yaxis_title="Frecuencia")
+
+    fig.show()
+
+
+def boxplot_train_test(df, columna, color_columna, title="Box Plot", nbins=20):
+    """
+    Crea un Box Plot de train y test.
+    """
+    import plotly.express as px
+
+    fig = px.box(df, 
+                 x=columna, 
+                 color=color_columna, 
+                 title=title)
+
+    fig.update_layout(
+        title_x=0.5,  
+        xaxis_title=columna,
+        yaxis_title="Distribución"
+    )
+
+    fig.show()
+
+
+def distribucion_target_con_variable(df, target, feature, title=None):
+    """
+    Función para generar un gráfico de caja mostrando la distribución de un target por una característica (feature) en Train.
+    
+    """
+    import plotly.express as px
+
+    if title is None:
+        title = f'Distribución de {target} por {feature}'
+    
+    # Crear el gráfico de caja
+    fig = px.box(df, x=target, y=feature, 
+                 title=title, 
+                 labels={feature: feature, target: target})
+
+    fig.update_layout(
+        xaxis_title=feature, 
+        yaxis_title=target, 
+        title_x=0.5, 
+         xaxis = {'categoryorder': 'total descending'}
+        )
+    
+    fig.show()
+
+
+def distribucion_target_con_variable_vertical(df, target, feature, title=None):
+    """
+    Función para generar un gráfico de caja mostrando la distribución de un target por una característica (feature) en Train en vertical.
+    
+    """
+    import plotly.express as px
+
+    if title is None:
+        title = f'Distribución de {target} por {feature}'
+
+    fig = px.box(df, x=feature, y=target, 
+                                  title=title, 
+                 labels={target: target, feature: feature})
+
+    fig.update_layout(
+    yaxis_title= target, 
+    xaxis_title=feature, 
+    title_x=0.5, height=600,
+    xaxis={'categoryorder': 'total descending'})
+
+    fig.show()
+
+
+def correlaciones_pearson(train):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    correlaciones = train.corr()['SalePrice'].sort_values(ascending=False)
+    correlaciones_significativas = correlaciones[correlaciones.abs() > 0.2]
+
+    plt.figure(figsize=(10, 6))
+    sns.heatmap(correlaciones_significativas.to_frame(), annot=True, fmt=".2f", cmap="coolwarm", square=True)
+    plt.title('Correlaciones Lineales con SalePrice')
+    plt.show()
+
+
+def comparar_variable_discreta_con_target(dataframe, variable_target, variable_comparada):
+    """
+    Genera gráficos de barras para comparar una variable discreta 
+    (tanto numéricas como categóricas, toman un conjunto finito o numerable de valores) 
+    con la target.
+
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, axes = plt.subplots(1, 2, figsize=(18, 7))
+    sns.countplot(x=dataframe[variable_comparada], ax=axes[0])
+    sns.countplot(x=dataframe[variable_comparada], hue=dataframe[variable_target], ax=axes[1])
+    plt.show()
+
+
+def comparar_variable_continua_con_target(dataframe, variable_target, variable_comparada):
+    """
+    Genera gráficos para comparar una variable continua con una variable objetivo.
+    Para variables continuas (numéricas que pueden contener valores atípicos, 
+    que pueden variar dentro de un rango específico)
+
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, axes = plt.subplots(2, 2, figsize=(18, 11))
+    sns.boxplot(x=dataframe[variable_comparada], ax=axes[0, 0])
+    axes[0, 0].set_title(f'{variable_comparada} Boxplot')
+    sns.histplot(x=dataframe[variable_comparada], ax=axes[0, 1])
+    axes[0, 1].set_title(f'{variable_comparada} Histogram')
+    sns.boxplot(x=dataframe[variable_target], y=dataframe[variable_comparada], ax=axes[1, 0])
+    axes[1, 0].set_title(f'{variable_comparada} vs {variable_target}')
+    sns.histplot(x=dataframe[variable_comparada], hue=dataframe[variable_target], ax=axes[1, 1])
+    axes[1, 1].set_title(f'{variable_comparada} Histogram by {variable_target}')
+    plt.tight_layout()
+    plt.show()
+
+
+def graficar_curva_aprendizaje_rmsle(modelo, X, y, **kwargs):
+    """
+    Grafica la curva de aprendizaje (RMSLE) calculada con `curva_aprendizaje.calcular_curva_aprendizaje`.
+    La curva se guarda en caché, así que repetir el gráfico solo lo vuelve a dibujar.
+    Los parámetros adicionales (`tamanos`, `cv`, `incremental`, `ruta_cache`...) se pasan al cálculo.
+    """
+    import matplotlib.pyplot as plt
+
+    from curva_aprendizaje import calcular_curva_aprendizaje
+
+    curva = calcular_curva_aprendizaje(modelo, X, y, **kwargs)
+    train_sizes = curva['tamanos']
+    train_scores_mean = curva['error_train'].mean(axis=1)
+    test_scores_mean = curva['error_validacion'].mean(axis=1)
+    train_scores_std = curva['error_train'].std(axis=1)
+    test_scores_std = curva['error_validacion'].std(axis=1)
+
+    # Graficar la curva de aprendizaje
+    plt.figure(figsize=(10, 6))
+    plt.plot(train_sizes, train_scores_mean, 'o-', color='r', label='Puntuación de Entrenamiento (RMSLE)')
+    plt.plot(train_sizes, test_scores_mean, 'o-', color='g', label='Puntuación de Validación (RMSLE)')
+    
+    # Rellenar las áreas de desviación estándar
+    plt.fill_between(train_sizes, train_scores_mean - train_scores_std,
+                     train_scores_mean + train_scores_std, alpha=0.1, color='r')
+    plt.fill_between(train_sizes, test_scores_mean - test_scores_std,
+                     test_scores_mean + test_scores_std, alpha=0.1, color='g')
+
+    plt.title(f'Curva de Aprendizaje (RMSLE): {modelo.__class__.__name__}')
+    plt.xlabel('Tamaño del Conjunto de Entrenamiento')
+    plt.ylabel('RMSLE')
+    plt.legend(loc='best')
+    plt.grid()
+    plt.show()
+
+
+def feature_importances(model, X_train, top_n=30, ascending=False, palette="viridis", importancias=None):
+    """
+    Grafica las importancias de características de un modelo.
+
+    Parámetros:
+    - model: Modelo entrenado que contiene las importancias de características.
+    - X_train: Conjunto de entrenamiento utilizado, que contiene los nombres de las características.
+    - top_n: Número de características a mostrar (por defecto, 30).
+    - ascending: Orden de las características, False para las más importantes, True para las menos.
+    - palette: Paleta de colores para el gráfico (por defecto, "viridis").
+    - importancias: DataFrame con 'Columnas' e 'Importancia' ya calculado (p. ej. con
+      `importancia_permutacion.importancia_permutacion`, para modelos sin `feature_importances_`).
+      Si se indica, `model` y `X_train` no se usan.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if importancias is not None:
+        df_importances = importancias[["Columnas", "Importancia"]]
+    else:
+        # Obtener las importancias de características
+        importances = model.feature_importances_
+
+        # Crear el DataFrame
+        df_importances = pd.DataFrame(data=zip(X_train.columns, importances),
+                                      columns=["Columnas", "Importancia"])
+
+    # Ordenar y seleccionar el top_n
+    df_importances = df_importances.sort_values("Importancia", ascending=ascending)
+    df_top_importances = df_importances.head(top_n)
+
+    # Definir el título
+    title = f"Las {top_n} características {'menos' if ascending else 'más'} importantes"
+    
+    # Graficar
+    plt.figure(figsize=(10, 6))
+    plt.title(title)
+    sns.barplot(x="Importancia", y="Columnas", data=df_top_importances, palette=palette, hue="Columnas", legend=False)
+    plt.grid()
+    plt.show()
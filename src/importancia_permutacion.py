@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from metricas import NOMBRES_METRICAS, calcular_metricas
+
+
+# Métricas en las que un valor mayor es mejor (la importancia es la caída de la métrica)
+METRICAS_MAYOR_MEJOR = {'R²'}
+
+
+def _puntuar(y, predicciones, metrica):
+    """
+    Métrica de cada fila de `predicciones` (copias x filas) frente a `y` con el núcleo de `metricas`.
+    """
+    return calcular_metricas(y, predicciones[:, None, :])[:, 0, NOMBRES_METRICAS.index(metrica)]
+
+
+def _predecir(modelo, valores, columnas):
+    # Con orden Fortran, pandas usa el array como bloque de columnas sin copiarlo
+    datos = valores if columnas is None else pd.DataFrame(valores, columns=columnas, copy=False)
+    return np.asarray(modelo.predict(datos), dtype=float)
+
+
+def _repeticion(modelo, valores, y, columnas, indices, metrica, tam_bloque, max_filas, semilla):
+    """
+    Una repetición: submuestra de filas, predicción base y una predicción por bloque de columnas.
+
+    Cada bloque apila `tam_bloque` copias de la submuestra, cada una con una columna permutada,
+    y las predice con una sola llamada a `predict`. La matriz apilada se reutiliza entre bloques:
+    cada copia solo restaura la columna que permutó en el bloque anterior.
+    """
+    rng = np.random.default_rng(semilla)
+    if max_filas is not None and max_filas < len(valores):
+        filas = rng.choice(len(valores), size=max_filas, replace=False)
+        valores, y = np.asfortranarray(valores[filas]), y[filas]
+    n = len(valores)
+    base = _puntuar(y, _predecir(modelo, valores, columnas)[None, :], metrica)[0]
+
+    copias = min(tam_bloque, len(indices))
+    apilado = np.asfortranarray(np.tile(valores, (copias, 1)))
+    permutadas = [None] * copias
+    puntuaciones = np.empty(len(indices))
+    for inicio in range(0, len(indices), tam_bloque):
+        bloque = indices[inicio:inicio + tam_bloque]
+        for copia, indice in enumerate(bloque):
+            filas = slice(copia * n, (copia + 1) * n)
+            if permutadas[copia] is not None:
+                apilado[filas, permutadas[copia]] = valores[:, permutadas[copia]]
+            apilado[filas, indice] = valores[rng.permutation(n), indice]
+            permutadas[copia] = indice
+        predicciones = _predecir(modelo, apilado[:len(bloque) * n], columnas).reshape(len(bloque), n)
+        puntuaciones[inicio:inicio + len(bloque)] = _puntuar(y, predicciones, metrica)
+
+    signo = 1.0 if metrica in METRICAS_MAYOR_MEJOR else -1.0
+    return signo * (base - puntuaciones)
+
+
+def importancia_permutacion(modelo, X, y, metrica='RMSE', columnas=None, n_repeticiones=5, tam_bloque=8,
+                            max_filas=None, nivel_confianza=0.95, n_jobs=-1, semilla=0):
+    """
+    Importancia por permutación de las características de un modelo ya entrenado. A diferencia de
+    `feature_importances_`, sirve para cualquier modelo (SVR, KNN, lineales...) y no tiene el sesgo
+    de la importancia por impureza de los árboles.
+
+    La importancia de una columna es cuánto empeora la métrica al permutarla (aumento del error, o
+    caída del R²). Para reducir el coste frente a `sklearn.inspection.permutation_importance`:
+
+    - Se permutan `tam_bloque` columnas a la vez en una matriz apilada (una copia de los datos por
+      columna) que se predice con una sola llamada a `predict`.
+    - Las métricas de todas las copias salen de una pasada con `metricas.calcular_metricas`.
+    - Las repeticiones se reparten entre procesos con joblib.
+    - Con `max_filas`, cada repetición usa una submuestra distinta de filas.
+
+    El intervalo de confianza es el de la media de las repeticiones con la t de Student.
+
+    Parámetros:
+    - modelo: Modelo entrenado con `predict`.
+    - X: DataFrame (o array) numérico con las características con las que se entrenó el modelo.
+    - y: Objetivo real.
+    - metrica: Una de `metricas.NOMBRES_METRICAS` ('R²', 'MAE', 'RMSE', 'MSE', 'RMSLE').
+    - columnas: Columnas a evaluar (por defecto, todas).
+    - n_repeticiones: Permutaciones por columna.
+    - tam_bloque: Columnas permutadas por llamada a `predict`; la matriz apilada ocupa
+      `tam_bloque` veces la submuestra.
+    - max_filas: Filas de la submuestra de cada repetición (por defecto, todas).
+    - nivel_confianza: Nivel del intervalo de confianza.
+    - n_jobs: Procesos para las repeticiones (-1 usa todos los núcleos).
+    - semilla: Semilla de las permutaciones y las submuestras.
+
+    Retorna:
+    - DataFrame con 'Columnas', 'Importancia' (media de las repeticiones), 'Desviación',
+      'IC inferior' e 'IC superior', ordenado de mayor a menor importancia. Las dos primeras
+      columnas son las que usa el gráfico `feature_importances`.
+    """
+    from joblib import Parallel, delayed
+    from scipy import stats
+
+    if metrica not in NOMBRES_METRICAS:
+        raise ValueError(f"Métrica desconocida: '{metrica}'. Usa una de {NOMBRES_METRICAS}.")
+    nombres = list(X.columns) if isinstance(X, pd.DataFrame) else list(range(np.shape(X)[1]))
+    columnas = nombres if columnas is None else list(columnas)
+    indices = [nombres.index(col) for col in columnas]
+    valores = X.to_numpy(dtype=float) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=float)
+    valores = np.asfortranarray(valores)
+    y = np.asarray(y, dtype=float)
+    nombres_modelo = nombres if isinstance(X, pd.DataFrame) else None
+
+    semillas = np.random.SeedSequence(semilla).spawn(n_repeticiones)
+    importancias = np.array(Parallel(n_jobs=1 if n_repeticiones == 1 else n_jobs)(
+        delayed(_repeticion)(modelo, valores, y, nombres_modelo, indices, metrica, tam_bloque, max_filas, semilla)
+        for semilla in semillas))
+
+    media = importancias.mean(axis=0)
+    desviacion = importancias.std(axis=0, ddof=1) if n_repeticiones > 1 else np.full(len(columnas), np.nan)
+    margen = stats.t.ppf((1 + nivel_confianza) / 2, n_repeticiones - 1) * desviacion / np.sqrt(n_repeticiones) \
+        if n_repeticiones > 1 else np.nan
+    tabla = pd.DataFrame({
+        'Columnas': columnas,
+        'Importancia': media,
+        'Desviación': desviacion,
+        'IC inferior': media - margen,
+        'IC superior': media + margen,
+    })
+    return tabla.sort_values('Importancia', ascending=False, ignore_index=True)
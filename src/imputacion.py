@@ -0,0 +1,138 @@
+import pandas as pd
+
+
+# Reglas de imputación condicional de la vivienda, para los datos con los tipos de los CSV de Kaggle
+# (antes de codificar las categóricas). Cada regla indica cuándo la casa NO tiene el elemento
+# (sótano, garaje...) y qué valor se asigna entonces a sus columnas:
+# - 'indicador': columna 0/1; las filas con 0 no tienen el elemento.
+# - 'referencia': columna numérica; las filas con valor <= 0 o NaN no tienen el elemento
+#   (mismo criterio con el que se creó 'TieneSotano' a partir de 'TotalBsmtSF').
+# - 'columnas_numericas': columnas que reciben 'relleno_numerico'; el resto recibe 'relleno_categorico'.
+#   Declararlas evita depender del tipo con que se lea cada trozo (una columna de texto toda NaN se lee
+#   como float64).
+REGLAS_VIVIENDA = [
+    {'nombre': 'sotano', 'indicador': 'TieneSotano',
+     'columnas': ['BsmtQual', 'BsmtCond', 'BsmtExposure', 'BsmtFinType1', 'BsmtFinType2',
+                  'BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF'],
+     'columnas_numericas': ['BsmtFinSF1', 'BsmtFinSF2', 'BsmtUnfSF'],
+     'relleno_numerico': 0, 'relleno_categorico': 'NoAplica'},
+    {'nombre': 'garaje', 'referencia': 'GarageArea',
+     'columnas': ['GarageType', 'GarageFinish', 'GarageQual', 'GarageCond'], 'columnas_numericas': [],
+     'relleno_numerico': 0, 'relleno_categorico': 'NoAplica'},
+    {'nombre': 'piscina', 'referencia': 'PoolArea', 'columnas': ['PoolQC'], 'columnas_numericas': [],
+     'relleno_numerico': 0, 'relleno_categorico': 'NoAplica'},
+    {'nombre': 'chimenea', 'referencia': 'Fireplaces', 'columnas': ['FireplaceQu'], 'columnas_numericas': [],
+     'relleno_numerico': 0, 'relleno_categorico': 'NoAplica'},
+    {'nombre': 'revestimiento', 'referencia': 'MasVnrArea', 'columnas': ['MasVnrType'], 'columnas_numericas': [],
+     'relleno_numerico': 0, 'relleno_categorico': 'NoAplica'},
+]
+
+COLUMNAS_INFORME = ['Regla', 'Columna', 'Filas sin elemento', 'Nulos rellenados', 'Inconsistencias']
+
+
+def _filas_sin_elemento(df, regla):
+    """
+    Máscara booleana de las filas que no tienen el elemento de la regla.
+    """
+    if 'indicador' in regla:
+        return (df[regla['indicador']] == 0).to_numpy()
+    referencia = df[regla['referencia']].to_numpy(dtype=float)
+    return ~(referencia > 0)
+
+
+class ImputadorCondicional:
+    """
+    Aplica reglas de imputación condicional en una sola pasada por el DataFrame.
+
+    Para cada regla, la máscara de filas sin el elemento se calcula una vez y se reutiliza en todas sus
+    columnas. En esas filas, cada columna toma `relleno_numerico` (columnas numéricas) o
+    `relleno_categorico` (resto), tanto si era NaN como si tenía un valor (inconsistencia).
+    Una columna es numérica si está en 'columnas_numericas' de su regla; si la regla no lo declara,
+    se decide con el tipo del primer trozo en que aparece y se mantiene en los siguientes, de modo
+    que todos los trozos de un stream reciben el mismo relleno.
+
+    Las reglas cuyo 'indicador' o 'referencia' no está en el DataFrame se omiten (p. ej. 'TieneSotano'
+    en los CSV crudos, porque se crea después en la limpieza), igual que sus columnas que no estén.
+
+    Los conteos se acumulan entre llamadas, así que se puede aplicar trozo a trozo sobre un stream
+    y consultar el total con `informe()`.
+
+    Parámetros:
+    - reglas: Lista de diccionarios con 'nombre', 'indicador' o 'referencia', 'columnas',
+      'columnas_numericas' (opcional), 'relleno_numerico' (por defecto 0) y 'relleno_categorico'
+      (por defecto 'NoAplica').
+    """
+
+    def __init__(self, reglas=None):
+        self.reglas = REGLAS_VIVIENDA if reglas is None else reglas
+        self._conteos = {}
+        self._numericas = {}
+
+    def _es_numerica(self, regla, col, serie):
+        if 'columnas_numericas' in regla:
+            return col in regla['columnas_numericas']
+        clave = (regla['nombre'], col)
+        if clave not in self._numericas:
+            self._numericas[clave] = pd.api.types.is_numeric_dtype(serie.dtype)
+        return self._numericas[clave]
+
+    def aplicar(self, df):
+        """
+        Imputa `df` en el sitio y lo devuelve. Las reglas sin su indicador o referencia en `df`, y las
+        columnas de las reglas que no estén en `df`, se ignoran.
+        """
+        for regla in self.reglas:
+            if regla.get('indicador', regla.get('referencia')) not in df.columns:
+                continue
+            sin_elemento = _filas_sin_elemento(df, regla)
+            n_sin_elemento = int(sin_elemento.sum())
+            for col in regla['columnas']:
+                if col not in df.columns:
+                    continue
+                serie = df[col]
+                numerica = self._es_numerica(regla, col, serie)
+                relleno = regla.get('relleno_numerico', 0) if numerica else regla.get('relleno_categorico', 'NoAplica')
+
+                nulos = serie.isna().to_numpy()
+                # Inconsistencia: la casa no tiene el elemento pero la columna tiene un valor distinto de NaN y de 0
+                con_valor = ~nulos & (serie.to_numpy() != 0)
+                conteo = (n_sin_elemento, int((sin_elemento & nulos).sum()), int((sin_elemento & con_valor).sum()))
+
+                if sin_elemento.any():
+                    if isinstance(serie.dtype, pd.CategoricalDtype) and relleno not in serie.cat.categories:
+                        serie = serie.cat.add_categories([relleno])
+                    # `where` conserva el tipo de la columna (entera, object, categórica...)
+                    df[col] = serie.where(~sin_elemento, relleno)
+
+                clave = (regla['nombre'], col)
+                anterior = self._conteos.get(clave, (0, 0, 0))
+                self._conteos[clave] = tuple(a + b for a, b in zip(anterior, conteo))
+        return df
+
+    def aplicar_trozos(self, trozos):
+        """
+        Aplica las reglas a un iterador de DataFrames (p. ej. `pd.read_csv(..., chunksize=...)`).
+        """
+        for trozo in trozos:
+            yield self.aplicar(trozo)
+
+    def informe(self):
+        """
+        DataFrame con, por regla y columna, las filas sin el elemento, los NaN rellenados y las
+        inconsistencias corregidas (valores distintos de NaN y 0 en filas sin el elemento).
+        """
+        filas = [[regla, col, *conteo] for (regla, col), conteo in self._conteos.items()]
+        return pd.DataFrame(filas, columns=COLUMNAS_INFORME)
+
+    def reiniciar(self):
+        self._conteos = {}
+        return self
+
+
+def aplicar_reglas(df, reglas=None):
+    """
+    Aplica las reglas de imputación a `df` (en el sitio) y devuelve el informe de inconsistencias.
+    """
+    imputador = ImputadorCondicional(reglas)
+    imputador.aplicar(df)
+    return imputador.informe()
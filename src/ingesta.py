@@ -0,0 +1,239 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Campos cuyo nombre en data_description.txt no coincide con el de los CSV
+ALIAS_CAMPOS = {'Bedroom': 'BedroomAbvGr', 'Kitchen': 'KitchenAbvGr'}
+
+# Marcas de valor faltante en los CSV de Kaggle. 'None' no se incluye: en MasVnrType es una categoría.
+VALORES_NA = ['', 'NA', 'NaN', 'nan']
+
+
+def leer_descripcion(ruta_descripcion='../docs/data_description.txt'):
+    """
+    Lee `data_description.txt` y devuelve un diccionario {campo: {'descripcion', 'codigos', 'na'}}.
+
+    - codigos: Lista de códigos documentados en el orden del archivo (vacía para campos continuos).
+    - na: Significado del código 'NA' cuando está documentado (p. ej. 'No Basement'), o None.
+    """
+    campos = {}
+    actual = None
+    with open(ruta_descripcion, encoding='utf-8', errors='replace') as archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            # Las líneas de campo empiezan en la primera columna: "Nombre: descripción"
+            if not linea[0].isspace() and ':' in linea:
+                nombre, descripcion = linea.split(':', 1)
+                actual = ALIAS_CAMPOS.get(nombre.strip(), nombre.strip())
+                campos[actual] = {'descripcion': descripcion.strip(), 'codigos': [], 'na': None}
+                continue
+            # Las líneas de código están sangradas: "código<TAB>significado"
+            partes = linea.strip().split('\t')
+            codigo = partes[0].strip()
+            significado = partes[-1].strip() if len(partes) > 1 else ''
+            if codigo == 'NA':
+                campos[actual]['na'] = significado
+            else:
+                campos[actual]['codigos'].append(codigo)
+    return campos
+
+
+def _es_numerico(codigos):
+    return len(codigos) > 0 and all(codigo.lstrip('-').isdigit() for codigo in codigos)
+
+
+def _tipo_entero_minimo(minimo, maximo):
+    """
+    Tipo entero más pequeño que contiene el rango [minimo, maximo].
+    """
+    for tipo in ['int8', 'int16', 'int32', 'int64']:
+        info = np.iinfo(tipo)
+        if info.min <= minimo and maximo <= info.max:
+            return tipo
+    return 'int64'
+
+
+def inferir_esquema(rutas_csv, ruta_descripcion='../docs/data_description.txt', chunksize=100_000,
+                    na_como_categoria=False):
+    """
+    Deriva el esquema de tipos de los CSV a partir de `data_description.txt` y de una pasada por trozos.
+
+    - Campos con códigos de texto: `category`, con los códigos documentados primero y después
+      los valores observados que no aparecen en la descripción (p. ej. 'NAmes', 'C (all)').
+    - Campos numéricos: el entero más pequeño que contiene el rango observado (entero nullable
+      si hay NaN) o float32 si no se pierde precisión; float64 en otro caso.
+    - na_como_categoria: Si es True, 'NA' se conserva como categoría en los campos donde está
+      documentado como valor real (p. ej. 'No Basement' en BsmtQual). Si es False, se lee como NaN.
+
+    Retorna:
+    - Diccionario con 'tipos' ({columna: dtype en texto o CategoricalDtype}), 'na_values' y
+      'descripcion_na' ({columna: significado de 'NA'}).
+    """
+    if isinstance(rutas_csv, str):
+        rutas_csv = [rutas_csv]
+    descripcion = leer_descripcion(ruta_descripcion)
+
+    na_values = {campo: [valor for valor in VALORES_NA if valor != 'NA']
+                 for campo, info in descripcion.items() if na_como_categoria and info['na']}
+    columnas_texto = [campo for campo, info in descripcion.items()
+                      if info['codigos'] and not _es_numerico(info['codigos'])]
+
+    # Estadísticas combinables por columna: mínimo, máximo, entero o no, NaN, float32 exacto y valores vistos
+    estadisticas = {}
+    observados = {}
+    for ruta in rutas_csv:
+        lectura = pd.read_csv(ruta, chunksize=chunksize, keep_default_na=False,
+                              na_values=_na_por_columna(ruta, na_values),
+                              dtype={col: str for col in columnas_texto})
+        for trozo in lectura:
+            for col in trozo.columns:
+                serie = trozo[col]
+                if col in columnas_texto or not pd.api.types.is_numeric_dtype(serie):
+                    observados.setdefault(col, set()).update(serie.dropna().unique())
+                    continue
+                valores = serie.to_numpy(dtype=float)
+                validos = valores[~np.isnan(valores)]
+                anterior = estadisticas.get(col, {'min': np.inf, 'max': -np.inf, 'entero': True,
+                                                  'nan': False, 'float32': True})
+                estadisticas[col] = {
+                    'min': min(anterior['min'], validos.min()) if len(validos) else anterior['min'],
+                    'max': max(anterior['max'], validos.max()) if len(validos) else anterior['max'],
+                    'entero': anterior['entero'] and bool(np.all(validos == np.round(validos))),
+                    'nan': anterior['nan'] or len(validos) < len(valores),
+                    'float32': anterior['float32'] and bool(np.all(validos.astype('float32') == validos)),
+                }
+
+    tipos = {}
+    for col, valores in observados.items():
+        documentados = [codigo for codigo in descripcion.get(col, {}).get('codigos', [])]
+        if col in na_values:
+            documentados.append('NA')
+        extra = sorted(str(valor) for valor in valores if valor not in set(documentados))
+        tipos[col] = pd.CategoricalDtype(documentados + extra)
+    for col, est in estadisticas.items():
+        if col in tipos:
+            continue
+        if est['entero'] and np.isfinite(est['min']):
+            tipo = _tipo_entero_minimo(est['min'], est['max'])
+            tipos[col] = tipo.capitalize() if est['nan'] else tipo
+        elif est['float32']:
+            tipos[col] = 'float32'
+        else:
+            tipos[col] = 'float64'
+
+    return {
+        'tipos': tipos,
+        'na_values': na_values,
+        'descripcion_na': {campo: info['na'] for campo, info in descripcion.items() if info['na']},
+    }
+
+
+def _na_por_columna(ruta, na_values):
+    """
+    Marcas de NaN por columna para `pd.read_csv`: las generales salvo en las columnas con 'NA' documentado.
+    """
+    columnas = pd.read_csv(ruta, nrows=0).columns
+    return {col: na_values.get(col, VALORES_NA) for col in columnas}
+
+
+def leer_csv_esquema(ruta, esquema, columnas=None, chunksize=100_000):
+    """
+    Lee un CSV por trozos aplicando los tipos del esquema. Devuelve un iterador de DataFrames.
+    """
+    cabecera = pd.read_csv(ruta, nrows=0).columns
+    columnas = list(cabecera) if columnas is None else list(columnas)
+    tipos = {col: tipo for col, tipo in esquema['tipos'].items() if col in columnas}
+    return pd.read_csv(ruta, usecols=columnas, chunksize=chunksize, keep_default_na=False,
+                       na_values=_na_por_columna(ruta, esquema['na_values']), dtype=tipos)
+
+
+def _esquema_a_json(esquema):
+    tipos = {col: ({'categorias': list(tipo.categories)} if isinstance(tipo, pd.CategoricalDtype) else tipo)
+             for col, tipo in esquema['tipos'].items()}
+    return {**esquema, 'tipos': tipos}
+
+
+def _esquema_desde_json(datos):
+    tipos = {col: (pd.CategoricalDtype(tipo['categorias']) if isinstance(tipo, dict) else tipo)
+             for col, tipo in datos['tipos'].items()}
+    return {**datos, 'tipos': tipos}
+
+
+def crear_cache(rutas_csv=None, ruta_cache='../data/cache', ruta_descripcion='../docs/data_description.txt',
+                chunksize=100_000, na_como_categoria=False):
+    """
+    Convierte los CSV originales en una caché Parquet tipada (un archivo por conjunto) y guarda
+    el esquema en `esquema.json`. Los CSV se leen y escriben por trozos.
+
+    Parámetros:
+    - rutas_csv: Diccionario {conjunto: ruta}. Por defecto, train.csv y test.csv de `data`.
+    - ruta_cache: Carpeta de salida.
+
+    Retorna:
+    - El esquema utilizado.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if rutas_csv is None:
+        rutas_csv = {'train': '../data/train.csv', 'test': '../data/test.csv'}
+    os.makedirs(ruta_cache, exist_ok=True)
+
+    esquema = inferir_esquema(list(rutas_csv.values()), ruta_descripcion, chunksize, na_como_categoria)
+
+    for conjunto, ruta in rutas_csv.items():
+        escritor = None
+        for trozo in leer_csv_esquema(ruta, esquema, chunksize=chunksize):
+            tabla = pa.Table.from_pandas(trozo, preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(os.path.join(ruta_cache, f'{conjunto}.parquet'), tabla.schema)
+            escritor.write_table(tabla)
+        if escritor is not None:
+            escritor.close()
+
+    with open(os.path.join(ruta_cache, 'esquema.json'), 'w', encoding='utf-8') as archivo:
+        json.dump(_esquema_a_json(esquema), archivo, ensure_ascii=False, indent=2)
+
+    return esquema
+
+
+def cargar_esquema(ruta_cache='../data/cache'):
+    """
+    Carga el esquema guardado por `crear_cache`.
+    """
+    with open(os.path.join(ruta_cache, 'esquema.json'), encoding='utf-8') as archivo:
+        return _esquema_desde_json(json.load(archivo))
+
+
+def cargar_cache(ruta_cache='../data/cache', columnas=None, conjuntos=('train', 'test')):
+    """
+    Carga la caché Parquet leyendo solo las columnas pedidas (proyección de columnas).
+
+    Con varios conjuntos, los concatena y añade la columna 'Dataset' (categórica), igual que
+    el DataFrame combinado de los notebooks.
+    """
+    esquema = cargar_esquema(ruta_cache)
+    partes = []
+    for conjunto in conjuntos:
+        ruta = os.path.join(ruta_cache, f'{conjunto}.parquet')
+        columnas_conjunto = None if columnas is None else \
+            [col for col in columnas if col != 'Dataset' and (col != 'SalePrice' or conjunto != 'test')]
+        parte = pd.read_parquet(ruta, columns=columnas_conjunto)
+        # Las categorías se restauran del esquema para que coincidan entre conjuntos
+        for col in parte.columns:
+            tipo = esquema['tipos'].get(col)
+            if isinstance(tipo, pd.CategoricalDtype):
+                parte[col] = parte[col].astype(tipo)
+        partes.append(parte)
+
+    if len(partes) == 1:
+        return partes[0]
+
+    df = pd.concat(partes, axis=0, ignore_index=True)
+    df['Dataset'] = pd.Categorical(np.repeat(list(conjuntos), [len(parte) for parte in partes]),
+                                   categories=list(conjuntos))
+    return df
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from ingesta import _tipo_entero_minimo
+
+
+COLUMNAS_INFORME = ['Columna', 'Tipo antes', 'Tipo después', 'Bytes antes', 'Bytes después', 'Ahorro (%)']
+
+
+def _tipo_numerico(valores, enteros_nullable):
+    """
+    Tipo más pequeño que representa `valores` (float64) sin pérdida, o None si no hay uno más pequeño.
+    """
+    validos = valores[~np.isnan(valores)]
+    hay_nan = len(validos) < len(valores)
+    if len(validos) == 0:
+        return 'float32'
+    if np.all(validos == np.round(validos)) and np.all(np.isfinite(validos)) and (enteros_nullable or not hay_nan):
+        tipo = _tipo_entero_minimo(validos.min(), validos.max())
+        return tipo.capitalize() if hay_nan else tipo
+    if np.all(validos.astype('float32') == validos):
+        return 'float32'
+    return None
+
+
+def _valor_dominante(serie):
+    """
+    Valor más frecuente de `serie` (NaN incluido) y la fracción de filas que ocupa.
+    """
+    conteos = serie.value_counts(dropna=False, sort=True)
+    if conteos.empty:
+        return np.nan, 0.0
+    return conteos.index[0], conteos.iloc[0] / len(serie)
+
+
+def optimizar_memoria(df, fraccion_unicos=0.5, umbral_disperso=0.95, enteros_nullable=True,
+                      columna_dataset='Dataset'):
+    """
+    Reduce la memoria de un DataFrame cambiando el tipo de cada columna sin perder información.
+
+    - Numéricas: el entero más pequeño que contiene el rango (entero nullable si hay NaN y
+      `enteros_nullable=True`) o float32 si todos los valores son exactos en float32.
+    - Numéricas casi constantes (p. ej. PoolArea, o PoolQC ya codificada): si el valor más frecuente
+      (0 o NaN) ocupa al menos `umbral_disperso` de las filas, se guardan como `SparseDtype` con ese
+      valor de relleno. None desactiva este paso.
+    - Texto: `category` si el número de valores distintos es como mucho `fraccion_unicos` de las filas
+      no nulas. Las columnas casi vacías (PoolQC, Alley, Fence, MiscFeature) quedan con un código
+      int8 por fila y -1 para NaN. `columna_dataset` se convierte siempre, así las máscaras
+      `df['Dataset'] == 'train'` y los `groupby` comparan códigos en lugar de cadenas.
+    - Las columnas booleanas y las que ya son categóricas o dispersas no se tocan.
+
+    Parámetros:
+    - df: DataFrame a optimizar (no se modifica).
+    - fraccion_unicos: Fracción máxima de valores distintos para pasar el texto a `category`.
+    - umbral_disperso: Fracción mínima del valor dominante para usar un tipo disperso.
+    - enteros_nullable: Si False, las columnas enteras con NaN se dejan en float (en float32 si es exacto).
+    - columna_dataset: Columna de partición train/test que se convierte siempre a `category`.
+
+    Retorna:
+    - Tupla (DataFrame optimizado, informe) con el informe por columna: tipo y bytes antes y después
+      (`memory_usage(deep=True)`) y el porcentaje de ahorro, ordenado por porcentaje de ahorro.
+    """
+    resultado = {}
+    filas = []
+    for col in df.columns:
+        serie = df[col]
+        tipo = serie.dtype
+        nueva = serie
+        if isinstance(tipo, (pd.CategoricalDtype, pd.SparseDtype)) or pd.api.types.is_bool_dtype(tipo):
+            pass
+        elif pd.api.types.is_numeric_dtype(tipo):
+            valores = serie.to_numpy(dtype=float, na_value=np.nan)
+            tipo_nuevo = _tipo_numerico(valores, enteros_nullable)
+            if tipo_nuevo is not None and tipo_nuevo != str(tipo):
+                nueva = serie.astype(tipo_nuevo)
+            if umbral_disperso is not None and len(serie):
+                dominante, fraccion = _valor_dominante(serie)
+                if fraccion >= umbral_disperso:
+                    # Los tipos dispersos usan NaN como hueco, así que el subtipo es numpy (sin pd.NA)
+                    subtipo = nueva.dtype.numpy_dtype if hasattr(nueva.dtype, 'numpy_dtype') else nueva.dtype
+                    if pd.isna(dominante) or serie.isna().any():
+                        subtipo = np.result_type(subtipo, np.float32)
+                    nueva = pd.Series(pd.arrays.SparseArray(valores.astype(subtipo), fill_value=dominante),
+                                      index=serie.index, name=col)
+        elif pd.api.types.is_object_dtype(tipo) or pd.api.types.is_string_dtype(tipo):
+            n_validos = serie.notna().sum()
+            if col == columna_dataset or serie.nunique() <= fraccion_unicos * max(n_validos, 1):
+                nueva = serie.astype('category')
+
+        resultado[col] = nueva
+        antes = serie.memory_usage(index=False, deep=True)
+        despues = nueva.memory_usage(index=False, deep=True)
+        filas.append([col, str(tipo), str(nueva.dtype), antes, despues,
+                      100 * (1 - despues / antes) if antes else 0.0])
+
+    optimizado = pd.DataFrame(resultado, index=df.index)
+    informe = pd.DataFrame(filas, columns=COLUMNAS_INFORME)
+    informe = informe.sort_values('Ahorro (%)', ascending=False, kind='stable', ignore_index=True)
+    return optimizado, informe
+
+
+def resumen_memoria(informe):
+    """
+    Bytes totales antes y después y el porcentaje de ahorro a partir del informe de `optimizar_memoria`.
+    """
+    antes, despues = informe['Bytes antes'].sum(), informe['Bytes después'].sum()
+    return {'Bytes antes': int(antes), 'Bytes después': int(despues),
+            'Ahorro (%)': 100 * (1 - despues / antes) if antes else 0.0}
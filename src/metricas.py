@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+
+# Métricas en el orden de las columnas de `calcular_metricas_rendimiento`
+NOMBRES_METRICAS = ['R²', 'MAE', 'RMSE', 'MSE', 'RMSLE']
+
+MENSAJE_RMSLE = ('Root Mean Squared Logarithmic Error cannot be used when targets contain values '
+                 'less than or equal to -1.')
+
+
+def _comprobar_filas(array, nombre):
+    """
+    Rechaza vectores columna (n x 1): con la última dimensión como eje de filas se tomarían como
+    n folds (o modelos) de una sola fila y las métricas saldrían de la primera fila sin avisar.
+    """
+    if array.ndim >= 2 and array.shape[-1] == 1 and array.shape[-2] > 1:
+        raise ValueError(f'`{nombre}` tiene forma {array.shape}: las filas van en el último eje. '
+                         'Para un vector columna, usar np.ravel.')
+
+
+def _metricas_desde_sumas(n, sst, sse, sae, sle, invalido):
+    """
+    Métricas (..., 5) a partir de sumas por fold: filas `n`, suma de cuadrados de y respecto a su
+    media `sst`, y sumas de errores cuadrados, absolutos y cuadrados logarítmicos.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Mismo criterio que `r2_score` cuando y es constante: 1 si el ajuste es perfecto, 0 si no
+        r2 = np.where(sst > 0, 1 - sse / np.where(sst > 0, sst, 1), np.where(sse == 0, 1.0, 0.0))
+        mae = sae / n
+        rmse = np.sqrt(sse / n)
+        rmsle = np.where(invalido, np.nan, np.sqrt(sle / n))
+    # MSE como RMSE², igual que `calcular_metricas_rendimiento`
+    return np.stack([r2, mae, rmse, rmse ** 2, rmsle], axis=-1)
+
+
+def apilar_folds(y_folds, predicciones):
+    """
+    Rellena folds de distinto tamaño hasta el más largo y devuelve la máscara de filas válidas.
+
+    Parámetros:
+    - y_folds: Lista con el y real de cada fold.
+    - predicciones: Lista por modelo de listas por fold con las predicciones.
+
+    Retorna:
+    - Tupla (y (folds x filas), predicciones (modelos x folds x filas), máscara (folds x filas)).
+    """
+    n_filas = max(len(y) for y in y_folds)
+    y = np.zeros((len(y_folds), n_filas))
+    mascara = np.zeros((len(y_folds), n_filas), dtype=bool)
+    for fold, valores in enumerate(y_folds):
+        y[fold, :len(valores)] = np.asarray(valores, dtype=float)
+        mascara[fold, :len(valores)] = True
+    yhat = np.zeros((len(predicciones), len(y_folds), n_filas))
+    for modelo, folds in enumerate(predicciones):
+        for fold, valores in enumerate(folds):
+            yhat[modelo, fold, :len(valores)] = np.asarray(valores, dtype=float)
+    return y, yhat, mascara
+
+
+def calcular_metricas(y_real, predicciones, mascara=None):
+    """
+    R², MAE, RMSE, MSE y RMSLE de muchos modelos y folds a la vez, sin pasar por scikit-learn.
+
+    Las predicciones se apilan como (modelos x folds x filas) y el y real como (folds x filas); los
+    folds de distinto tamaño se rellenan y se marcan con `mascara` (ver `apilar_folds`). Cada
+    estadístico es una suma sobre el eje de filas, así que todas las métricas salen de unas pocas
+    operaciones vectorizadas. Los resultados coinciden con las funciones de `sklearn.metrics`.
+    El RMSLE es NaN en los folds con algún valor <= -1 (scikit-learn lanzaría un error).
+    Los vectores columna (n x 1) se rechazan por ambiguos: hay que pasarlos con np.ravel.
+
+    Parámetros:
+    - y_real: Array (filas) o (folds x filas).
+    - predicciones: Array (filas), (folds x filas) o (modelos x folds x filas).
+    - mascara: Array booleano (folds x filas) con las filas válidas de cada fold (por defecto, todas).
+
+    Retorna:
+    - Array (modelos x folds x 5) con las métricas en el orden de `NOMBRES_METRICAS`.
+    """
+    y = np.atleast_2d(np.asarray(y_real, dtype=float))
+    yhat = np.asarray(predicciones, dtype=float)
+    _comprobar_filas(y, 'y_real')
+    _comprobar_filas(yhat, 'predicciones')
+    yhat = yhat.reshape((1,) * (3 - yhat.ndim) + yhat.shape)
+    mascara = np.ones(y.shape, dtype=bool) if mascara is None else np.broadcast_to(np.asarray(mascara, dtype=bool), y.shape)
+
+    n = mascara.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.where(mascara, y, 0.0).sum(axis=1) / n
+    sst = np.square(np.where(mascara, y - media[:, None], 0.0)).sum(axis=1)
+
+    error = np.where(mascara, yhat - y, 0.0)
+    sse = np.einsum('mfr,mfr->mf', error, error)
+    sae = np.abs(error).sum(axis=2)
+
+    invalido = ((yhat <= -1) | (y <= -1)) & mascara
+    with np.errstate(invalid='ignore', divide='ignore'):
+        error_log = np.where(mascara & ~invalido, np.log1p(yhat) - np.log1p(y), 0.0)
+    sle = np.einsum('mfr,mfr->mf', error_log, error_log)
+
+    return _metricas_desde_sumas(n, sst, sse, sae, sle, invalido.any(axis=2))
+
+
+def tabla_metricas(valores, modelos=None):
+    """
+    DataFrame con una fila por modelo y fold (columnas 'Modelo', 'Fold' y las métricas) a partir
+    del array de `calcular_metricas` o de `AcumuladorMetricas.resultado`.
+    """
+    n_modelos, n_folds, _ = valores.shape
+    modelos = list(range(n_modelos)) if modelos is None else [str(modelo) for modelo in modelos]
+    tabla = pd.DataFrame(valores.reshape(-1, len(NOMBRES_METRICAS)), columns=NOMBRES_METRICAS)
+    tabla.insert(0, 'Fold', np.tile(np.arange(n_folds), n_modelos))
+    tabla.insert(0, 'Modelo', np.repeat(modelos, n_folds))
+    return tabla
+
+
+class AcumuladorMetricas:
+    """
+    Métricas de regresión en streaming: se actualiza con lotes de (y, predicciones) y solo guarda
+    sumas por modelo y fold, sin conservar las predicciones.
+
+    La suma de cuadrados de y respecto a su media (para R²) se acumula por fold con la combinación
+    de medias y varianzas de Chan et al., estable aunque los lotes lleguen en cualquier orden.
+    Todos los modelos de un fold deben recibir las mismas filas. Dos acumuladores (p. ej. de procesos
+    distintos) se suman con `combinar`.
+    """
+
+    def __init__(self, n_modelos=1, n_folds=1):
+        self.n = np.zeros(n_folds)
+        self.media = np.zeros(n_folds)
+        self.sst = np.zeros(n_folds)
+        self.sse = np.zeros((n_modelos, n_folds))
+        self.sae = np.zeros((n_modelos, n_folds))
+        self.sle = np.zeros((n_modelos, n_folds))
+        self.invalido = np.zeros((n_modelos, n_folds), dtype=bool)
+
+    def _combinar_y(self, fold, n, media, sst):
+        total = self.n[fold] + n
+        if total == 0:
+            return
+        delta = media - self.media[fold]
+        self.sst[fold] += sst + delta ** 2 * self.n[fold] * n / total
+        self.media[fold] += delta * n / total
+        self.n[fold] = total
+
+    def actualizar(self, y_real, predicciones, fold=0):
+        """
+        Añade un lote de filas de `fold`. `predicciones` es (modelos x filas), o (filas) con un solo modelo.
+        """
+        y = np.asarray(y_real, dtype=float)
+        yhat = np.atleast_2d(np.asarray(predicciones, dtype=float))
+        if y.ndim != 1:
+            raise ValueError(f'`y_real` tiene forma {y.shape}: debe ser un vector (filas); usar np.ravel.')
+        _comprobar_filas(yhat, 'predicciones')
+        if len(y) == 0:
+            return self
+        media = y.mean()
+        self._combinar_y(fold, len(y), media, np.square(y - media).sum())
+
+        error = yhat - y
+        self.sse[:, fold] += np.einsum('mr,mr->m', error, error)
+        self.sae[:, fold] += np.abs(error).sum(axis=1)
+        invalido = (yhat <= -1) | (y <= -1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            error_log = np.where(invalido, 0.0, np.log1p(yhat) - np.log1p(y))
+        self.sle[:, fold] += np.einsum('mr,mr->m', error_log, error_log)
+        self.invalido[:, fold] |= invalido.any(axis=1)
+        return self
+
+    def combinar(self, otro):
+        for fold in range(len(self.n)):
+            self._combinar_y(fold, otro.n[fold], otro.media[fold], otro.sst[fold])
+        self.sse += otro.sse
+        self.sae += otro.sae
+        self.sle += otro.sle
+        self.invalido |= otro.invalido
+        return self
+
+    def resultado(self):
+        """
+        Array (modelos x folds x 5) con las métricas acumuladas, como `calcular_metricas`.
+        """
+        return _metricas_desde_sumas(self.n, self.sst, self.sse, self.sae, self.sle, self.invalido)
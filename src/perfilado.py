@@ -0,0 +1,290 @@
+"""
+Perfilado ligero de las etapas del pipeline.
+
+Cada función decorada con `perfilar` (o bloque `with etapa(...)`) registra, mientras el perfilado
+está activo, el tiempo real, el tiempo de CPU, el incremento del pico de memoria y las formas de
+entrada y salida. Los registros van a un buffer circular en memoria y, opcionalmente, a un archivo
+JSON Lines (`.jsonl`) o de traza de Chrome (`.json`, se abre en chrome://tracing o Perfetto).
+
+Desactivado, el coste por llamada es una comprobación de una variable global. Se activa con
+`activar()` o con la variable de entorno `PERFILADO` (ruta del archivo de salida, o '1' para
+usar solo el buffer).
+"""
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_ACTIVO = False
+_CONFIG = {'memoria': 'rss', 'archivo': None, 'formato': 'jsonl'}
+_BUFFER = collections.deque(maxlen=10_000)
+_CERROJO = threading.Lock()
+_LOCAL = threading.local()
+
+COLUMNAS_RESUMEN = ['Llamadas', 'Tiempo total (s)', 'Tiempo medio (s)', 'Tiempo máximo (s)', 'CPU total (s)',
+                    'Memoria pico máx. (bytes)', 'Errores']
+
+
+def _pico_rss():
+    """
+    Pico de memoria residente del proceso en bytes (ru_maxrss está en KB en Linux y en bytes en macOS).
+    """
+    if resource is None:
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if os.uname().sysname == 'Darwin' else pico * 1024
+
+
+def _forma(objeto):
+    """
+    Forma de un argumento o resultado (None si no tiene); las tuplas se describen elemento a elemento.
+    """
+    forma = getattr(objeto, 'shape', None)
+    if forma is not None:
+        return list(forma)
+    if isinstance(objeto, tuple):
+        return [_forma(elemento) for elemento in objeto]
+    return None
+
+
+def _formas_entrada(args, kwargs):
+    formas = {str(posicion): _forma(valor) for posicion, valor in enumerate(args)}
+    formas.update({nombre: _forma(valor) for nombre, valor in kwargs.items()})
+    return {nombre: forma for nombre, forma in formas.items() if forma is not None}
+
+
+def _escribir(registro):
+    archivo = _CONFIG['archivo']
+    if archivo is None:
+        return
+    if _CONFIG['formato'] == 'chrome':
+        evento = {'name': registro['nombre'], 'cat': 'src', 'ph': 'X', 'ts': registro['inicio_us'],
+                  'dur': registro['duracion_s'] * 1e6, 'pid': registro['pid'], 'tid': registro['hilo'],
+                  'args': {clave: valor for clave, valor in registro.items()
+                           if clave not in ('nombre', 'inicio_us', 'pid', 'hilo')}}
+        # El formato de Chrome admite un array sin cerrar, así el archivo es válido aunque el proceso termine
+        linea = json.dumps(evento, ensure_ascii=False, default=str) + ',\n'
+    else:
+        linea = json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+    with _CERROJO:
+        archivo.write(linea)
+
+
+class _Medicion:
+    """
+    Mide un bloque: tiempo real y de CPU, incremento del pico de memoria y formas.
+    """
+
+    def __init__(self, nombre, formas_entrada=None):
+        self.nombre = nombre
+        self.formas_entrada = formas_entrada or {}
+        self.salida = None
+
+    def __enter__(self):
+        pila = getattr(_LOCAL, 'pila', None)
+        if pila is None:
+            pila = _LOCAL.pila = []
+        self.profundidad = len(pila)
+        if _CONFIG['memoria'] == 'tracemalloc' and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            # El pico del bloque padre hasta ahora se guarda antes de reiniciarlo para este bloque
+            if pila:
+                pila[-1]['pico_hijos'] = max(pila[-1]['pico_hijos'], pico)
+            tracemalloc.reset_peak()
+            self.memoria_inicial = actual
+        else:
+            self.memoria_inicial = _pico_rss() if _CONFIG['memoria'] == 'rss' else 0
+        self.marco = {'pico_hijos': 0}
+        pila.append(self.marco)
+        self.inicio_us = time.time_ns() // 1000
+        self.inicio = time.perf_counter()
+        self.inicio_cpu = time.process_time()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        duracion = time.perf_counter() - self.inicio
+        cpu = time.process_time() - self.inicio_cpu
+        _LOCAL.pila.pop()
+        if _CONFIG['memoria'] == 'tracemalloc' and tracemalloc.is_tracing():
+            pico = max(tracemalloc.get_traced_memory()[1], self.marco['pico_hijos'])
+            if _LOCAL.pila:
+                _LOCAL.pila[-1]['pico_hijos'] = max(_LOCAL.pila[-1]['pico_hijos'], pico)
+            memoria = pico - self.memoria_inicial
+        elif _CONFIG['memoria'] == 'rss':
+            memoria = _pico_rss() - self.memoria_inicial
+        else:
+            memoria = None
+
+        registro = {
+            'nombre': self.nombre,
+            'inicio_us': self.inicio_us,
+            'duracion_s': duracion,
+            'cpu_s': cpu,
+            'memoria_pico_bytes': memoria,
+            'formas_entrada': self.formas_entrada,
+            'forma_salida': _forma(self.salida),
+            'profundidad': self.profundidad,
+            'error': None if tipo is None else tipo.__name__,
+            'pid': os.getpid(),
+            'hilo': threading.get_ident(),
+        }
+        _BUFFER.append(registro)
+        _escribir(registro)
+        return False
+
+
+def perfilar(funcion=None, *, nombre=None):
+    """
+    Decorador que registra cada llamada a `funcion` mientras el perfilado está activo.
+    Se puede usar como `@perfilar` o `@perfilar(nombre='...')`.
+    """
+    if funcion is None:
+        return lambda funcion: perfilar(funcion, nombre=nombre)
+    etiqueta = nombre or f'{funcion.__module__}.{funcion.__qualname__}'
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not _ACTIVO:
+            return funcion(*args, **kwargs)
+        with _Medicion(etiqueta, _formas_entrada(args, kwargs)) as medicion:
+            medicion.salida = funcion(*args, **kwargs)
+        return medicion.salida
+
+    envoltura._perfilada = True
+    return envoltura
+
+
+class etapa:
+    """
+    Bloque perfilado: `with etapa('entrenamiento', X=X): ...`. Los argumentos con nombre se usan
+    solo para registrar sus formas. Con el perfilado desactivado no mide nada.
+    """
+
+    def __init__(self, nombre, **datos):
+        self.nombre = nombre
+        self.datos = datos
+        self.medicion = None
+
+    def __enter__(self):
+        if _ACTIVO:
+            self.medicion = _Medicion(self.nombre, _formas_entrada((), self.datos)).__enter__()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if self.medicion is not None:
+            return self.medicion.__exit__(tipo, valor, traza)
+        return False
+
+
+def instrumentar_modulo(espacio):
+    """
+    Envuelve con `perfilar` todas las funciones públicas definidas en un módulo. Se llama al final
+    del módulo con `instrumentar_modulo(globals())`; las funciones reexportadas de otros módulos
+    (p. ej. los gráficos) no se tocan.
+    """
+    modulo = espacio['__name__']
+    for nombre, valor in list(espacio.items()):
+        if (callable(valor) and not nombre.startswith('_') and getattr(valor, '__module__', None) == modulo
+                and not isinstance(valor, type) and not getattr(valor, '_perfilada', False)):
+            espacio[nombre] = perfilar(valor)
+
+
+def activar(ruta=None, capacidad=10_000, memoria='rss'):
+    """
+    Activa el perfilado.
+
+    Parámetros:
+    - ruta: Archivo de salida; '.json' escribe una traza de Chrome y cualquier otra extensión,
+      JSON Lines. None guarda los registros solo en el buffer.
+    - capacidad: Registros que conserva el buffer circular (los más antiguos se descartan).
+    - memoria: 'rss' (incremento del pico de memoria residente del proceso, sin coste apreciable),
+      'tracemalloc' (pico de memoria asignada por Python en cada llamada, exacto pero más lento)
+      o None.
+    """
+    global _ACTIVO, _BUFFER
+    desactivar()
+    if capacidad != _BUFFER.maxlen:
+        _BUFFER = collections.deque(_BUFFER, maxlen=capacidad)
+    _CONFIG['memoria'] = memoria
+    if memoria == 'tracemalloc' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if ruta is not None:
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        _CONFIG['formato'] = 'chrome' if ruta.endswith('.json') else 'jsonl'
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        _CONFIG['archivo'] = open(ruta, 'a', encoding='utf-8', buffering=1)
+        if _CONFIG['formato'] == 'chrome' and nuevo:
+            _CONFIG['archivo'].write('[\n')
+    _ACTIVO = True
+
+
+def desactivar():
+    """
+    Desactiva el perfilado y cierra el archivo de salida. El buffer se conserva.
+    """
+    global _ACTIVO
+    _ACTIVO = False
+    if _CONFIG['archivo'] is not None:
+        _CONFIG['archivo'].close()
+        _CONFIG['archivo'] = None
+    if _CONFIG['memoria'] == 'tracemalloc' and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def activo():
+    return _ACTIVO
+
+
+def registros():
+    """
+    Copia de los registros del buffer (del más antiguo al más reciente).
+    """
+    return list(_BUFFER)
+
+
+def limpiar():
+    _BUFFER.clear()
+
+
+def tabla_registros():
+    """
+    DataFrame con un registro por fila.
+    """
+    return pd.DataFrame(registros())
+
+
+def resumen_perfilado():
+    """
+    Tiempos agregados por función o etapa, de la más lenta (tiempo total) a la más rápida.
+    """
+    tabla = tabla_registros()
+    if tabla.empty:
+        return pd.DataFrame(columns=COLUMNAS_RESUMEN)
+    grupos = tabla.groupby('nombre')
+    resumen = pd.DataFrame({
+        'Llamadas': grupos.size(),
+        'Tiempo total (s)': grupos['duracion_s'].sum(),
+        'Tiempo medio (s)': grupos['duracion_s'].mean(),
+        'Tiempo máximo (s)': grupos['duracion_s'].max(),
+        'CPU total (s)': grupos['cpu_s'].sum(),
+        'Memoria pico máx. (bytes)': grupos['memoria_pico_bytes'].max(),
+        'Errores': grupos['error'].count(),
+    })
+    return resumen.sort_values('Tiempo total (s)', ascending=False)
+
+
+if os.environ.get('PERFILADO'):
+    activar(None if os.environ['PERFILADO'] == '1' else os.environ['PERFILADO'])
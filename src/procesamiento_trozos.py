@@ -0,0 +1,449 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_processing import _combinar_perfiles, _perfil_parcial, _resumen_desde_perfil
+from imputacion import ImputadorCondicional
+from ingesta import leer_csv_esquema
+
+
+# Columna comodín: la etapa lee o modifica todas las columnas (p. ej. elimina filas)
+TODAS = '*'
+
+
+class _Etapa:
+    """
+    Etapa sin estado global: se aplica a cada trozo tal cual.
+
+    Las etapas con estado (`con_estado = True`) recorren antes los datos con `acumular`, que guarda
+    estadísticos combinables en el objeto devuelto por `nuevas_estadisticas`, y se ajustan con
+    `finalizar` a partir de las estadísticas ya combinadas de todos los trozos.
+    """
+
+    con_estado = False
+
+    def __init__(self, config, pipeline):
+        self.config = config
+        self.objetivo = pipeline.objetivo
+        self.columna_dataset = pipeline.columna_dataset
+
+    def lee(self):
+        return {TODAS}
+
+    def modifica(self):
+        return {TODAS}
+
+    def nuevas_estadisticas(self):
+        return None
+
+    def acumular(self, estadisticas, trozo):
+        pass
+
+    def combinar(self, estadisticas, otras):
+        return estadisticas
+
+    def finalizar(self, estadisticas):
+        pass
+
+    def reiniciar(self):
+        pass
+
+    def transformar(self, trozo):
+        return trozo
+
+    def _filas_train(self, trozo):
+        if self.columna_dataset in trozo.columns:
+            return (trozo[self.columna_dataset] == 'train').to_numpy()
+        return np.ones(len(trozo), dtype=bool)
+
+
+class _EtapaImputacion(_Etapa):
+    """
+    Reglas de `imputacion.ImputadorCondicional` ({'tipo': 'imputacion', 'reglas': [...]}).
+    """
+
+    def __init__(self, config, pipeline):
+        super().__init__(config, pipeline)
+        self.imputador = ImputadorCondicional(config.get('reglas'))
+
+    def lee(self):
+        return {regla.get('indicador', regla.get('referencia')) for regla in self.imputador.reglas} | self.modifica()
+
+    def modifica(self):
+        return {col for regla in self.imputador.reglas for col in regla['columnas']}
+
+    def reiniciar(self):
+        self.imputador.reiniciar()
+
+    def transformar(self, trozo):
+        return self.imputador.aplicar(trozo)
+
+
+class _EtapaOrdinal(_Etapa):
+    """
+    Codificación ordinal con categorías fijas ({'tipo': 'ordinal', 'categorias': {columna: [...]}}).
+    """
+
+    def __init__(self, config, pipeline):
+        super().__init__(config, pipeline)
+        from codificadores import CodificadorOrdinal
+
+        self.codificador = CodificadorOrdinal(categorias=config['categorias'],
+                                              handle_unknown=config.get('handle_unknown', 'error')).fit()
+
+    def lee(self):
+        return set(self.config['categorias'])
+
+    def modifica(self):
+        return set(self.config['categorias'])
+
+    def transformar(self, trozo):
+        columnas = list(self.config['categorias'])
+        trozo[columnas] = self.codificador.transform(trozo[columnas])[columnas]
+        return trozo
+
+
+class _EtapaAtipicos(_Etapa):
+    """
+    `atipicos.FiltroAtipicos` con cuantiles aproximados ({'tipo': 'atipicos', 'cols': [...], ...};
+    el resto de claves son parámetros del filtro). Cada trozo o archivo actualiza su propio filtro
+    con `partial_fit` y los sketches se combinan al final.
+    """
+
+    con_estado = True
+
+    def _parametros(self):
+        return {clave: valor for clave, valor in self.config.items() if clave != 'tipo'}
+
+    def lee(self):
+        return {TODAS} if self.config.get('cols') is None else set(self.config['cols'])
+
+    def modifica(self):
+        if self.config.get('modo', 'mascara') == 'mascara':
+            return {TODAS}
+        return self.lee()
+
+    def nuevas_estadisticas(self):
+        from atipicos import FiltroAtipicos
+
+        return FiltroAtipicos(**self._parametros(), aproximado=True)
+
+    def acumular(self, estadisticas, trozo):
+        estadisticas.partial_fit(trozo)
+
+    def combinar(self, estadisticas, otras):
+        return estadisticas.combinar(otras)
+
+    def finalizar(self, estadisticas):
+        self.filtro = estadisticas
+
+    def transformar(self, trozo):
+        return self.filtro.transform(trozo)
+
+
+class _EtapaCodificacion(_Etapa):
+    """
+    Codificadores ajustados con las filas de train: 'etiquetas', 'ponderada' o 'loo'
+    ({'tipo': 'ponderada', 'columnas': [...], 'min_muestras': 10}). Se acumulan
+    `codificadores.EstadisticasCategorias` por columna y el codificador se construye al final con
+    `desde_estadisticas`, igual que si se hubiera ajustado con todas las filas de train.
+    """
+
+    con_estado = True
+
+    def lee(self):
+        return set(self.config['columnas']) | {self.objetivo, self.columna_dataset}
+
+    def modifica(self):
+        return set(self.config['columnas'])
+
+    def nuevas_estadisticas(self):
+        from codificadores import EstadisticasCategorias
+
+        return {col: EstadisticasCategorias() for col in self.config['columnas']}
+
+    def acumular(self, estadisticas, trozo):
+        train = trozo[self._filas_train(trozo)]
+        if train.empty:
+            return
+        y = None
+        if self.config['tipo'] != 'etiquetas':
+            # Un trozo sin la columna objetivo (p. ej. el CSV de test) cuenta como objetivo desconocido
+            y = train[self.objetivo] if self.objetivo in train.columns else pd.Series(np.nan, index=train.index)
+        for col, estadisticas_col in estadisticas.items():
+            estadisticas_col.actualizar(train[col], y)
+
+    def combinar(self, estadisticas, otras):
+        for col, estadisticas_col in estadisticas.items():
+            estadisticas_col.combinar(otras[col])
+        return estadisticas
+
+    def finalizar(self, estadisticas):
+        from codificadores import CodificadorEtiquetas, CodificadorLOO, CodificadorPonderado
+
+        if self.config['tipo'] == 'etiquetas':
+            self.codificador = CodificadorEtiquetas.desde_estadisticas(estadisticas)
+        elif self.config['tipo'] == 'ponderada':
+            self.codificador = CodificadorPonderado.desde_estadisticas(
+                estadisticas, min_muestras=self.config.get('min_muestras', 10))
+        else:
+            self.codificador = CodificadorLOO.desde_estadisticas(estadisticas)
+
+    def transformar(self, trozo):
+        columnas = list(self.config['columnas'])
+        if self.config['tipo'] != 'loo':
+            trozo[columnas] = self.codificador.transform(trozo[columnas])[columnas]
+            return trozo
+        # Como `codificacion_loo`: train excluye el objetivo de cada fila y el resto usa la media
+        train = self._filas_train(trozo) & (self.objetivo in trozo.columns)
+        codificado = self.codificador.transform(trozo[columnas])
+        if train.any():
+            codificado.loc[train, columnas] = self.codificador.transform_entrenamiento(
+                trozo.loc[train, columnas], trozo.loc[train, self.objetivo])[columnas]
+        trozo[columnas] = codificado[columnas].astype(float)
+        return trozo
+
+
+TIPOS_ETAPA = {
+    'imputacion': _EtapaImputacion,
+    'ordinal': _EtapaOrdinal,
+    'atipicos': _EtapaAtipicos,
+    'etiquetas': _EtapaCodificacion,
+    'ponderada': _EtapaCodificacion,
+    'loo': _EtapaCodificacion,
+}
+
+
+def _planificar_pasadas(etapas):
+    """
+    Agrupa las etapas con estado en pasadas de ajuste. Una etapa con estado necesita una pasada
+    nueva solo si lee columnas que dependen de otra etapa aún sin ajustar (directamente o a través
+    de las etapas sin estado intermedias); si no, sus estadísticas se recogen en la misma pasada.
+    """
+    pasadas = []
+    actual, pendientes = [], set()
+    for posicion, etapa in enumerate(etapas):
+        lee = etapa.lee()
+        depende = bool(pendientes) and (TODAS in pendientes or TODAS in lee or bool(lee & pendientes))
+        if etapa.con_estado:
+            if depende:
+                pasadas.append(actual)
+                actual, pendientes = [], set()
+            actual.append(posicion)
+            pendientes |= etapa.modifica()
+        elif depende:
+            pendientes |= etapa.modifica()
+    if actual:
+        pasadas.append(actual)
+    return pasadas
+
+
+class PipelineTrozos:
+    """
+    Ejecuta la limpieza y la codificación por trozos, con memoria acotada sea cual sea el tamaño
+    de la entrada.
+
+    1. `ajustar`: una o varias pasadas que recogen estadísticos combinables (sketches de cuantiles
+       de `FiltroAtipicos`, sumas y conteos por categoría de los codificadores y, opcionalmente, el
+       perfil de `resumen_columnas`). Cada archivo de entrada se puede recorrer en un proceso distinto
+       (`n_jobs`); sus estadísticas se combinan después. Las etapas con estado independientes entre
+       sí se ajustan en la misma pasada.
+    2. `escribir`: segunda pasada que transforma cada trozo y lo escribe en Parquet particionado
+       por 'Dataset' (`Dataset=train/parte-00000.parquet`...).
+
+    La memoria depende del tamaño del trozo y del número de categorías, no del número de filas.
+    Las etapas se aplican en orden y son diccionarios con la clave 'tipo' (ver `TIPOS_ETAPA`):
+
+        [{'tipo': 'imputacion', 'reglas': REGLAS_VIVIENDA},
+         {'tipo': 'atipicos', 'cols': ['GrLivArea', 'LotArea'], 'modo': 'recorte'},
+         {'tipo': 'ponderada', 'columnas': ['Neighborhood'], 'min_muestras': 10},
+         {'tipo': 'loo', 'columnas': ['Exterior1st']}]
+
+    Parámetros:
+    - etapas: Lista de etapas.
+    - objetivo, columna_dataset: Columna objetivo y columna de partición train/test.
+    - tam_trozo: Filas por trozo.
+    - esquema: Esquema de `ingesta.inferir_esquema` para leer los CSV con tipos fijos (recomendado:
+      sin él, una columna vacía en un trozo se lee como float).
+    - columnas_resumen: Si se indica, la primera pasada calcula también `resumen_columnas` de estas
+      columnas (sobre los datos de entrada), disponible en `resumen_`.
+    - n_jobs: Procesos para recorrer los archivos de entrada en las pasadas de ajuste.
+    """
+
+    def __init__(self, etapas, objetivo='SalePrice', columna_dataset='Dataset', tam_trozo=100_000, esquema=None,
+                 columnas_resumen=None, n_jobs=1):
+        self.objetivo = objetivo
+        self.columna_dataset = columna_dataset
+        self.tam_trozo = tam_trozo
+        self.esquema = esquema
+        self.columnas_resumen = None if columnas_resumen is None else list(columnas_resumen)
+        self.n_jobs = n_jobs
+        self.etapas = [TIPOS_ETAPA[config['tipo']](config, self) for config in etapas]
+        self.pasadas = _planificar_pasadas(self.etapas)
+        self.resumen_ = None
+
+    def _lectores(self, fuente):
+        """
+        Lista de (fuente, conjunto): un diccionario {conjunto: ruta} añade la columna 'Dataset'.
+        """
+        if isinstance(fuente, dict):
+            return [(ruta, conjunto) for conjunto, ruta in fuente.items()]
+        if isinstance(fuente, (list, tuple)):
+            return [(elemento, None) for elemento in fuente]
+        return [(fuente, None)]
+
+    def _leer(self, lector):
+        """
+        Iterador de trozos de una fuente: DataFrame, ruta CSV o Parquet, o función que devuelve un iterador.
+        """
+        fuente, conjunto = lector
+        if isinstance(fuente, pd.DataFrame):
+            trozos = (fuente.iloc[inicio:inicio + self.tam_trozo].copy() for inicio in range(0, len(fuente), self.tam_trozo))
+        elif callable(fuente):
+            trozos = fuente()
+        elif str(fuente).endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            trozos = (lote.to_pandas() for lote in pq.ParquetFile(fuente).iter_batches(batch_size=self.tam_trozo))
+        elif self.esquema is not None:
+            trozos = leer_csv_esquema(fuente, self.esquema, chunksize=self.tam_trozo)
+        else:
+            trozos = pd.read_csv(fuente, chunksize=self.tam_trozo)
+        for trozo in trozos:
+            if conjunto is not None:
+                trozo[self.columna_dataset] = conjunto
+            yield trozo
+
+    def _recorrer(self, lector, pasada, con_resumen):
+        """
+        Recorre una fuente acumulando las estadísticas de las etapas de `pasada`. Las etapas anteriores
+        ya ajustadas (y las sin estado) se aplican; las de la pasada no, porque ninguna etapa de la
+        misma pasada lee lo que modifican.
+        """
+        estadisticas = {posicion: self.etapas[posicion].nuevas_estadisticas() for posicion in pasada}
+        perfil = None
+        for trozo in self._leer(lector):
+            if con_resumen:
+                parcial = _perfil_parcial(trozo, self.columnas_resumen)
+                perfil = parcial if perfil is None else _combinar_perfiles([perfil, parcial])
+            for posicion, etapa in enumerate(self.etapas[:max(pasada, default=-1) + 1]):
+                if posicion in estadisticas:
+                    etapa.acumular(estadisticas[posicion], trozo)
+                else:
+                    trozo = etapa.transformar(trozo)
+        return estadisticas, perfil
+
+    def ajustar(self, fuente):
+        """
+        Pasadas de ajuste sobre `fuente`: DataFrame, ruta, lista de rutas, {conjunto: ruta} o una
+        función sin argumentos que devuelva un iterador de DataFrames.
+        """
+        from joblib import Parallel, delayed
+
+        lectores = self._lectores(fuente)
+        pasadas = self.pasadas or ([[]] if self.columnas_resumen else [])
+        for numero, pasada in enumerate(pasadas):
+            con_resumen = numero == 0 and self.columnas_resumen is not None
+            if self.n_jobs == 1 or len(lectores) == 1:
+                salidas = [self._recorrer(lector, pasada, con_resumen) for lector in lectores]
+            else:
+                salidas = Parallel(n_jobs=self.n_jobs)(delayed(self._recorrer)(lector, pasada, con_resumen)
+                                                       for lector in lectores)
+
+            # Las estadísticas se combinan en el orden de las fuentes (orden de aparición de las categorías)
+            estadisticas, perfil = salidas[0]
+            for otras, perfil_otro in salidas[1:]:
+                for posicion in pasada:
+                    estadisticas[posicion] = self.etapas[posicion].combinar(estadisticas[posicion], otras[posicion])
+                if con_resumen:
+                    perfil = _combinar_perfiles([perfil, perfil_otro])
+            for posicion in pasada:
+                self.etapas[posicion].finalizar(estadisticas[posicion])
+            if con_resumen:
+                self.resumen_ = _resumen_desde_perfil(perfil, self.columnas_resumen)
+        return self
+
+    def transformar(self, trozo):
+        """
+        Aplica todas las etapas (ya ajustadas) a un trozo. Como en `data_processing`, las columnas
+        se modifican en el sitio.
+        """
+        for etapa in self.etapas:
+            trozo = etapa.transformar(trozo)
+        return trozo
+
+    def transformar_trozos(self, fuente):
+        """
+        Iterador de trozos transformados de `fuente`.
+        """
+        for etapa in self.etapas:
+            etapa.reiniciar()
+        for lector in self._lectores(fuente):
+            for trozo in self._leer(lector):
+                yield self.transformar(trozo)
+
+    def escribir(self, fuente, ruta_salida, filas_por_archivo=1_000_000):
+        """
+        Transforma `fuente` trozo a trozo y la escribe en Parquet particionado por 'Dataset'
+        (estilo Hive, `pd.read_parquet(ruta_salida)` recupera la columna). Cada partición se reparte
+        en archivos de como mucho `filas_por_archivo` filas más un trozo. Todos los archivos usan
+        el esquema del primer trozo escrito: los trozos sin la columna objetivo (p. ej. los del CSV
+        de test con una fuente {conjunto: ruta}) la escriben como nula, igual que cualquier otra
+        columna del esquema que les falte.
+
+        Retorna:
+        - Lista de rutas de los archivos escritos.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        escritores = {}
+        esquema = None
+        rutas = []
+        for trozo in self.transformar_trozos(fuente):
+            if self.objetivo not in trozo.columns:
+                trozo[self.objetivo] = np.nan
+            if self.columna_dataset in trozo.columns:
+                partes = trozo.groupby(trozo[self.columna_dataset].astype(str), sort=False)
+                partes = [(f'{self.columna_dataset}={valor}', parte.drop(columns=self.columna_dataset))
+                          for valor, parte in partes]
+            else:
+                partes = [('', trozo)]
+            for particion, parte in partes:
+                if esquema is None:
+                    esquema = pa.Schema.from_pandas(parte, preserve_index=False)
+                faltan = [campo.name for campo in esquema if campo.name not in parte.columns]
+                if faltan:
+                    parte = parte.assign(**{col: pd.Series(None, index=parte.index, dtype=object) for col in faltan})
+                tabla = pa.Table.from_pandas(parte, schema=esquema, preserve_index=False)
+
+                escritor, filas, numero = escritores.get(particion, (None, 0, 0))
+                if escritor is not None and filas >= filas_por_archivo:
+                    escritor.close()
+                    escritor, filas, numero = None, 0, numero + 1
+                if escritor is None:
+                    carpeta = os.path.join(ruta_salida, particion)
+                    os.makedirs(carpeta, exist_ok=True)
+                    ruta = os.path.join(carpeta, f'parte-{numero:05d}.parquet')
+                    escritor = pq.ParquetWriter(ruta, esquema)
+                    rutas.append(ruta)
+                escritor.write_table(tabla)
+                escritores[particion] = (escritor, filas + len(parte), numero)
+
+        for escritor, _, _ in escritores.values():
+            escritor.close()
+        return rutas
+
+    def ejecutar(self, fuente, ruta_salida, **kwargs):
+        """
+        Ajusta el pipeline y escribe la salida transformada (dos recorridos de `fuente` como mínimo).
+        """
+        return self.ajustar(fuente).escribir(fuente, ruta_salida, **kwargs)
+
+    def informe_imputacion(self):
+        """
+        Informe de `ImputadorCondicional` de todas las etapas de imputación de la última escritura.
+        """
+        informes = [etapa.imputador.informe() for etapa in self.etapas if isinstance(etapa, _EtapaImputacion)]
+        return pd.concat(informes, ignore_index=True) if informes else None
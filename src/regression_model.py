@@ -1,100 +1,43 @@
 import pandas as pd
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
 
-from sklearn.model_selection import learning_curve
-from sklearn.metrics import r2_score, mean_absolute_error, root_mean_squared_error, root_mean_squared_log_error, make_scorer
+from metricas import MENSAJE_RMSLE, NOMBRES_METRICAS, calcular_metricas
+from perfilado import instrumentar_modulo
 
-
-def graficar_curva_aprendizaje_rmsle(modelo, X, y):
-    # Crear el scorer para RMSLE. greater_is_better=False: RMSLE es más bajo cuando es mejor
-    rmsle_scorer = make_scorer(root_mean_squared_log_error, greater_is_better=False)
-    
-    train_sizes, train_scores, test_scores = learning_curve(
-        modelo, X, y, cv=5, n_jobs=-1,
-        train_sizes=np.linspace(0.1, 1.0, 10),
-        scoring=rmsle_scorer
-    )
-
-    # Convertir las puntuaciones a positivas (ya que están como valores negativos)
-    train_scores_mean = -np.mean(train_scores, axis=1)
-    test_scores_mean = -np.mean(test_scores, axis=1)
-    train_scores_std = np.std(-train_scores, axis=1)
-    test_scores_std = np.std(-test_scores, axis=1)
-
-    # Graficar la curva de aprendizaje
-    plt.figure(figsize=(10, 6))
-    plt.plot(train_sizes, train_scores_mean, 'o-', color='r', label='Puntuación de Entrenamiento (RMSLE)')
-    plt.plot(train_sizes, test_scores_mean, 'o-', color='g', label='Puntuación de Validación (RMSLE)')
-    
-    # Rellenar las áreas de desviación estándar
-    plt.fill_between(train_sizes, train_scores_mean - train_scores_std,
-                     train_scores_mean + train_scores_std, alpha=0.1, color='r')
-    plt.fill_between(train_sizes, test_scores_mean - test_scores_std,
-                     test_scores_mean + test_scores_std, alpha=0.1, color='g')
-
-    plt.title(f'Curva de Aprendizaje (RMSLE): {modelo.__class__.__name__}')
-    plt.xlabel('Tamaño del Conjunto de Entrenamiento')
-    plt.ylabel('RMSLE')
-    plt.legend(loc='best')
-    plt.grid()
-    plt.show()
-
-
-def feature_importances(model, X_train, top_n=30, ascending=False, palette="viridis"):
-    """
-    Grafica las importancias de características de un modelo.
-
-    Parámetros:
-    - model: Modelo entrenado que contiene las importancias de características.
-    - X_train: Conjunto de entrenamiento utilizado, que contiene los nombres de las características.
-    - top_n: Número de características a mostrar (por defecto, 30).
-    - ascending: Orden de las características, False para las más importantes, True para las menos.
-    - palette: Paleta de colores para el gráfico (por defecto, "viridis").
-    """
-    # Obtener las importancias de características
-    importances = model.feature_importances_
-
-    # Crear el DataFrame
-    df_importances = pd.DataFrame(data=zip(X_train.columns, importances),
-                                  columns=["Columnas", "Importancia"])
-
-    # Ordenar y seleccionar el top_n
-    df_importances = df_importances.sort_values("Importancia", ascending=ascending)
-    df_top_importances = df_importances.head(top_n)
-
-    # Definir el título
-    title = f"Las {top_n} características {'menos' if ascending else 'más'} importantes"
-    
-    # Graficar
-    plt.figure(figsize=(10, 6))
-    plt.title(title)
-    sns.barplot(x="Importancia", y="Columnas", data=df_top_importances, palette=palette, hue="Columnas", legend=False)
-    plt.grid()
-    plt.show()
+# Los gráficos viven en `graficos`; se reexportan aquí para mantener los imports de los notebooks
+from graficos import graficar_curva_aprendizaje_rmsle, feature_importances  # noqa: F401
 
 
 def calcular_metricas_rendimiento(modelo, X_val, y_val, yhat):
     """
     Calcula las métricas de rendimiento R², MAE, RMSE, MSE, RMSLE para evaluar la precisión
     de un modelo de regresión utilizando las predicciones y los valores reales.
+    Para muchos modelos o folds a la vez (o en streaming), usar `metricas.calcular_metricas`
+    y `metricas.AcumuladorMetricas`.
 
     """
-    r2 = r2_score(y_val, yhat)  # R²: Coeficiente de determinación
-    mae = mean_absolute_error(y_val, yhat)  # MAE: Error absoluto medio
-    rmse = root_mean_squared_error(y_val, yhat)  # RMSE: Raíz del error cuadrático medio
-    mse = rmse ** 2  # MSE: Error cuadrático medio
-    rmsle = root_mean_squared_log_error(y_val, yhat)  # RMSLE: Error cuadrático medio logarítmico
+    from sklearn.utils import assert_all_finite, check_consistent_length
 
-    return pd.DataFrame([[str(modelo), r2, mae, rmse, mse, rmsle]],
-                        columns=["Modelo", "R²", "MAE", "RMSE", "MSE", "RMSLE"])
+    # Mismas validaciones que `sklearn.metrics`: longitudes distintas o NaN/inf lanzan ValueError
+    check_consistent_length(y_val, yhat)
+    # Como en `sklearn.metrics`, un vector columna (n x 1), p. ej. de `inverse_transform`, es una sola salida
+    y_val, yhat = np.ravel(y_val), np.ravel(yhat)
+    assert_all_finite(y_val, input_name='y_val')
+    assert_all_finite(yhat, input_name='yhat')
+
+    valores = calcular_metricas(y_val, yhat)[0, 0]
+    if np.isnan(valores[-1]):
+        raise ValueError(MENSAJE_RMSLE)
+
+    return pd.DataFrame([[str(modelo), *valores]],
+                        columns=["Modelo", *NOMBRES_METRICAS])
 
 
 def revisar_predicciones(predicciones, test, df_predicciones, train=None):
     """
     Valida las predicciones generadas por un modelo, asegurando la consistencia y la integridad de los datos.
+    Para archivos de predicciones grandes (por trozos y con un informe en lugar de mensajes), usar
+    `validacion_predicciones.validar_predicciones`.
         
     """
 
@@ -129,3 +72,7 @@ def revisar_predicciones(predicciones, test, df_predicciones, train=None):
             ], axis=1)
             print("\nComparación estadística entre predicciones y entrenamiento:")
             print(comparacion)
+
+
+# Todas las funciones públicas quedan perfiladas (sin coste mientras `perfilado` esté desactivado)
+instrumentar_modulo(globals())
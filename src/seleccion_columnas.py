@@ -0,0 +1,110 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from correlaciones import tabla_correlaciones
+
+
+METODOS_CORRELACION = ('Pearson', 'Spearman', 'Kendall')
+
+
+def columnas_casi_constantes(df, columnas, umbral=0.99):
+    """
+    Columnas en las que el valor más frecuente (NaN incluido) ocupa al menos `umbral` de las filas.
+    """
+    return [col for col in columnas
+            if len(df) and df[col].value_counts(dropna=False, normalize=True).iloc[0] >= umbral]
+
+
+def asociacion_objetivo(df, columnas, objetivo='SalePrice', metodo='Spearman'):
+    """
+    Correlación absoluta de cada columna numérica con el objetivo (NaN si no se puede calcular).
+    """
+    numericas = [col for col in columnas if pd.api.types.is_numeric_dtype(df[col])]
+    asociacion = pd.Series(np.nan, index=list(columnas))
+    if numericas:
+        tabla = tabla_correlaciones(df, numericas + [objetivo], pares=[(col, objetivo) for col in numericas],
+                                    kendall=metodo == 'Kendall')
+        asociacion[numericas] = tabla[metodo].abs().to_numpy()
+    return asociacion
+
+
+def seleccionar_columnas(df, correlaciones, objetivo='SalePrice', umbral_correlacion=0.8, umbral_constante=0.99,
+                         metodos=METODOS_CORRELACION, metodo_objetivo='Spearman',
+                         excluir=('Id', 'Dataset')):
+    """
+    Selección de columnas por redundancia a partir de la salida de
+    `data_visualization.calcular_todas_correlaciones`, para sustituir listas fijas de columnas a eliminar.
+
+    1. Se eliminan las columnas casi constantes (valor más frecuente en al menos `umbral_constante`
+       de las filas).
+    2. Las columnas restantes se recorren de mayor a menor asociación con el objetivo. Cada una se
+       conserva si no tiene una correlación de al menos `umbral_correlacion` (en valor absoluto, la
+       mayor de `metodos`) con alguna ya conservada; si la tiene, pasa al grupo de la conservada con
+       la que más correla. Así cada grupo de columnas correlacionadas queda representado por la de
+       mayor asociación con el objetivo, sin encadenar columnas que no correlan entre sí.
+
+    Solo se usan las filas con objetivo (las de train). Las columnas que no aparecen en
+    `correlaciones` se conservan (salvo que sean casi constantes).
+
+    Parámetros:
+    - df: DataFrame con las columnas candidatas y el objetivo.
+    - correlaciones: Resultado de `calcular_todas_correlaciones` (con un umbral menor o igual que
+      `umbral_correlacion`).
+    - objetivo: Variable objetivo.
+    - umbral_correlacion: Correlación a partir de la cual dos columnas se consideran redundantes.
+    - umbral_constante: Proporción del valor más frecuente para considerar una columna casi constante.
+    - metodos: Correlaciones de `correlaciones` que se tienen en cuenta.
+    - metodo_objetivo: Correlación con el objetivo usada para elegir el representante de cada grupo.
+    - excluir: Columnas que no se evalúan ni se eliminan.
+
+    Retorna:
+    - Diccionario con:
+      - 'columnas': Columnas conservadas, en el orden de `df`.
+      - 'columnas_eliminar': Columnas eliminadas (casi constantes y redundantes), en el orden de `df`.
+      - 'casi_constantes' y 'redundantes': Columnas eliminadas por cada motivo.
+      - 'grupos': DataFrame con 'Representante', 'Columna', 'Correlación' y 'Asociación objetivo'
+        (una fila por columna redundante).
+    """
+    df = df[df[objetivo].notna()]
+    candidatas = [col for col in df.columns if col != objetivo and col not in excluir]
+
+    casi_constantes = set(columnas_casi_constantes(df, candidatas, umbral_constante))
+    restantes = [col for col in candidatas if col not in casi_constantes]
+    asociacion = asociacion_objetivo(df, restantes, objetivo, metodo_objetivo)
+
+    # Correlaciones fuertes entre columnas candidatas: {columna: {otra: correlación}}
+    fuerza = correlaciones[[f'Correlación {metodo}' for metodo in metodos]].abs().max(axis=1)
+    fuertes = fuerza >= umbral_correlacion
+    vecinos = defaultdict(dict)
+    for col_1, col_2, valor in zip(correlaciones.loc[fuertes, 'Variable 1'], correlaciones.loc[fuertes, 'Variable 2'],
+                                   fuerza[fuertes]):
+        vecinos[col_1][col_2] = vecinos[col_2][col_1] = valor
+
+    orden = asociacion.sort_values(ascending=False, na_position='last', kind='stable').index
+    conservadas, grupos = set(), []
+    for col in orden:
+        cercanas = {otra: valor for otra, valor in vecinos[col].items() if otra in conservadas}
+        if cercanas:
+            representante = max(cercanas, key=cercanas.get)
+            grupos.append((representante, col, cercanas[representante], asociacion[col]))
+        else:
+            conservadas.add(col)
+
+    redundantes = {col for _, col, _, _ in grupos}
+    return {
+        'columnas': [col for col in candidatas if col in conservadas],
+        'columnas_eliminar': [col for col in candidatas if col in casi_constantes or col in redundantes],
+        'casi_constantes': [col for col in candidatas if col in casi_constantes],
+        'redundantes': [col for col in candidatas if col in redundantes],
+        'grupos': pd.DataFrame(grupos, columns=['Representante', 'Columna', 'Correlación', 'Asociación objetivo']),
+    }
+
+
+def aplicar_seleccion(df, seleccion):
+    """
+    Elimina de `df` las columnas descartadas por `seleccionar_columnas` (las que tenga). Se aplica
+    igual a train, test y a los datos nuevos, con la misma selección guardada junto al modelo.
+    """
+    return df.drop(columns=[col for col in seleccion['columnas_eliminar'] if col in df.columns])
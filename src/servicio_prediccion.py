@@ -0,0 +1,296 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def _numero(valor):
+    return np.nan if valor is None else float(valor)
+
+
+def _sotanos(fila):
+    if not _numero(fila.get('TotalBsmtSF')) > 0:
+        return 0.0
+    if _numero(fila.get('BsmtFinSF2')) > 0:
+        return 2.0
+    return 1.0 if _numero(fila.get('BsmtFinSF1')) > 0 else 0.0
+
+
+# Columnas creadas en los notebooks de limpieza (02_eda_1_cleaning) a partir de las columnas crudas.
+# Solo se calculan si la fila no las trae; un dato de entrada ausente (None) da NaN en las diferencias
+# y sumas, y cuenta como "no tiene" en los indicadores.
+COLUMNAS_DERIVADAS = {
+    'Street_Pave': lambda fila: float(fila.get('Street') == 'Pave'),
+    'Antigüedad_Remodelacion': lambda fila: _numero(fila.get('YearRemodAdd')) - _numero(fila.get('YearBuilt')),
+    'Antiguedad': lambda fila: _numero(fila.get('YrSold')) - _numero(fila.get('YearBuilt')),
+    'TieneSotano': lambda fila: float(_numero(fila.get('TotalBsmtSF')) > 0),
+    'NumeroSotanos': _sotanos,
+    'BañosTotales': lambda fila: (_numero(fila.get('BsmtFullBath')) + _numero(fila.get('BsmtHalfBath')) * 0.5
+                                  + _numero(fila.get('FullBath')) + _numero(fila.get('HalfBath')) * 0.5),
+    'HasFireplaces': lambda fila: float(_numero(fila.get('Fireplaces')) > 0),
+    'HasGarage': lambda fila: float(_numero(fila.get('GarageCars')) > 0),
+    'TienePiscina': lambda fila: float(_numero(fila.get('PoolArea')) > 0),
+    'HasShed': lambda fila: float(fila.get('MiscFeature') == 'Shed'),
+}
+
+
+class PredictorViviendas:
+    """
+    Convierte filas crudas (diccionarios con el esquema de Kaggle) en la matriz del modelo y predice SalePrice.
+
+    Todo el estado se prepara al crear el objeto: las columnas del modelo (las que quedan tras
+    `columnas_eliminar`), las tablas de búsqueda de los codificadores y las columnas con log1p.
+    La construcción de la matriz trabaja con listas y arrays de NumPy, sin DataFrames de tipo object.
+
+    Las columnas derivadas de `COLUMNAS_DERIVADAS` (Antiguedad, TieneSotano, BañosTotales...) se
+    calculan a partir de las crudas cuando la fila no las trae. El resto de la limpieza de los
+    notebooks (imputación de nulos, tratamiento de atípicos) no se reproduce: un valor ausente llega
+    al modelo como NaN, así que con filas incompletas el modelo tiene que admitir NaN.
+
+    Parámetros:
+    - modelo: Estimador entrenado.
+    - columnas: Columnas de entrada del modelo, en orden. Por defecto, `modelo.feature_names_in_`.
+    - codificadores: Codificadores ajustados del módulo `codificadores`.
+    - columnas_logaritmo: Columnas a las que se aplica log1p antes de predecir.
+    - log_objetivo: Si el modelo se entrenó con log1p(SalePrice), se revierte con expm1.
+    - compilar: Si es True, un ensemble de árboles se sustituye por su `bosque_compilado.BosqueCompilado`
+      (mismas predicciones, mucho menos tiempo por lote pequeño).
+    """
+
+    def __init__(self, modelo, columnas=None, codificadores=(), columnas_logaritmo=(), log_objetivo=True,
+                 compilar=False):
+        self.columnas = list(modelo.feature_names_in_ if columnas is None else columnas)
+        if compilar:
+            from bosque_compilado import compilar_bosque
+
+            modelo = compilar_bosque(modelo)
+        self.modelo = modelo
+        self.codificadores = list(codificadores)
+        self.columnas_logaritmo = list(columnas_logaritmo)
+        self.log_objetivo = log_objetivo
+
+        # Tablas {categoría: valor} y valor por defecto (categoría desconocida) por columna codificada
+        self._tablas = {}
+        for codificador in self.codificadores:
+            for col, categorias, valores in zip(codificador.columnas_, codificador.categorias_, codificador.valores_):
+                tabla = {}
+                for categoria, valor in zip(categorias, valores[:-1]):
+                    # Los NaN de train se buscan como None (null en JSON)
+                    tabla[None if categoria != categoria else categoria] = valor
+                self._tablas[col] = (tabla, valores[-1])
+        self._posiciones_log = [self.columnas.index(col) for col in self.columnas_logaritmo if col in self.columnas]
+        # Con los nombres de las columnas no salta el aviso de scikit-learn de X sin nombres de columnas
+        self._con_nombres = hasattr(modelo, 'feature_names_in_')
+
+    def matriz(self, filas):
+        """
+        Construye la matriz float64 (filas x columnas del modelo) a partir de una lista de diccionarios.
+        Lanza TypeError si alguna fila no es un diccionario y ValueError si un valor numérico no lo es.
+        """
+        if not isinstance(filas, list) or not all(isinstance(fila, dict) for fila in filas):
+            raise TypeError('Cada fila debe ser un objeto JSON con las columnas de la vivienda.')
+        X = np.empty((len(filas), len(self.columnas)))
+        for posicion, col in enumerate(self.columnas):
+            if col in COLUMNAS_DERIVADAS:
+                derivar = COLUMNAS_DERIVADAS[col]
+                valores = [fila[col] if col in fila else derivar(fila) for fila in filas]
+            else:
+                valores = [fila.get(col) for fila in filas]
+            if col in self._tablas:
+                tabla, por_defecto = self._tablas[col]
+                X[:, posicion] = [tabla.get(valor, por_defecto) for valor in valores]
+            else:
+                X[:, posicion] = np.array(valores, dtype=float)
+        if self._posiciones_log:
+            X[:, self._posiciones_log] = np.log1p(X[:, self._posiciones_log])
+        return X
+
+    def predecir(self, filas):
+        """
+        Predice SalePrice para una lista de filas crudas.
+        """
+        return self.predecir_matriz(self.matriz(filas))
+
+    def predecir_matriz(self, X):
+        """
+        Predice SalePrice para una matriz ya construida con `matriz`.
+        """
+        if self._con_nombres:
+            X = pd.DataFrame(X, columns=self.columnas, copy=False)
+        yhat = np.asarray(self.modelo.predict(X), dtype=float)
+        return np.expm1(yhat) if self.log_objetivo else yhat
+
+    def guardar(self, ruta):
+        joblib.dump(self, ruta)
+
+    @staticmethod
+    def cargar(ruta):
+        return joblib.load(ruta)
+
+
+class ServicioLotes:
+    """
+    Agrupa peticiones concurrentes en micro-lotes y los predice con una sola llamada al modelo.
+
+    Un hilo de fondo espera la primera petición y acumula las siguientes hasta completar `tam_lote`
+    filas o agotar `espera_max` segundos. Lleva contadores de latencia (p50/p99) y rendimiento.
+
+    Los errores se aíslan por petición: si el lote no se puede convertir en matriz, cada petición se
+    convierte por separado y solo las que fallan reciben la excepción; el resto se predice igual.
+    """
+
+    def __init__(self, predictor, tam_lote=256, espera_max=0.002, ventana_latencias=10_000):
+        self.predictor = predictor
+        self.tam_lote = tam_lote
+        self.espera_max = espera_max
+        self._cola = queue.Queue()
+        self._latencias = deque(maxlen=ventana_latencias)
+        self._bloqueo = threading.Lock()
+        self._peticiones = 0
+        self._filas = 0
+        self._lotes = 0
+        self._errores = 0
+        self._inicio = time.perf_counter()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def predecir(self, filas):
+        """
+        Encola una petición (lista de filas) y espera su resultado.
+        """
+        if not isinstance(filas, list):
+            raise TypeError('La petición debe ser una lista de filas.')
+        futuro = Future()
+        self._cola.put((filas, futuro, time.perf_counter()))
+        return futuro.result()
+
+    def _bucle(self):
+        while True:
+            lote = [self._cola.get()]
+            n_filas = len(lote[0][0])
+            limite = time.perf_counter() + self.espera_max
+            while n_filas < self.tam_lote:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    peticion = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                lote.append(peticion)
+                n_filas += len(peticion[0])
+            self._procesar(lote)
+
+    def _procesar(self, lote):
+        try:
+            matrices = [self.predictor.matriz([fila for peticion in lote for fila in peticion[0]])]
+            validas = lote
+        except Exception:
+            # Alguna petición está mal formada: se convierte cada una por separado
+            matrices, validas = [], []
+            for peticion in lote:
+                try:
+                    matrices.append(self.predictor.matriz(peticion[0]))
+                    validas.append(peticion)
+                except Exception as error:
+                    peticion[1].set_exception(error)
+        errores = len(lote) - len(validas)
+
+        predicciones = None
+        if validas:
+            try:
+                predicciones = self.predictor.predecir_matriz(np.vstack(matrices))
+            except Exception as error:
+                for _, futuro, _ in validas:
+                    futuro.set_exception(error)
+                errores += len(validas)
+                validas = []
+
+        fin = time.perf_counter()
+        inicio_fila = 0
+        with self._bloqueo:
+            for filas_peticion, futuro, llegada in validas:
+                futuro.set_result(predicciones[inicio_fila:inicio_fila + len(filas_peticion)])
+                inicio_fila += len(filas_peticion)
+                self._latencias.append(fin - llegada)
+            self._peticiones += len(validas)
+            self._filas += inicio_fila
+            self._lotes += 1
+            self._errores += errores
+
+    def metricas(self):
+        """
+        Latencias p50/p99 (ms) de las últimas peticiones correctas, contadores de rendimiento y
+        número de peticiones con error.
+        """
+        with self._bloqueo:
+            latencias = np.array(self._latencias) * 1000
+            duracion = time.perf_counter() - self._inicio
+            return {
+                'peticiones': self._peticiones,
+                'filas': self._filas,
+                'lotes': self._lotes,
+                'errores': self._errores,
+                'latencia_p50_ms': float(np.percentile(latencias, 50)) if len(latencias) else None,
+                'latencia_p99_ms': float(np.percentile(latencias, 99)) if len(latencias) else None,
+                'peticiones_por_segundo': self._peticiones / duracion,
+                'filas_por_segundo': self._filas / duracion,
+            }
+
+
+def _crear_manejador(servicio):
+    class Manejador(BaseHTTPRequestHandler):
+        def _responder(self, codigo, contenido):
+            cuerpo = json.dumps(contenido).encode()
+            self.send_response(codigo)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            if self.path == '/metricas':
+                self._responder(200, servicio.metricas())
+            else:
+                self._responder(404, {'error': 'Ruta no encontrada'})
+
+        def do_POST(self):
+            if self.path != '/predecir':
+                self._responder(404, {'error': 'Ruta no encontrada'})
+                return
+            try:
+                datos = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                filas = datos if isinstance(datos, list) else [datos]
+                predicciones = servicio.predecir(filas)
+            except (ValueError, KeyError, TypeError) as error:
+                self._responder(400, {'error': str(error)})
+                return
+            ids = [fila.get('Id') for fila in filas]
+            self._responder(200, [{'Id': id_, 'SalePrice': float(precio)} for id_, precio in zip(ids, predicciones)])
+
+        def log_message(self, formato, *args):
+            pass
+
+    return Manejador
+
+
+def servir(predictor, host='127.0.0.1', puerto=8000, **kwargs):
+    """
+    Arranca el servicio HTTP local.
+
+    - POST /predecir: fila o lista de filas en JSON -> [{'Id', 'SalePrice'}, ...]
+    - GET /metricas: latencias y contadores de rendimiento.
+
+    Parámetros adicionales (`tam_lote`, `espera_max`) se pasan a `ServicioLotes`.
+    """
+    servicio = ServicioLotes(predictor, **kwargs)
+    servidor = ThreadingHTTPServer((host, puerto), _crear_manejador(servicio))
+    print(f"Servicio de predicción en http://{host}:{puerto}")
+    servidor.serve_forever()
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from metricas import calcular_metricas
+
+
+# Métricas de `sklearn.metrics`, importadas al llamarlas para que importar `torneo` no cargue scikit-learn
+def _r2(y_val, yhat):
+    from sklearn.metrics import r2_score
+
+    return r2_score(y_val, yhat)
+
+
+def _mae(y_val, yhat):
+    from sklearn.metrics import mean_absolute_error
+
+    return mean_absolute_error(y_val, yhat)
+
+
+def _rmse(y_val, yhat):
+    from sklearn.metrics import root_mean_squared_error
+
+    return root_mean_squared_error(y_val, yhat)
+
+
+def _mse(y_val, yhat):
+    """
+    MSE calculado como RMSE², igual que en `calcular_metricas_rendimiento`.
+    """
+    return _rmse(y_val, yhat) ** 2
+
+
+def _rmsle(y_val, yhat):
+    from sklearn.metrics import root_mean_squared_log_error
+
+    return root_mean_squared_log_error(y_val, yhat)
+
+
+# Métricas por defecto, en el orden de las columnas de resultados de los notebooks
+METRICAS = {
+    'R2': _r2,
+    'MAE': _mae,
+    'RMSE': _rmse,
+    'MSE': _mse,
+    'RMSLE': _rmsle,
+}
+
+# Parámetros con los que cada librería controla su número de hilos
+PARAMETROS_HILOS = ('thread_count', 'n_jobs', 'nthread')
+
+# Datos compartidos por cada proceso del pool (se envían una sola vez al arrancarlo)
+_DATOS = {}
+
+
+def _parametro_hilos(modelo):
+    """
+    Devuelve el nombre del parámetro de hilos del modelo, o None si es de un solo hilo.
+    """
+    parametros = modelo.get_params()
+    for parametro in PARAMETROS_HILOS:
+        if parametro in parametros:
+            return parametro
+    return None
+
+
+def _iniciar_worker(X, y, columnas_logaritmo):
+    _DATOS['X'] = X
+    _DATOS['y'] = y
+    _DATOS['columnas_logaritmo'] = columnas_logaritmo
+
+
+def _ejecutar_fold(modelo, train_index, val_index, metricas, log_objetivo, hilos):
+    """
+    Entrena y evalúa un modelo en un fold. Se ejecuta dentro de un proceso del pool.
+    """
+    X, y, columnas_logaritmo = _DATOS['X'], _DATOS['y'], _DATOS['columnas_logaritmo']
+
+    X_train, X_val = X.iloc[train_index], X.iloc[val_index]
+    y_train, y_val = y.iloc[train_index].to_numpy(), y.iloc[val_index].to_numpy()
+
+    if columnas_logaritmo:
+        X_train = X_train.assign(**{col: np.log1p(X_train[col]) for col in columnas_logaritmo})
+        X_val = X_val.assign(**{col: np.log1p(X_val[col]) for col in columnas_logaritmo})
+
+    if log_objetivo:
+        y_train = np.log1p(y_train)
+
+    # Limitar también los hilos de BLAS/OpenMP al presupuesto asignado al trabajo
+    with threadpool_limits(limits=hilos):
+        modelo.fit(X_train, y_train)
+        yhat = modelo.predict(X_val)
+
+    if log_objetivo:
+        yhat = np.expm1(yhat)
+
+    # Métricas por defecto: todas en una pasada con el núcleo de `metricas`
+    if metricas is None:
+        return calcular_metricas(y_val, np.ravel(yhat))[0, 0].tolist()
+    return [metrica(y_val, yhat) for metrica in metricas.values()]
+
+
+def torneo_iterativo(modelos, X, y, cv, metricas=None, log_objetivo=True, columnas_logaritmo=None,
+                     n_nucleos=None, hilos_multihilo=None):
+    """
+    Ejecuta todos los trabajos (modelo, fold) en un pool de procesos y devuelve los resultados
+    a medida que terminan.
+
+    El planificador reparte los núcleos disponibles: los modelos de un solo hilo ocupan un núcleo y
+    los multihilo (XGBoost, LightGBM, CatBoost, bosques de scikit-learn...) ocupan `hilos_multihilo`
+    núcleos, fijando su parámetro de hilos para no sobrecargar la CPU.
+
+    Parámetros:
+    - modelos: Lista de estimadores (se clonan para cada fold).
+    - X, y: Datos de entrenamiento (DataFrame y Series).
+    - cv: Divisor de validación cruzada (p. ej. KFold).
+    - metricas: Diccionario {nombre: función(y_val, yhat)}. Por defecto, R2, MAE, RMSE, MSE y RMSLE.
+    - log_objetivo: Si es True, se entrena con log1p(y) y se revierte con expm1 antes de medir.
+    - columnas_logaritmo: Columnas de X a las que se aplica log1p.
+    - n_nucleos: Núcleos a utilizar (por defecto, todos).
+    - hilos_multihilo: Hilos para cada modelo multihilo (por defecto, un cuarto de los núcleos).
+
+    Genera:
+    - Tuplas (índice del modelo, nº de fold, fila de resultados [Modelo, métricas...]).
+    """
+    from sklearn.base import clone
+
+    n_nucleos = n_nucleos or os.cpu_count() or 1
+    hilos_multihilo = min(hilos_multihilo or max(1, n_nucleos // 4), n_nucleos)
+    particiones = list(cv.split(X))
+
+    # Cola de trabajos: primero los multihilo, que son los más largos
+    trabajos = []
+    for idx_modelo, modelo in enumerate(modelos):
+        parametro = _parametro_hilos(modelo)
+        hilos = hilos_multihilo if parametro else 1
+        for fold, (train_index, val_index) in enumerate(particiones):
+            copia = clone(modelo)
+            if parametro:
+                copia.set_params(**{parametro: hilos})
+            trabajos.append((hilos, idx_modelo, fold, copia, train_index, val_index))
+    trabajos.sort(key=lambda trabajo: -trabajo[0])
+
+    libres = n_nucleos
+    pendientes = {}
+    with ProcessPoolExecutor(max_workers=n_nucleos, initializer=_iniciar_worker,
+                             initargs=(X, y, columnas_logaritmo)) as pool:
+        while trabajos or pendientes:
+            # Lanzar trabajos mientras haya núcleos libres (siempre al menos uno si no hay nada en curso)
+            while trabajos and (trabajos[0][0] <= libres or not pendientes):
+                hilos, idx_modelo, fold, copia, train_index, val_index = trabajos.pop(0)
+                futuro = pool.submit(_ejecutar_fold, copia, train_index, val_index, metricas, log_objetivo, hilos)
+                pendientes[futuro] = (hilos, idx_modelo, fold)
+                libres -= hilos
+            # Si el siguiente no cabe, buscar uno de un hilo que sí quepa
+            for posicion, trabajo in enumerate(trabajos):
+                if trabajo[0] <= libres:
+                    trabajos.insert(0, trabajos.pop(posicion))
+                    break
+            else:
+                terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    hilos, idx_modelo, fold = pendientes.pop(futuro)
+                    libres += hilos
+                    yield idx_modelo, fold, [modelos[idx_modelo].__class__.__name__] + futuro.result()
+
+
+def ejecutar_torneo(modelos, X, y, cv, metricas=None, al_completar=None, **kwargs):
+    """
+    Compara varios modelos con validación cruzada ejecutando los folds en paralelo.
+
+    Parámetros:
+    - al_completar: Función opcional que recibe el DataFrame parcial cada vez que termina un trabajo.
+    - Resto de parámetros: ver `torneo_iterativo`.
+
+    Retorna:
+    - DataFrame con las columnas 'Modelo', 'R2', 'MAE', 'RMSE', 'MSE', 'RMSLE' (una fila por modelo y fold),
+      en el mismo orden que el bucle secuencial de los notebooks.
+    """
+    columnas = ['Modelo'] + list(METRICAS if metricas is None else metricas)
+    filas = {}
+
+    for idx_modelo, fold, fila in torneo_iterativo(modelos, X, y, cv, metricas=metricas, **kwargs):
+        filas[(idx_modelo, fold)] = fila
+        if al_completar is not None:
+            al_completar(pd.DataFrame(list(filas.values()), columns=columnas))
+
+    return pd.DataFrame([filas[clave] for clave in sorted(filas)], columns=columnas)
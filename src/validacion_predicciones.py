@@ -0,0 +1,252 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Estadísticos del resumen, en el orden de `describe()`
+ESTADISTICOS_RESUMEN = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+class ControlIds:
+    """
+    Detecta Ids repetidos en streaming.
+
+    Mientras el rango de Ids cabe en `max_bytes_bitmap`, se marca cada Id visto en un bitmap
+    (1 bit por Id posible, desplazado al mínimo visto); la comprobación de un trozo es un
+    `np.unique` y una consulta vectorizada al bitmap. Si el rango crece demasiado (Ids muy dispersos),
+    se pasa a guardar los Ids únicos de cada trozo ordenados y se buscan repetidos al final
+    ordenando todos los tramos juntos.
+    """
+
+    def __init__(self, max_bytes_bitmap=256 * 2 ** 20, max_ejemplos=10):
+        self.max_bytes_bitmap = max_bytes_bitmap
+        self.max_ejemplos = max_ejemplos
+        self.bitmap = None
+        self.base = 0
+        self.tramos = None
+        self.duplicados = 0
+        self.ejemplos = []
+
+    @property
+    def metodo(self):
+        return 'ordenacion' if self.tramos is not None else 'bitmap'
+
+    def _anotar(self, repetidos, n_repetidos):
+        self.duplicados += int(n_repetidos)
+        faltan = self.max_ejemplos - len(self.ejemplos)
+        if faltan > 0:
+            nuevos = [int(valor) for valor in repetidos if int(valor) not in self.ejemplos]
+            self.ejemplos.extend(nuevos[:faltan])
+
+    def _ampliar(self, minimo, maximo):
+        """
+        Amplía el bitmap para cubrir [minimo, maximo] (al menos al doble, para no copiarlo en cada
+        trozo si los Ids crecen). Devuelve False si superaría `max_bytes_bitmap`.
+        """
+        if self.bitmap is not None:
+            final = self.base + 8 * len(self.bitmap) - 1
+            if minimo >= self.base and maximo <= final:
+                return True
+            minimo, maximo = min(minimo, self.base), max(maximo, final)
+        base = minimo - minimo % 8
+        necesario = (maximo - base) // 8 + 1
+        if necesario > self.max_bytes_bitmap:
+            return False
+        actual = 0 if self.bitmap is None else len(self.bitmap)
+        nuevo = np.zeros(min(max(necesario, 2 * actual), self.max_bytes_bitmap), dtype=np.uint8)
+        if self.bitmap is not None:
+            desplazamiento = (self.base - base) // 8
+            nuevo[desplazamiento:desplazamiento + actual] = self.bitmap
+        self.bitmap, self.base = nuevo, base
+        return True
+
+    def _a_tramos(self):
+        """
+        Pasa del bitmap a tramos ordenados (cuando el rango de Ids ya no cabe).
+        """
+        self.tramos = []
+        if self.bitmap is not None:
+            vistos = np.flatnonzero(np.unpackbits(self.bitmap, bitorder='little'))
+            self.tramos.append(vistos.astype(np.int64) + self.base)
+            self.bitmap = None
+
+    def actualizar(self, ids):
+        """
+        Añade un trozo de Ids enteros (int64).
+        """
+        if len(ids) == 0:
+            return self
+        ordenados = np.sort(ids)
+        distinto = np.concatenate([[True], ordenados[1:] != ordenados[:-1]])
+        unicos = ordenados[distinto]
+        # Repetidos dentro del propio trozo
+        self._anotar(np.unique(ordenados[~distinto]), (~distinto).sum())
+
+        if self.tramos is None and not self._ampliar(int(unicos[0]), int(unicos[-1])):
+            self._a_tramos()
+        if self.tramos is not None:
+            self.tramos.append(unicos)
+            return self
+
+        posiciones = unicos - self.base
+        bytes_, bits = posiciones >> 3, (1 << (posiciones & 7)).astype(np.uint8)
+        vistos = (self.bitmap[bytes_] & bits) != 0
+        self._anotar(unicos[vistos], vistos.sum())
+        np.bitwise_or.at(self.bitmap, bytes_, bits)
+        return self
+
+    def finalizar(self):
+        """
+        Resuelve los repetidos entre tramos (solo en modo 'ordenacion'). Devuelve el propio control.
+        """
+        if self.tramos:
+            todos = np.sort(np.concatenate(self.tramos), kind='mergesort')
+            repetido = todos[1:] == todos[:-1]
+            self._anotar(np.unique(todos[1:][repetido]), repetido.sum())
+            self.tramos = [np.unique(todos)]
+        return self
+
+
+class _Momentos:
+    """
+    Conteo, media, varianza (combinación de Chan), mínimo y máximo en streaming.
+    """
+
+    def __init__(self):
+        self.n, self.media, self.m2 = 0, 0.0, 0.0
+        self.minimo, self.maximo = np.inf, -np.inf
+
+    def actualizar(self, valores):
+        if len(valores) == 0:
+            return
+        n, media = len(valores), float(valores.mean())
+        m2 = float(np.square(valores - media).sum())
+        total = self.n + n
+        delta = media - self.media
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.media += delta * n / total
+        self.n = total
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+
+def _resumen(momentos, sketch):
+    cuartiles = sketch.cuantiles([0.25, 0.5, 0.75])
+    std = np.sqrt(momentos.m2 / (momentos.n - 1)) if momentos.n > 1 else np.nan
+    valores = [momentos.n, momentos.media if momentos.n else np.nan, std,
+               momentos.minimo if momentos.n else np.nan, *cuartiles, momentos.maximo if momentos.n else np.nan]
+    return pd.Series(valores, index=ESTADISTICOS_RESUMEN, dtype=float)
+
+
+def _trozos(fuente, columnas, tam_trozo):
+    """
+    Trozos de `fuente`: DataFrame, ruta CSV o Parquet, carpeta con archivos de predicciones o lista de rutas.
+    """
+    if isinstance(fuente, pd.DataFrame):
+        for inicio in range(0, len(fuente), tam_trozo):
+            yield fuente[columnas].iloc[inicio:inicio + tam_trozo]
+        return
+    if isinstance(fuente, (str, os.PathLike)) and os.path.isdir(fuente):
+        fuente = sorted(glob.glob(os.path.join(fuente, '*.csv')) + glob.glob(os.path.join(fuente, '*.parquet')))
+    rutas = [fuente] if isinstance(fuente, (str, os.PathLike)) else list(fuente)
+    for ruta in rutas:
+        if str(ruta).endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tam_trozo, columns=columnas):
+                yield lote.to_pandas()
+        else:
+            yield from pd.read_csv(ruta, usecols=columnas, chunksize=tam_trozo)
+
+
+def validar_predicciones(fuente, n_esperado=None, train=None, columna_id='Id', columna_objetivo='SalePrice',
+                         tam_trozo=1_000_000, k=2048, max_bytes_bitmap=256 * 2 ** 20):
+    """
+    Valida un archivo de predicciones por trozos, sin cargarlo entero en memoria. Es la versión
+    en streaming de `regression_model.revisar_predicciones`: en lugar de imprimir mensajes y parar
+    en el primer error, recorre todo el archivo y devuelve un informe con todas las comprobaciones.
+
+    - Número de filas (si se indica `n_esperado`), nulos, infinitos y negativos en el objetivo.
+    - Ids nulos o no enteros y repetidos (ver `ControlIds`: bitmap sobre el rango de Ids o
+      tramos ordenados si los Ids están muy dispersos).
+    - Resumen al estilo de `describe()`: conteo, media, desviación, mínimo y máximo exactos y
+      cuartiles aproximados con `atipicos.SketchCuantiles` (exactos mientras no se compacte).
+      Con `train` se añade la misma columna para el objetivo de entrenamiento.
+
+    Parámetros:
+    - fuente: DataFrame, ruta CSV o Parquet, carpeta con los archivos o lista de rutas (en orden).
+    - n_esperado: Número de filas esperado (p. ej. `len(test)`).
+    - train: DataFrame con `columna_objetivo` o Serie/array con el objetivo de entrenamiento.
+    - tam_trozo: Filas por trozo.
+    - k: Tamaño de los compactadores del sketch de cuantiles.
+    - max_bytes_bitmap: Memoria máxima del bitmap de Ids antes de pasar a tramos ordenados.
+
+    Retorna:
+    - Diccionario con 'valido', 'errores' (lista de mensajes), los conteos de cada comprobación,
+      'ejemplos_ids_duplicados', 'metodo_ids' y 'resumen' (DataFrame con 'Predicciones' y, si se
+      indica `train`, 'Entrenamiento').
+    """
+    from atipicos import SketchCuantiles
+
+    control = ControlIds(max_bytes_bitmap=max_bytes_bitmap)
+    momentos, sketch = _Momentos(), SketchCuantiles(k)
+    filas = nulos = infinitos = negativos = ids_invalidos = 0
+
+    for trozo in _trozos(fuente, [columna_id, columna_objetivo], tam_trozo):
+        filas += len(trozo)
+        objetivo = trozo[columna_objetivo].to_numpy(dtype=float, na_value=np.nan)
+        nulo = np.isnan(objetivo)
+        finito = np.isfinite(objetivo)
+        nulos += int(nulo.sum())
+        infinitos += int((~finito & ~nulo).sum())
+        negativos += int((objetivo < 0).sum())
+        momentos.actualizar(objetivo[finito])
+        sketch.actualizar(objetivo[finito])
+
+        ids = trozo[columna_id].to_numpy(dtype=float, na_value=np.nan)
+        entero = np.isfinite(ids) & (ids == np.round(ids))
+        ids_invalidos += int((~entero).sum())
+        control.actualizar(ids[entero].astype(np.int64))
+    control.finalizar()
+
+    errores = []
+    if n_esperado is not None and filas != n_esperado:
+        errores.append(f"Cantidad de predicciones incorrecta: {filas} filas y se esperaban {n_esperado}.")
+    if nulos:
+        errores.append(f"Existen {nulos} valores nulos en la columna '{columna_objetivo}'.")
+    if infinitos:
+        errores.append(f"Existen {infinitos} valores infinitos en la columna '{columna_objetivo}'.")
+    if negativos:
+        errores.append(f"Existen {negativos} valores negativos en las predicciones.")
+    if ids_invalidos:
+        errores.append(f"La columna '{columna_id}' contiene {ids_invalidos} valores nulos o no enteros.")
+    if control.duplicados:
+        errores.append(f"La columna '{columna_id}' contiene {control.duplicados} duplicados.")
+
+    resumen = _resumen(momentos, sketch).to_frame(name='Predicciones')
+    if train is not None:
+        objetivo_train = train[columna_objetivo] if isinstance(train, pd.DataFrame) else train
+        objetivo_train = np.asarray(objetivo_train, dtype=float)
+        objetivo_train = objetivo_train[np.isfinite(objetivo_train)]
+        momentos_train, sketch_train = _Momentos(), SketchCuantiles(k)
+        for inicio in range(0, len(objetivo_train), tam_trozo):
+            momentos_train.actualizar(objetivo_train[inicio:inicio + tam_trozo])
+            sketch_train.actualizar(objetivo_train[inicio:inicio + tam_trozo])
+        resumen['Entrenamiento'] = _resumen(momentos_train, sketch_train)
+
+    return {
+        'valido': not errores,
+        'errores': errores,
+        'filas': filas,
+        'filas_esperadas': n_esperado,
+        'nulos': nulos,
+        'infinitos': infinitos,
+        'negativos': negativos,
+        'ids_invalidos': ids_invalidos,
+        'ids_duplicados': control.duplicados,
+        'ejemplos_ids_duplicados': control.ejemplos,
+        'metodo_ids': control.metodo,
+        'resumen': resumen,
+    }
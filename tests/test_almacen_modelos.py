@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from almacen_modelos import cargar_artefacto, guardar_artefacto  # noqa: E402
+
+
+def test_bosque_guardado_en_memoria_mapeada(tmp_path):
+    datos = pd.read_csv(os.path.join(RAIZ, 'data', 'train.csv')).select_dtypes('number').fillna(0)
+    X, y = datos.drop(columns=['Id', 'SalePrice']), np.log1p(datos['SalePrice'])
+    modelo = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    guardar_artefacto(modelo, 'RandomForestRegressor', list(X.columns), ruta_almacen=str(tmp_path))
+
+    artefacto = cargar_artefacto('RandomForestRegressor', ruta_almacen=str(tmp_path))
+    predictor = artefacto.predictor(compilar=True)
+    # Los nodos se leen del .npy mapeado y el modelo de scikit-learn no llega a cargarse
+    assert isinstance(predictor.modelo.hijos, np.memmap)
+    assert 'modelo' not in artefacto.__dict__
+    np.testing.assert_allclose(predictor.predecir(X.head(50).to_dict('records')),
+                               np.expm1(modelo.predict(X.head(50))))
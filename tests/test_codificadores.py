@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from codificadores import CodificadorEtiquetas, CodificadorLOO, CodificadorPonderado  # noqa: E402
+
+
+def _datos(n_filas=300, semilla=0):
+    """
+    Tres columnas categóricas con NaN (también en la primera, cuyo código -1 no debe caer en la
+    última categoría de la columna anterior) y un objetivo con algún NaN.
+    """
+    rng = np.random.default_rng(semilla)
+    X = pd.DataFrame({
+        'A': rng.choice(['a1', 'a2', 'a3', None], size=n_filas),
+        'B': rng.choice(['b1', 'b2', None], size=n_filas),
+        'C': rng.choice(['c1', 'c2', 'c3', 'c4'], size=n_filas),
+    })
+    y = pd.Series(rng.normal(12.0, 0.4, size=n_filas))
+    y[rng.random(n_filas) < 0.05] = np.nan
+    return X, y
+
+
+@pytest.mark.parametrize('clase', [CodificadorEtiquetas, CodificadorPonderado, CodificadorLOO])
+def test_ajuste_multicolumna_igual_que_por_columna(clase):
+    X, y = _datos()
+    conjunto = clase(cols=list(X.columns)).fit(X, y).transform(X)
+    for col in X.columns:
+        individual = clase(cols=[col]).fit(X[[col]], y).transform(X[[col]])
+        np.testing.assert_allclose(conjunto[col].to_numpy(dtype=float), individual[col].to_numpy(dtype=float))
@@ -0,0 +1,63 @@
+"""
+Control del coste de importar los módulos de cálculo de `src`: cada módulo se importa en un
+intérprete nuevo y no debe cargar librerías de gráficos ni scikit-learn/scipy, ni tardar más del
+límite (además de numpy y pandas).
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `atipicos` y `codificadores` quedan fuera: sus clases heredan de `BaseEstimator`/`TransformerMixin`
+# de scikit-learn, que por tanto se necesita al definirlas (al importar el módulo).
+MODULOS_CALCULO = ['data_processing', 'data_visualization', 'regression_model', 'correlaciones', 'graficos',
+                   'ingesta', 'generador_sintetico', 'imputacion', 'cubo_agregacion',
+                   'memoria', 'procesamiento_trozos', 'metricas',
+                   'validacion_predicciones', 'perfilado', 'importancia_permutacion',
+                   'seleccion_columnas', 'bosque_compilado', 'torneo', 'curva_aprendizaje',
+                   'busqueda_xgb', 'cache_folds']
+
+# Paquetes que la ruta de cálculo no debe cargar al importarse
+PROHIBIDOS = ['matplotlib', 'seaborn', 'plotly', 'sklearn', 'scipy', 'category_encoders', 'xgboost', 'lightgbm',
+              'catboost']
+
+# Segundos máximos de importación de cada módulo (además de numpy y pandas)
+LIMITE_S = 1.0
+
+# Tiempo de referencia: lo que cuestan numpy + pandas, sobre lo que se mide cada módulo
+_CODIGO = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+import numpy, pandas
+inicio = time.perf_counter()
+import {modulo}
+print(json.dumps({{
+    'tiempo_s': time.perf_counter() - inicio,
+    'cargados': sorted({{nombre.split('.')[0] for nombre in sys.modules}}),
+}}))
+"""
+
+
+def medir_importacion(modulo):
+    """
+    Importa `modulo` en un proceso nuevo y devuelve su tiempo de importación (sin contar numpy/pandas)
+    y los paquetes prohibidos que ha cargado.
+    """
+    codigo = _CODIGO.format(src=os.path.join(RAIZ, 'src'), modulo=modulo)
+    salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                            cwd=os.path.join(RAIZ, 'src'))
+    medicion = json.loads(salida.stdout.strip().splitlines()[-1])
+    cargados = set(medicion.pop('cargados'))
+    medicion['prohibidos'] = [paquete for paquete in PROHIBIDOS if paquete in cargados]
+    return medicion
+
+
+@pytest.mark.parametrize('modulo', MODULOS_CALCULO)
+def test_importacion_ligera(modulo):
+    medicion = medir_importacion(modulo)
+    assert medicion['prohibidos'] == []
+    assert medicion['tiempo_s'] <= LIMITE_S
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from imputacion import REGLAS_VIVIENDA, ImputadorCondicional  # noqa: E402
+
+TRAIN = os.path.join(RAIZ, 'data', 'train.csv')
+
+
+def test_trozos_igual_que_todo():
+    # Con trozos de 200 filas, PoolQC es toda NaN en algunos y se lee como float64
+    reglas = [regla for regla in REGLAS_VIVIENDA if regla['nombre'] != 'sotano']
+    completo = ImputadorCondicional(reglas).aplicar(pd.read_csv(TRAIN))
+    por_trozos = pd.concat(ImputadorCondicional(reglas).aplicar_trozos(pd.read_csv(TRAIN, chunksize=200)))
+    for regla in reglas:
+        for col in regla['columnas']:
+            assert por_trozos[col].astype(object).tolist() == completo[col].astype(object).tolist()
+
+
+def test_omite_reglas_sin_indicador():
+    # 'TieneSotano' no está en el CSV crudo: la regla del sótano se omite y las demás se aplican
+    imputador = ImputadorCondicional()
+    df = imputador.aplicar(pd.read_csv(TRAIN))
+    informe = imputador.informe()
+    assert 'sotano' not in set(informe['Regla'])
+    assert df['PoolQC'].notna().all()
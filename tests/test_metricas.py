@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, r2_score, root_mean_squared_error, root_mean_squared_log_error
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from metricas import AcumuladorMetricas, calcular_metricas  # noqa: E402
+from regression_model import calcular_metricas_rendimiento  # noqa: E402
+
+
+def _datos(n_filas=200, semilla=0):
+    rng = np.random.default_rng(semilla)
+    y = rng.lognormal(12.0, 0.4, size=n_filas)
+    return y, y * rng.lognormal(0.0, 0.1, size=n_filas)
+
+
+def test_vector_columna_igual_que_sklearn():
+    # Como en el bucle de modelos lineales del notebook 03: y e yhat salen de `inverse_transform` (n x 1)
+    y, yhat = _datos()
+    tabla = calcular_metricas_rendimiento('modelo', None, y.reshape(-1, 1), yhat.reshape(-1, 1))
+    esperado = {
+        'R²': r2_score(y, yhat),
+        'MAE': mean_absolute_error(y, yhat),
+        'RMSE': root_mean_squared_error(y, yhat),
+        'MSE': root_mean_squared_error(y, yhat) ** 2,
+        'RMSLE': root_mean_squared_log_error(y, yhat),
+    }
+    for nombre, valor in esperado.items():
+        assert tabla.loc[0, nombre] == pytest.approx(valor)
+
+
+def test_nucleo_rechaza_vector_columna():
+    y, yhat = _datos()
+    with pytest.raises(ValueError):
+        calcular_metricas(y.reshape(-1, 1), yhat)
+    with pytest.raises(ValueError):
+        calcular_metricas(y, yhat.reshape(-1, 1))
+    with pytest.raises(ValueError):
+        AcumuladorMetricas().actualizar(y.reshape(-1, 1), yhat)
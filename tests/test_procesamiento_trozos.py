@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from procesamiento_trozos import PipelineTrozos  # noqa: E402
+
+DATOS = os.path.join(RAIZ, 'data')
+
+
+@pytest.mark.parametrize('tipo', ['etiquetas', 'ponderada', 'loo'])
+def test_fuente_train_test(tmp_path, tipo):
+    # Los trozos del CSV de test no tienen SalePrice: el ajuste los ignora y la escritura lo deja nulo
+    pytest.importorskip('pyarrow')
+    fuente = {'train': os.path.join(DATOS, 'train.csv'), 'test': os.path.join(DATOS, 'test.csv')}
+    pipeline = PipelineTrozos([{'tipo': tipo, 'columnas': ['Neighborhood', 'MSZoning']}], tam_trozo=500)
+    pipeline.ejecutar(fuente, str(tmp_path))
+
+    salida = pd.read_parquet(tmp_path)
+    train, test = pd.read_csv(fuente['train']), pd.read_csv(fuente['test'])
+    conjuntos = salida['Dataset'].astype(str)
+    assert (conjuntos == 'train').sum() == len(train) and (conjuntos == 'test').sum() == len(test)
+    np.testing.assert_allclose(np.sort(salida.loc[conjuntos == 'train', 'SalePrice'].to_numpy(dtype=float)),
+                               np.sort(train['SalePrice'].to_numpy(dtype=float)))
+    assert salida.loc[conjuntos == 'test', 'SalePrice'].isna().all()